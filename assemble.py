@@ -0,0 +1,218 @@
+"""
+Video Assembly
+Description: Joins the rendered scene movies into final_video.mp4 with a
+stream-copy concat, after checking that they can be joined at all.
+
+Replaces the steps of combiner.sh:
+
+    1. probe every input with ffprobe, all at once in a thread pool
+    2. fail before writing anything if an input is missing or its codec,
+       pixel format, resolution or frame rate differs from the first one
+    3. concat with ``-c copy`` into a temporary file, adding one chapter per
+       scene (named after its class), then move it over the output
+    4. write <output>.json with every scene's offset and duration and print
+       the per-scene and total runtime
+
+Usage:
+    python assemble.py                                   # file_list.txt -> final_video.mp4
+    python assemble.py -o talk.mp4 media/videos/main/480p15/IntroRLScene.mp4 ...
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+FILE_LIST = ROOT / "file_list.txt"
+# Stream properties that have to match for a stream-copy concat to be valid.
+COMPATIBLE = ("codec_name", "pix_fmt", "width", "height", "r_frame_rate")
+
+
+class AssemblyError(RuntimeError):
+    """The inputs cannot be joined into one movie."""
+
+
+def read_file_list(file_list=FILE_LIST):
+    """Movie paths listed in an ffmpeg concat list, relative paths taken from its directory."""
+    file_list = Path(file_list)
+    videos = []
+    for line in file_list.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("file "):
+            videos.append(file_list.parent / line[5:].strip("'\""))
+    return videos
+
+
+def probe(video):
+    """Video stream properties and container duration of one movie."""
+    try:
+        out = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "stream=" + ",".join(COMPATIBLE) + ":format=duration",
+                "-of", "json", str(video),
+            ],
+            check=True, capture_output=True, text=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        raise AssemblyError(f"{video}: unreadable ({exc.stderr.strip()})") from exc
+    info = json.loads(out.stdout)
+    if not info.get("streams"):
+        raise AssemblyError(f"{video}: no video stream")
+    stream = info["streams"][0]
+    return {
+        **{key: stream.get(key) for key in COMPATIBLE},
+        "duration": float(info["format"]["duration"]),
+    }
+
+
+def probe_all(videos, workers=None):
+    """Probe every movie concurrently; results in input order."""
+    missing = [str(v) for v in videos if not Path(v).is_file()]
+    if missing:
+        raise AssemblyError("missing input(s): " + ", ".join(missing))
+    with ThreadPoolExecutor(max_workers=workers or len(videos) or 1) as pool:
+        return list(pool.map(probe, videos))
+
+
+def check_compatible(videos, probes):
+    """Raise AssemblyError naming every input that does not match the first."""
+    reference = probes[0]
+    problems = []
+    for video, info in zip(videos[1:], probes[1:]):
+        diff = [
+            f"{key} {info[key]} != {reference[key]}"
+            for key in COMPATIBLE if info[key] != reference[key]
+        ]
+        if diff:
+            problems.append(f"{Path(video).name}: " + ", ".join(diff))
+    if problems:
+        raise AssemblyError(
+            f"inputs do not match {Path(videos[0]).name}:\n  " + "\n  ".join(problems)
+        )
+
+
+def chapters(names, probes):
+    """(name, start, end) in seconds for consecutive movies."""
+    result, start = [], 0.0
+    for name, info in zip(names, probes):
+        result.append((name, start, start + info["duration"]))
+        start += info["duration"]
+    return result
+
+
+def _ffmetadata(marks):
+    lines = [";FFMETADATA1"]
+    for name, start, end in marks:
+        title = name.replace("\\", "\\\\").replace("=", "\\=").replace(";", "\\;").replace("#", "\\#")
+        lines += [
+            "[CHAPTER]",
+            "TIMEBASE=1/1000",
+            f"START={round(start * 1000)}",
+            f"END={round(end * 1000)}",
+            f"title={title}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def concat_videos(videos, output, marks=None):
+    """Stream-copy concat with the ffmpeg concat demuxer, with chapters from ``marks``."""
+    temporary = []
+    try:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as fp:
+            for video in videos:
+                fp.write(f"file '{Path(video).resolve().as_posix()}'\n")
+            temporary.append(fp.name)
+        command = ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", fp.name]
+        if marks:
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as meta:
+                meta.write(_ffmetadata(marks))
+                temporary.append(meta.name)
+            command += ["-i", meta.name, "-map", "0", "-map_metadata", "1", "-map_chapters", "1"]
+        subprocess.run(command + ["-c", "copy", str(output)], check=True)
+    finally:
+        for path in temporary:
+            os.unlink(path)
+
+
+def assemble(videos, output, names=None, workers=None):
+    """Check, join and index ``videos``; return the manifest written next to ``output``.
+
+    ``names`` label the chapters and default to the file names without the
+    extension, which are the scene class names for manim's output.
+    """
+    videos = [Path(v) for v in videos]
+    output = Path(output)
+    if not videos:
+        raise AssemblyError("nothing to assemble")
+    names = list(names) if names else [v.stem for v in videos]
+    probes = probe_all(videos, workers)
+    check_compatible(videos, probes)
+
+    marks = chapters(names, probes)
+    partial = output.with_name(f".{output.stem}.partial{output.suffix}")
+    try:
+        concat_videos(videos, partial, marks)
+        os.replace(partial, output)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    reference = probes[0]
+    manifest = {
+        "output": str(output),
+        "duration": marks[-1][2],
+        "codec": reference["codec_name"],
+        "resolution": [reference["width"], reference["height"]],
+        "fps": float(Fraction(reference["r_frame_rate"])),
+        "scenes": [
+            {"scene": name, "file": str(video), "start": start, "end": end,
+             "duration": end - start}
+            for (name, start, end), video in zip(marks, videos)
+        ],
+    }
+    output.with_suffix(".json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def report_durations(manifest):
+    print("Scene durations (in seconds):")
+    for scene in manifest["scenes"]:
+        print(f"{scene['file']}: {scene['duration']:.3f} seconds (starts at {scene['start']:.3f})")
+    total = manifest["duration"]
+    seconds = round(total)
+    print(f"Total runtime (in seconds): {total:.3f}")
+    print(f"Total runtime: {seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--file-list", type=Path, default=FILE_LIST,
+                        help="concat list to read when no videos are given")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="default: final_video.mp4 next to the first input")
+    parser.add_argument("-j", "--workers", type=int, help="concurrent ffprobe calls")
+    parser.add_argument("videos", nargs="*", type=Path)
+    args = parser.parse_args(argv)
+
+    videos = args.videos or read_file_list(args.file_list)
+    if not videos:
+        parser.error("no videos given and none listed in " + str(args.file_list))
+    output = args.output or Path(videos[0]).parent / "final_video.mp4"
+    try:
+        manifest = assemble(videos, output, workers=args.workers)
+    except AssemblyError as exc:
+        print(f"Not assembling {output}: {exc}", file=sys.stderr)
+        return 1
+    print(f"Wrote {output} and {output.with_suffix('.json')}")
+    report_durations(manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Compact Mobjects
+Description: Mobjects that draw many identical shapes as the subpaths of one
+VMobject, with all the Bezier points built by NumPy in one go.
+
+A chart of 1000 bars built from 1000 ``Rectangle``\\ s costs 1000 mobject
+constructions, 1000 entries in every family walk and 1000 draw calls per
+frame. Here it is a single mobject whose points array holds every bar.
+Manim splits a VMobject into subpaths wherever one curve does not start
+where the previous ended, so each bar still renders as its own closed shape.
+
+    chart = BarChartPath(0.9 ** np.arange(1000), width=10, height=2.5)
+    slots = CellGrid(1, 10_000, size=0.8)
+    labels = IndexLabels(range(10_000), slots.cell_centers() + 0.5 * DOWN, edge=UP)
+
+``python compact_mobjects.py -n 10000`` compares building, animating
+``Create`` on and rasterizing such an array against one ``Rectangle`` and
+one ``Text`` label per slot.
+"""
+
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+from manim import DOWN, GREEN, ORIGIN, UP, WHITE, Text, VMobject
+
+
+def rectangle_points(corners, sizes):
+    """Cubic Bezier points outlining ``n`` axis-aligned rectangles.
+
+    ``corners`` are the lower-left corners and ``sizes`` the (width, height)
+    of each rectangle, both shaped (n, 2). Returns an (n * 16, 3) array:
+    four straight cubic curves per rectangle, counter-clockwise from the
+    lower-left corner.
+    """
+    corners = np.asarray(corners, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    offsets = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]], dtype=np.float64)
+    loop = corners[:, None, :] + offsets[None] * sizes[:, None, :]  # (n, 5, 2)
+    start, end = loop[:, :-1], loop[:, 1:]
+    thirds = np.array([0, 1, 2, 3])[:, None] / 3  # anchor, handle, handle, anchor
+    curves = start[:, :, None, :] + thirds * (end - start)[:, :, None, :]  # (n, 4, 4, 2)
+    points = np.zeros((*curves.shape[:-1], 3))
+    points[..., :2] = curves
+    return points.reshape(-1, 3)
+
+
+class BarChartPath(VMobject):
+    """Bar chart of ``values`` (non-negative) as one VMobject of rectangle subpaths.
+
+    The bars span ``width``; the largest value (or ``peak``, when given) is
+    drawn ``height`` tall and ``gap`` is the fraction of each bar's slot
+    left empty. The chart is built with its baseline's left end at the
+    origin. :meth:`set_values` redraws the same bars in place, so one chart
+    can be driven by an updater.
+    """
+
+    def __init__(self, values, width=10.0, height=2.5, gap=0.15, peak=None,
+                 color=GREEN, fill_opacity=0.8, stroke_width=0, **kwargs):
+        super().__init__(color=color, fill_opacity=fill_opacity, stroke_width=stroke_width, **kwargs)
+        self.n_bars = len(values)
+        self.slot = width / self.n_bars
+        self.bar_width = self.slot * (1 - gap)
+        self.bar_height = height
+        self.set_points(self._bar_points(values, peak, np.zeros(2)))
+
+    def _bar_points(self, values, peak, origin):
+        values = np.asarray(values, dtype=np.float64)
+        peak = peak or values.max() or 1.0
+        corners = np.column_stack([np.arange(self.n_bars) * self.slot, np.zeros(self.n_bars)]) + origin
+        sizes = np.column_stack([
+            np.full(self.n_bars, self.bar_width),
+            # zero-height bars would be degenerate curves
+            np.maximum(np.minimum(values / peak, 1.0) * self.bar_height, 1e-4),
+        ])
+        return rectangle_points(corners, sizes)
+
+    def set_values(self, values, peak=None):
+        """Redraw the bars for ``values`` where the chart now is; moves are kept, scaling is not."""
+        if len(values) != self.n_bars:
+            raise ValueError(f"expected {self.n_bars} values, got {len(values)}")
+        origin = self.points[0, :2]  # first bar's lower-left corner
+        self.set_points(self._bar_points(values, peak, origin))
+        return self
+
+    def bar_center_x(self, index):
+        """x coordinate of bar ``index``'s centre, following any moves of the chart."""
+        return self.get_left()[0] + index * self.slot + self.bar_width / 2
+
+
+class CellGrid(VMobject):
+    """``rows`` x ``cols`` square cells as the subpaths of one VMobject.
+
+    Cells are ``size`` wide with their centres ``pitch`` apart (default:
+    ``size``, so neighbours share an edge). Row 0 is on top and cell (0, 0)
+    is built centred on the origin. ``cells`` restricts the grid to those
+    flat (row-major) indices, e.g. to fill only the wall cells of a maze;
+    grids built with the same layout stay aligned when moved together.
+    """
+
+    def __init__(self, rows, cols, size=1.0, pitch=None, cells=None,
+                 color=WHITE, stroke_width=2, fill_opacity=0.0, **kwargs):
+        super().__init__(color=color, stroke_width=stroke_width, fill_opacity=fill_opacity, **kwargs)
+        pitch = size if pitch is None else pitch
+        self.rows, self.cols = rows, cols
+        cells = np.arange(rows * cols) if cells is None else np.asarray(cells, dtype=np.int64)
+        self.subpath_of = np.full(rows * cols, -1)
+        self.subpath_of[cells] = np.arange(len(cells))
+        r, c = np.divmod(cells, cols)
+        centers = np.column_stack([c * pitch, -r * pitch])
+        self.set_points(rectangle_points(centers - size / 2, np.full((len(cells), 2), float(size))))
+
+    def cell_center(self, cell):
+        """Centre of cell ``(row, col)`` or flat index ``cell``, following any moves of the grid."""
+        index = cell if np.isscalar(cell) else cell[0] * self.cols + cell[1]
+        k = self.subpath_of[index]
+        if k < 0:
+            raise IndexError(f"cell {cell} is not part of this grid")
+        return self.points[16 * k:16 * k + 16].mean(axis=0)
+
+    def cell_centers(self):
+        """Centres of all cells in the grid, as an (n, 3) array."""
+        return self.points.reshape(-1, 16, 3).mean(axis=1)
+
+
+@lru_cache(maxsize=None)
+def _digit_glyphs(font_size):
+    """Outline points of each digit relative to its left baseline point, and the digit advance."""
+    text = Text("0123456789", font_size=font_size)
+    advance = text.width / 10
+    left, baseline = text.get_left()[0], text.get_bottom()[1]
+    glyphs = {
+        digit: glyph.points - [left + k * advance, baseline, 0]
+        for k, (digit, glyph) in enumerate(zip("0123456789", text.submobjects))
+    }
+    return glyphs, advance, text.height
+
+
+class IndexLabels(VMobject):
+    """Non-negative integer labels as one VMobject assembled from cached digit outlines.
+
+    ``Text`` is only ever built once per font size (for the ten digits), so
+    10,000 labels cost one Pango layout plus a concatenation of points.
+    Label ``i`` is centred on ``positions[i]``; with ``edge=UP`` its top
+    edge sits there instead (and likewise for the other directions).
+    """
+
+    def __init__(self, numbers, positions, font_size=18, color=WHITE, edge=ORIGIN, **kwargs):
+        super().__init__(color=color, fill_opacity=1.0, stroke_width=0, **kwargs)
+        glyphs, advance, height = _digit_glyphs(font_size)
+        edge = np.asarray(edge, dtype=np.float64)
+        chunks = []
+        for number, position in zip(numbers, np.asarray(positions, dtype=np.float64)):
+            digits = str(int(number))
+            half = np.array([advance * len(digits) / 2, height / 2, 0])
+            left, bottom, _ = position - half - edge * half
+            for k, digit in enumerate(digits):
+                chunks.append(glyphs[digit] + [left + k * advance, bottom, 0])
+        if chunks:
+            self.set_points(np.concatenate(chunks))
+
+
+def _per_cell_array(n, size):
+    from manim import Rectangle, VGroup
+
+    from mobject_pool import pool
+
+    slots, labels = VGroup(), VGroup()
+    for i in range(n):
+        rect = Rectangle(width=size, height=size, color=WHITE, stroke_width=2).move_to([i * size, 0, 0])
+        slots.add(rect)
+        labels.add(pool.text(str(i), font_size=18, color=WHITE).next_to(rect.get_center(), DOWN, buff=0.2))
+    return VGroup(slots, labels)
+
+
+def _compact_array(n, size):
+    from manim import VGroup
+
+    slots = CellGrid(1, n, size=size)
+    return VGroup(slots, IndexLabels(range(n), slots.cell_centers() + 0.2 * DOWN, edge=UP))
+
+
+def bench_array(n, size=0.8, frames=16):
+    """Seconds to build, animate Create on (``frames`` steps) and draw an ``n``-slot array, both ways."""
+    from manim import Camera, Create, config
+
+    config.quality = "low_quality"
+    rows = {}
+    for name, build in (("per-cell", _per_cell_array), ("compact", _compact_array)):
+        start = time.perf_counter()
+        array = build(n, size).scale_to_fit_width(config.frame_width - 1)
+        built = time.perf_counter() - start
+        families = len(array.get_family())
+
+        start = time.perf_counter()
+        animation = Create(array)
+        animation.begin()
+        for alpha in np.linspace(0, 1, frames):
+            animation.interpolate(alpha)
+        animation.finish()
+        animated = time.perf_counter() - start
+
+        camera = Camera()
+        start = time.perf_counter()
+        camera.capture_mobjects([array])
+        rows[name] = (families, built, animated, time.perf_counter() - start)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-cell vs compact slot array benchmark")
+    parser.add_argument("-n", "--slots", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    print(f"{args.slots:,} slots with index labels")
+    print(f"  {'layout':<9} {'mobjects':>9} {'build s':>8} {'Create s':>9} {'frame s':>8}")
+    for name, (families, built, animated, drawn) in bench_array(args.slots).items():
+        print(f"  {name:<9} {families:9,d} {built:8.2f} {animated:9.2f} {drawn:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
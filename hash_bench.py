@@ -0,0 +1,155 @@
+"""
+Hash Table Benchmark
+Description: Measures Robin Hood, linear probing and cuckoo hashing on the
+same key stream as the load factor rises, and writes the results for
+HashTableComparison in robin_hood_array.py to animate.
+
+Each engine fills one table through every load in LOADS. At each load:
+
+    insert      inserts/s for the keys that took the table there
+    hit, miss   finds/s for keys that are / are not in the table
+    delete      deletes/s, on a copy so the fill carries on unchanged
+    tail        mean, p50, p99, p99.9 and max probe length of the stored
+                keys, and the mean slots a miss examines
+
+Every engine is NumPy arrays driven by a Python loop, so the rates are far
+below a C implementation; what carries over is how they compare and how
+they fall off with load. A cuckoo insert that runs out of kicks ends that
+engine's run at the last load it reached.
+
+Usage:
+    python hash_bench.py                               # 2^16 slots -> hash_bench.json/.csv
+    python hash_bench.py -c 1048576 --ops 20000
+    python hash_bench.py --engines robin_hood cuckoo
+"""
+
+import argparse
+import copy
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from hash_tables import CuckooTable, LinearProbingTable, RobinHoodTable
+
+ROOT = Path(__file__).resolve().parent
+RESULTS = ROOT / "hash_bench.json"
+ENGINES = {
+    "robin_hood": RobinHoodTable,
+    "linear_probing": LinearProbingTable,
+    "cuckoo": CuckooTable,
+}
+LOADS = (0.1, 0.25, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95)
+COLUMNS = (
+    "engine", "load", "insert_per_s", "hit_per_s", "miss_per_s", "delete_per_s",
+    "mean_probe", "p50_probe", "p99_probe", "p999_probe", "max_probe", "miss_probes",
+)
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def bench_engine(name, capacity, loads=LOADS, ops=5000, seed=0):
+    """Fill one ``name`` table through ``loads``; return a row of measurements per load."""
+    table = ENGINES[name](capacity)
+    capacity = table.capacity  # cuckoo rounds down to whole buckets
+    rng = np.random.default_rng(seed)
+    n_max = int(max(loads) * capacity)
+    stream = rng.choice(2**62, size=n_max + ops, replace=False)
+    keys, absent = stream[:n_max], stream[n_max:].tolist()
+
+    rows, done = [], 0
+    for load in loads:
+        target = int(load * capacity)
+        start = time.perf_counter()
+        try:
+            table.insert_many(keys[done:target])
+        except ValueError as exc:
+            print(f"  {name}: {exc}; stopping at load {table.load_factor:.3f}")
+            break
+        inserted = _rate(target - done, time.perf_counter() - start)
+        done = target
+
+        present = rng.choice(keys[:done], size=min(ops, done), replace=False).tolist()
+        start = time.perf_counter()
+        for key in present:
+            table.find(key)
+        hits = _rate(len(present), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        examined = sum(table.find(key)[1] for key in absent)
+        misses = _rate(len(absent), time.perf_counter() - start)
+
+        scratch = copy.deepcopy(table)
+        start = time.perf_counter()
+        for key in present:
+            scratch.delete(key)
+        deletes = _rate(len(present), time.perf_counter() - start)
+
+        lengths = table.probe_lengths()
+        p50, p99, p999 = np.percentile(lengths, [50, 99, 99.9])
+        rows.append({
+            "engine": name, "load": round(table.load_factor, 4),
+            "insert_per_s": inserted, "hit_per_s": hits, "miss_per_s": misses, "delete_per_s": deletes,
+            "mean_probe": float(lengths.mean()), "p50_probe": float(p50), "p99_probe": float(p99),
+            "p999_probe": float(p999), "max_probe": int(lengths.max()),
+            "miss_probes": examined / len(absent),
+        })
+    return rows
+
+
+def run_benchmarks(engines=tuple(ENGINES), capacity=2**16, loads=LOADS, ops=5000, seed=0):
+    """Benchmark every engine on the same key stream; return the results document."""
+    rows = []
+    for name in engines:
+        start = time.perf_counter()
+        rows += bench_engine(name, capacity, loads, ops, seed)
+        print(f"  {name:<15} {time.perf_counter() - start:6.1f}s")
+    return {"capacity": capacity, "ops": ops, "seed": seed, "loads": list(loads), "rows": rows}
+
+
+def write_results(results, path=RESULTS):
+    """Write ``path`` (JSON) and the same rows as CSV next to it."""
+    path = Path(path)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+    with path.with_suffix(".csv").open("w", newline="") as fp:
+        writer = csv.DictWriter(fp, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(results["rows"])
+
+
+def print_results(results):
+    print(f"{'engine':<15} {'load':>5} {'insert/s':>10} {'hit/s':>10} {'miss/s':>10} "
+          f"{'delete/s':>10} {'mean':>6} {'p99':>5} {'p99.9':>6} {'max':>5} {'miss slots':>10}")
+    for row in results["rows"]:
+        print(f"{row['engine']:<15} {row['load']:5.2f} {row['insert_per_s']:10,.0f} "
+              f"{row['hit_per_s']:10,.0f} {row['miss_per_s']:10,.0f} {row['delete_per_s']:10,.0f} "
+              f"{row['mean_probe']:6.2f} {row['p99_probe']:5.0f} {row['p999_probe']:6.0f} "
+              f"{row['max_probe']:5d} {row['miss_probes']:10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-c", "--capacity", type=int, default=2**16, help="slots per table")
+    parser.add_argument("--ops", type=int, default=5000, help="finds and deletes timed per load")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS,
+                        help="JSON results; the CSV goes next to it")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_benchmarks(args.engines, args.capacity, ops=args.ops, seed=args.seed)
+    print_results(results)
+    write_results(results, args.output)
+    print(f"Wrote {args.output} and {args.output.with_suffix('.csv')} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+"""
+Hash Table Engines
+Description: Array-backed Robin Hood, linear probing and cuckoo hash tables
+that record what each insert does as a compact list of events, so
+robin_hood_array.py can animate any key stream and the same code can be
+benchmarked without manim.
+
+All three tables share one interface:
+    insert(key)         store ``key``, return its events
+    insert_many(keys)   store a batch without recording events
+    find(key)           (slot holding ``key`` or EMPTY, slots examined)
+    delete(key)         remove ``key``, return whether it was there
+    probe_lengths()     slots past the first that finding each stored key examines
+    size, capacity, load_factor
+
+Events for one insert, in order:
+    probe  the carried key is compared against the occupant of ``slot``
+    swap   the carried key takes ``slot`` and the occupant (``evicted``)
+           becomes the carried key (Robin Hood: it was closer to home;
+           cuckoo: it is kicked to its other bucket)
+    place  the carried key lands in the empty ``slot``
+
+Run ``python hash_tables.py`` to benchmark 10^6 inserts and print the mean and
+max probe length as the load factor rises; ``--vectorized`` gets the same
+statistics from robin_hood_dists, which lays out a whole batch of keys with
+NumPy instead of inserting them one by one; ``--check`` runs the engines'
+self-check. hash_bench.py compares the three tables.
+"""
+
+import argparse
+import random
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+EMPTY = -1
+_FIBONACCI = np.uint64(0x9E3779B97F4A7C15)
+_CUCKOO = np.uint64(0xC2B2AE3D27D4EB4F)  # second, independent hash for cuckoo buckets
+_MASK = 2**64 - 1
+
+
+class Event(NamedTuple):
+    kind: str
+    slot: int
+    key: int
+    dist: int
+    evicted: int = EMPTY
+
+
+def home_slots(keys, capacity, multiplier=_FIBONACCI):
+    """Fibonacci hashing of integer keys onto ``range(capacity)``."""
+    keys = np.asarray(keys, dtype=np.int64).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        mixed = (keys * multiplier) >> np.uint64(32)
+    return (mixed % np.uint64(capacity)).astype(np.int64)
+
+
+def home_slot(key, capacity, multiplier=_FIBONACCI):
+    """:func:`home_slots` of a single key, without the NumPy call overhead."""
+    return (((key & _MASK) * int(multiplier) & _MASK) >> 32) % capacity
+
+
+class OpenAddressingTable:
+    """Linear-probing table over NumPy arrays of keys, home slots and probe distances.
+
+    Subclasses decide where an insert lands (``_insert``), whether a lookup
+    can give up before reaching an empty slot (``_passed``) and how a
+    deletion closes the gap it leaves (``_remove``). ``insert``, ``find``
+    and ``delete`` take an optional ``home`` in place of the key's hash.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.keys = np.full(capacity, EMPTY, dtype=np.int64)
+        self.homes = np.zeros(capacity, dtype=np.int64)
+        self.dists = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+
+    @property
+    def load_factor(self):
+        return self.size / self.capacity
+
+    def insert(self, key, home=None):
+        """Insert ``key`` (at ``home`` if given, else its hash) and return its events."""
+        if home is None:
+            home = home_slot(key, self.capacity)
+        events = []
+        self._insert(key, home, events)
+        return events
+
+    def insert_many(self, keys, homes=None):
+        """Insert a batch of keys without recording events."""
+        keys = np.asarray(keys, dtype=np.int64)
+        if homes is None:
+            homes = home_slots(keys, self.capacity)
+        for key, home in zip(keys.tolist(), np.asarray(homes).tolist()):
+            self._insert(key, home, None)
+
+    def find(self, key, home=None):
+        """Slot holding ``key`` (EMPTY when absent) and the number of slots examined."""
+        if home is None:
+            home = home_slot(key, self.capacity)
+        keys, capacity = self.keys, self.capacity
+        slot = home % capacity
+        for dist in range(capacity):
+            occupant = int(keys[slot])
+            if occupant == key:
+                return slot, dist + 1
+            if occupant == EMPTY or self._passed(slot, dist):
+                return EMPTY, dist + 1
+            slot = (slot + 1) % capacity
+        return EMPTY, capacity
+
+    def delete(self, key, home=None):
+        """Remove ``key``; return whether it was in the table."""
+        slot, _ = self.find(key, home)
+        if slot == EMPTY:
+            return False
+        self._remove(slot)
+        self.size -= 1
+        return True
+
+    def probe_lengths(self):
+        """Probe distance of every stored key."""
+        return self.dists[self.keys != EMPTY]
+
+    def _passed(self, slot, dist):
+        return False
+
+
+class RobinHoodTable(OpenAddressingTable):
+    """Robin Hood hash table: inserts take slots from keys closer to home than they are."""
+
+    def _insert(self, key, home, events):
+        if self.size >= self.capacity:
+            raise ValueError("Robin Hood table is full")
+        keys, homes, dists = self.keys, self.homes, self.dists
+        capacity = self.capacity
+        slot, dist = home % capacity, 0
+        while True:
+            occupant = int(keys[slot])
+            if occupant == EMPTY:
+                keys[slot], homes[slot], dists[slot] = key, home, dist
+                self.size += 1
+                if events is not None:
+                    events.append(Event("place", slot, key, dist))
+                return
+            if events is not None:
+                events.append(Event("probe", slot, key, dist, occupant))
+            occupant_dist = int(dists[slot])
+            if occupant_dist < dist:
+                # Take from the rich: the occupant is closer to home than we are.
+                occupant_home = int(homes[slot])
+                keys[slot], homes[slot], dists[slot] = key, home, dist
+                if events is not None:
+                    events.append(Event("swap", slot, key, dist, occupant))
+                key, home, dist = occupant, occupant_home, occupant_dist
+            slot = (slot + 1) % capacity
+            dist += 1
+
+    def _passed(self, slot, dist):
+        # The key would have displaced an occupant this close to home.
+        return int(self.dists[slot]) < dist
+
+    def _remove(self, slot):
+        # Backward shift: pull each following key one slot closer to home
+        # until an empty slot or a key that is already home. The hole is
+        # emptied as it moves, so in a full table the walk stops on reaching it.
+        keys, homes, dists, capacity = self.keys, self.homes, self.dists, self.capacity
+        keys[slot], dists[slot] = EMPTY, 0
+        following = (slot + 1) % capacity
+        while keys[following] != EMPTY and dists[following] > 0:
+            keys[slot], homes[slot], dists[slot] = keys[following], homes[following], dists[following] - 1
+            keys[following], dists[following] = EMPTY, 0
+            slot, following = following, (following + 1) % capacity
+
+    def cascade_lengths(self, homes):
+        """Slots an insert at each of ``homes`` would walk before landing in an empty slot.
+
+        A Robin Hood insert shifts everything between its home and the first
+        empty slot at or after it (wrapping around), so this is also the
+        length of its displacement cascade. Nothing is inserted.
+        """
+        empties = np.flatnonzero(self.keys == EMPTY)
+        if not len(empties):
+            raise ValueError("Robin Hood table is full")
+        homes = np.asarray(homes, dtype=np.int64) % self.capacity
+        nxt = np.searchsorted(empties, homes)
+        wrapped = nxt == len(empties)
+        ends = np.where(wrapped, empties[0] + self.capacity, empties[np.minimum(nxt, len(empties) - 1)])
+        return ends - homes
+
+
+class LinearProbingTable(OpenAddressingTable):
+    """Plain linear probing: an insert takes the first empty slot at or after its home."""
+
+    def _insert(self, key, home, events):
+        if self.size >= self.capacity:
+            raise ValueError("linear probing table is full")
+        keys, capacity = self.keys, self.capacity
+        slot, dist = home % capacity, 0
+        while (occupant := int(keys[slot])) != EMPTY:
+            if events is not None:
+                events.append(Event("probe", slot, key, dist, occupant))
+            slot = (slot + 1) % capacity
+            dist += 1
+        keys[slot], self.homes[slot], self.dists[slot] = key, home, dist
+        self.size += 1
+        if events is not None:
+            events.append(Event("place", slot, key, dist))
+
+    def _remove(self, slot):
+        # Knuth's Algorithm R: move back every later key of the run whose
+        # home is at or before the hole, so no lookup stops short of it. The
+        # hole is emptied as it moves, so in a full table the walk stops on
+        # coming back round to it.
+        keys, homes, dists, capacity = self.keys, self.homes, self.dists, self.capacity
+        keys[slot], dists[slot] = EMPTY, 0
+        hole = following = slot
+        while True:
+            following = (following + 1) % capacity
+            if keys[following] == EMPTY:
+                break
+            gap = (following - hole) % capacity
+            if dists[following] >= gap:
+                keys[hole], homes[hole], dists[hole] = keys[following], homes[following], dists[following] - gap
+                keys[following], dists[following] = EMPTY, 0
+                hole = following
+
+
+class CuckooTable:
+    """Bucketized cuckoo hash table: every key lives in one of two buckets of ``bucket_size`` slots.
+
+    An insert takes a free slot in either bucket. When both are full it
+    kicks a random occupant out to that key's other bucket, and so on for
+    up to ``max_kicks`` evictions; an insert that runs out of kicks is
+    undone and raises ValueError, so no stored key is ever lost. Lookups
+    and deletes examine at most two buckets. ``capacity`` is rounded down
+    to whole buckets.
+    """
+
+    def __init__(self, capacity, bucket_size=4, max_kicks=500, seed=0):
+        self.bucket_size = bucket_size
+        self.n_buckets = capacity // bucket_size
+        self.capacity = self.n_buckets * bucket_size
+        self.max_kicks = max_kicks
+        self.keys = np.full(self.capacity, EMPTY, dtype=np.int64)
+        self.size = 0
+        self._rng = random.Random(seed)
+
+    @property
+    def load_factor(self):
+        return self.size / self.capacity
+
+    def buckets(self, key):
+        """The two buckets ``key`` may live in."""
+        first = home_slot(key, self.n_buckets)
+        second = home_slot(key, self.n_buckets, _CUCKOO)
+        return first, (second if second != first else (first + 1) % self.n_buckets)
+
+    def insert(self, key):
+        """Insert ``key`` and return its events."""
+        events = []
+        self._insert(key, events)
+        return events
+
+    def insert_many(self, keys):
+        """Insert a batch of keys without recording events."""
+        for key in np.asarray(keys, dtype=np.int64).tolist():
+            self._insert(key, None)
+
+    def _insert(self, key, events):
+        if self.size >= self.capacity:
+            raise ValueError("cuckoo table is full")
+        keys, width = self.keys, self.bucket_size
+        path = []  # (slot, key it held) for undoing a failed insert
+        carried, candidates = key, self.buckets(key)
+        for kicks in range(self.max_kicks + 1):
+            for bucket in candidates:
+                for slot in range(bucket * width, (bucket + 1) * width):
+                    occupant = int(keys[slot])
+                    if occupant == EMPTY:
+                        keys[slot] = carried
+                        self.size += 1
+                        if events is not None:
+                            events.append(Event("place", slot, carried, kicks))
+                        return
+                    if events is not None:
+                        events.append(Event("probe", slot, carried, kicks, occupant))
+            bucket = candidates[self._rng.randrange(len(candidates))]
+            slot = bucket * width + self._rng.randrange(width)
+            evicted = int(keys[slot])
+            path.append((slot, evicted))
+            keys[slot] = carried
+            if events is not None:
+                events.append(Event("swap", slot, carried, kicks, evicted))
+            first, second = self.buckets(evicted)
+            carried, candidates = evicted, (second if first == bucket else first,)
+        for slot, occupant in reversed(path):
+            keys[slot] = occupant
+        raise ValueError(f"cuckoo insert gave up after {self.max_kicks} kicks at load {self.load_factor:.3f}")
+
+    def find(self, key):
+        """Slot holding ``key`` (EMPTY when absent) and the number of slots examined."""
+        keys, width = self.keys, self.bucket_size
+        examined = 0
+        for bucket in self.buckets(key):
+            for slot in range(bucket * width, (bucket + 1) * width):
+                examined += 1
+                if int(keys[slot]) == key:
+                    return slot, examined
+        return EMPTY, examined
+
+    def delete(self, key):
+        """Remove ``key``; return whether it was in the table."""
+        slot, _ = self.find(key)
+        if slot == EMPTY:
+            return False
+        self.keys[slot] = EMPTY
+        self.size -= 1
+        return True
+
+    def probe_lengths(self):
+        """Slots past the first that finding each stored key examines."""
+        slots = np.flatnonzero(self.keys != EMPTY)
+        first = home_slots(self.keys[slots], self.n_buckets)
+        offset = slots % self.bucket_size
+        return np.where(slots // self.bucket_size == first, offset, self.bucket_size + offset)
+
+
+def robin_hood_dists(sorted_homes, capacity):
+    """Probe distances in a Robin Hood table holding keys with these homes, computed without inserting.
+
+    Robin Hood keeps every run of occupied slots ordered by home, so the
+    i-th key in home order lands in slot p_i = max(h_i, p_{i-1} + 1), i.e.
+    ``p = i + cummax(h - i)``. Keys pushed past the last slot wrap to the
+    front: laying the homes out twice, the second copy shifted by
+    ``capacity``, lets the first copy's overflow push the second copy
+    exactly as it pushes the real front of the table. The distances are
+    those of any insertion order; they come back in home order.
+    """
+    homes = np.asarray(sorted_homes, dtype=np.int64)
+    n = len(homes)
+    if n >= capacity:
+        raise ValueError("Robin Hood table is full")
+    doubled = np.concatenate([homes, homes + capacity])
+    index = np.arange(2 * n)
+    slots = index + np.maximum.accumulate(doubled - index)
+    return slots[n:] - doubled[n:]
+
+
+def probe_length_timeline(capacity, loads, bins=32, seed=0, batch=None):
+    """Probe-length statistics as random keys stream into a Robin Hood table.
+
+    For each load factor in ``loads`` (ascending) the keys that take the
+    table there are hashed and merged into the sorted homes in one batch,
+    then every distance is recomputed with :func:`robin_hood_dists`.
+    Returns a dict of arrays, one row per load: ``hist`` (fraction of keys
+    at each probe length, the last bin counting ``bins - 1`` and longer),
+    ``mean``, ``var`` and ``max``. ``batch`` caps the keys drawn from the
+    random generator at once.
+    """
+    rng = np.random.default_rng(seed)
+    loads = np.asarray(loads, dtype=np.float64)
+    hist = np.zeros((len(loads), bins))
+    mean, var, longest = np.zeros(len(loads)), np.zeros(len(loads)), np.zeros(len(loads), dtype=np.int64)
+    homes = np.zeros(0, dtype=np.int64)
+    for row, load in enumerate(loads):
+        missing = int(load * capacity) - len(homes)
+        chunks = [homes]
+        while missing > 0:
+            size = missing if batch is None else min(batch, missing)
+            chunks.append(home_slots(rng.integers(0, 2**62, size=size), capacity))
+            missing -= size
+        homes = np.concatenate(chunks)
+        homes.sort(kind="stable")  # sorted runs: a merge, not a full sort
+        dists = robin_hood_dists(homes, capacity)
+        hist[row] = np.bincount(np.minimum(dists, bins - 1), minlength=bins) / len(dists)
+        mean[row], var[row], longest[row] = dists.mean(), dists.var(), dists.max()
+    return {"load": loads, "hist": hist, "mean": mean, "var": var, "max": longest}
+
+
+def self_check(seed=0):
+    """Random inserts, finds and deletes on every table against a Python set; raise AssertionError on a mismatch."""
+    rng = random.Random(seed)
+    for cls in (RobinHoodTable, LinearProbingTable, CuckooTable):
+        # A full table (as full as cuckoo gets): the first delete's walk has no empty slot to stop at.
+        for capacity in (1, 2, 4, 7, 8):
+            table, stored = cls(capacity), []
+            for key in range(table.capacity):
+                try:
+                    table.insert(key)
+                except ValueError:
+                    break
+                stored.append(key)
+            rng.shuffle(stored)
+            for count, key in enumerate(stored, start=1):
+                assert table.delete(key), f"{cls.__name__}: delete({key}) from a full table"
+                assert all(table.find(other)[0] != EMPTY for other in stored[count:]), cls.__name__
+            assert table.size == 0, cls.__name__
+
+        table, stored = cls(1000), set()
+        for _ in range(20_000):
+            if stored and rng.random() < 0.5:
+                key = rng.choice(sorted(stored))
+                assert table.delete(key), f"{cls.__name__}: lost {key}"
+                stored.discard(key)
+            elif table.size < 0.95 * table.capacity:
+                key = rng.getrandbits(62)
+                if key not in stored:
+                    table.insert(key)
+                    stored.add(key)
+            absent = rng.getrandbits(62)
+            assert (table.find(absent)[0] == EMPTY) == (absent not in stored), cls.__name__
+        assert table.size == len(stored), cls.__name__
+        assert all(table.find(key)[0] != EMPTY for key in stored), cls.__name__
+        lengths = sorted(table.probe_lengths().tolist())
+        assert lengths == sorted(table.find(key)[1] - 1 for key in stored), cls.__name__
+
+
+def benchmark(n=10**6, max_load=0.95, checkpoints=(0.1, 0.25, 0.5, 0.75, 0.85, 0.9, 0.95), seed=0):
+    """Insert ``n`` random keys; return rows of (load, mean, max probe length, inserts/s)."""
+    capacity = int(np.ceil(n / max_load))
+    table = RobinHoodTable(capacity)
+    keys = np.random.default_rng(seed).choice(2**62, size=n, replace=False)
+    rows, done = [], 0
+    for load in checkpoints:
+        target = min(n, int(load * capacity))
+        start = time.perf_counter()
+        table.insert_many(keys[done:target])
+        elapsed = time.perf_counter() - start
+        lengths = table.probe_lengths()
+        rows.append((table.load_factor, lengths.mean(), int(lengths.max()),
+                     (target - done) / elapsed if elapsed else float("inf")))
+        done = target
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Robin Hood insert benchmark")
+    parser.add_argument("-n", type=int, default=10**6, help="keys to insert")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="compute the probe lengths with probe_length_timeline instead of inserting")
+    parser.add_argument("--check", action="store_true",
+                        help="run the engines' self-check instead of the benchmark")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.check:
+        self_check()
+        print(f"Self-check passed in {time.perf_counter() - start:.1f}s")
+        return
+    if args.vectorized:
+        checkpoints = np.array([0.1, 0.25, 0.5, 0.75, 0.85, 0.9, 0.95])
+        stats = probe_length_timeline(int(np.ceil(args.n / 0.95)), checkpoints)
+        print(f"{'load':>6} {'mean PSL':>9} {'var PSL':>8} {'max PSL':>8}")
+        for load, mean, var, longest in zip(checkpoints, stats["mean"], stats["var"], stats["max"]):
+            print(f"{load:6.2f} {mean:9.3f} {var:8.2f} {longest:8d}")
+        print(f"{args.n:,} keys in {time.perf_counter() - start:.1f}s")
+        return
+    rows = benchmark(args.n)
+    print(f"{'load':>6} {'mean PSL':>9} {'max PSL':>8} {'inserts/s':>11}")
+    for load, mean, longest, rate in rows:
+        print(f"{load:6.2f} {mean:9.3f} {longest:8d} {rate:11,.0f}")
+    print(f"{args.n:,} inserts in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Mobject Pool
+Description: Memoizing factory for Text and SVGMobject, so Pango layout and SVG
+parsing run once per unique input and every later request gets a copy.
+
+    from mobject_pool import pool
+
+    label = pool.text("A(5)", font_size=22, color=PINK)
+    flag = pool.svg("flag.svg").scale(0.2)
+
+Copies are independent mobjects: moving, recoloring or animating one never
+touches the pooled original. The pool is bounded by the total size of the
+point arrays it holds and drops the least recently used entries first.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+
+from manim import DEFAULT_FONT_SIZE, ManimColor, SVGMobject, Text
+
+
+class MobjectPool:
+    """LRU cache of pre-built mobjects handing out ``.copy()``\\ s."""
+
+    def __init__(self, max_bytes=64 * 1024**2):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (mobject, size in bytes)
+        self._bytes = 0
+
+    def text(self, text, font_size=DEFAULT_FONT_SIZE, color=None, line_spacing=-1, **kwargs):
+        """A copy of ``Text(text, font_size=..., color=..., line_spacing=..., **kwargs)``."""
+        key = (
+            "text",
+            text,
+            font_size,
+            None if color is None else ManimColor(color).to_hex(),
+            line_spacing,
+            repr(sorted(kwargs.items())),
+        )
+        return self._get(
+            key,
+            lambda: Text(
+                text, font_size=font_size, color=color, line_spacing=line_spacing, **kwargs
+            ),
+        )
+
+    def svg(self, file_name, **kwargs):
+        """A copy of ``SVGMobject(file_name, **kwargs)``; edits to the file are picked up."""
+        path = Path(file_name).resolve()
+        key = ("svg", str(path), path.stat().st_mtime_ns, repr(sorted(kwargs.items())))
+        return self._get(key, lambda: SVGMobject(file_name, **kwargs))
+
+    def _get(self, key, build):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0].copy()
+
+        self.misses += 1
+        mobject = build()
+        size = sum(m.points.nbytes for m in mobject.get_family())
+        self._entries[key] = (mobject, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+        return mobject.copy()
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+pool = MobjectPool()
@@ -0,0 +1,228 @@
+"""
+Parallel Render Driver
+Description: Renders every Scene in rl_manim.py and robin_hood_array.py at the
+same time in a process pool, then concatenates the scenes listed in
+file_list.txt into final_video.mp4 and reports the runtime of each scene.
+Scenes whose inputs are unchanged are restored from the render cache, and
+all TeX the remaining scenes need is compiled up front in a single batch.
+
+Usage:
+    python render_all.py                  # all cores, 1080p60
+    python render_all.py -j 4 -q low_quality
+    python render_all.py -j 1             # serial baseline
+    python render_all.py --no-cache       # force a full re-render
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from assemble import AssemblyError, assemble, read_file_list, report_durations
+from render_cache import RenderCache, scene_key
+from tex_batch import prebuild_tex
+
+ROOT = Path(__file__).resolve().parent
+SCENE_FILES = [ROOT / "rl_manim.py", ROOT / "robin_hood_array.py"]
+FILE_LIST = ROOT / "file_list.txt"
+VIDEO_DIR = "{media_dir}/videos/main/{quality}"
+QUALITY_DIRS = {
+    "low_quality": "480p15",
+    "medium_quality": "720p30",
+    "high_quality": "1080p60",
+    "production_quality": "1440p60",
+    "fourk_quality": "2160p60",
+}
+CACHE_DIR = ROOT / ".render_cache"
+
+
+def discover_scenes(paths=SCENE_FILES):
+    """Return (path, class name) for every Scene subclass, in source order.
+
+    The files are parsed rather than imported, so discovery does not need
+    manim and does not pay for its import time.
+    """
+    scenes = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = [getattr(base, "id", getattr(base, "attr", "")) for base in node.bases]
+            if any(base.endswith("Scene") for base in bases):
+                scenes.append((Path(path), node.name))
+    return scenes
+
+
+def read_scene_order(file_list=FILE_LIST):
+    """Scene names in the order they appear in an ffmpeg concat list."""
+    return [video.stem for video in read_file_list(file_list)]
+
+
+def order_scenes(scenes, order):
+    """Put the concatenated scenes first (in file_list order), then the rest."""
+    rank = {name: i for i, name in enumerate(order)}
+    return sorted(scenes, key=lambda s: rank.get(s[1], len(rank)))
+
+
+def render_scene(path, scene_name, quality, cache=True, elide_holds=False):
+    """Render one scene in the current process and return its timing.
+
+    Runs inside a pool worker, so manim is imported here and its global
+    config only ever belongs to this one scene. ``cache=False`` also turns
+    off manim's partial-movie cache and the per-section cache;
+    ``elide_holds`` renders with :mod:`static_holds`.
+    """
+    os.chdir(path.parent)
+    from manim import config, logger
+
+    config.quality = quality
+    config.input_file = str(path)
+    config.video_dir = VIDEO_DIR
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+    if not cache:
+        config.disable_caching = True
+    logger.setLevel("WARNING")
+    if elide_holds:
+        import static_holds
+
+        static_holds.install()
+
+    module = _load_module(path)
+    start = time.perf_counter()
+    scene = getattr(module, scene_name)()
+    scene.render()
+    result = {
+        "scene": scene_name,
+        "seconds": time.perf_counter() - start,
+        "movie": str(scene.renderer.file_writer.movie_file_path),
+    }
+    if "mobject_pool" in sys.modules:
+        result["pool"] = sys.modules["mobject_pool"].pool.stats()
+    if elide_holds:
+        result["holds"] = scene.renderer.stats()
+    return result
+
+
+def _load_module(path):
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    sys.path.insert(0, str(path.parent))
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_all(scenes, quality="high_quality", workers=None, cache=True, elide_holds=False):
+    """Render scenes in a process pool; return (results, failures, wall time)."""
+    results, failures = {}, {}
+    start = time.perf_counter()
+    # One scene per worker process: manim keeps global state between renders.
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(render_scene, path, name, quality, cache, elide_holds): name
+            for path, name in scenes
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as exc:
+                failures[name] = exc
+                print(f"  FAILED {name}: {exc!r}")
+            else:
+                result = results[name]
+                line = f"  rendered {name:<26} {result['seconds']:7.1f}s"
+                if "pool" in result:
+                    line += " | mobject pool {hits} hits / {misses} misses".format(**result["pool"])
+                if "holds" in result:
+                    line += " | {rasterized} drawn / {encoded} encoded of {written} frames".format(
+                        **result["holds"]
+                    )
+                print(line)
+    return results, failures, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="render processes (default: all cores)")
+    parser.add_argument("-q", "--quality", default="high_quality", choices=QUALITY_DIRS)
+    parser.add_argument("--file-list", type=Path, default=FILE_LIST,
+                        help="concat list giving the scene order")
+    parser.add_argument("--output", type=Path, help="default: <video dir>/final_video.mp4")
+    parser.add_argument("--no-concat", action="store_true")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-render every scene and leave the cache untouched")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--cache-size", type=int, default=2048,
+                        help="cache budget in MiB (default: 2048)")
+    parser.add_argument("--no-tex-batch", action="store_true",
+                        help="let each scene compile its own TeX")
+    parser.add_argument("--elide-holds", action="store_true",
+                        help="draw and encode each static hold once (see static_holds.py)")
+    parser.add_argument("scenes", nargs="*", help="only render these scenes")
+    args = parser.parse_args(argv)
+
+    order = read_scene_order(args.file_list)
+    scenes = order_scenes(discover_scenes(), order)
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+
+    cache = None
+    if not args.no_cache:
+        cache = RenderCache(args.cache_dir, max_bytes=args.cache_size * 1024**2)
+    video_dir = ROOT / "media" / "videos" / "main" / QUALITY_DIRS[args.quality]
+    cached, pending = {}, []
+    for path, name in scenes:
+        key = scene_key(path, name, args.quality)
+        movie = video_dir / f"{name}.mp4"
+        if cache and cache.fetch(key, name, movie):
+            cached[name] = {"scene": name, "seconds": 0.0, "movie": str(movie)}
+        else:
+            pending.append((path, name, key))
+    if pending and not args.no_tex_batch:
+        prebuild_tex([(path, name) for path, name, _ in pending], args.workers)
+    print(f"Rendering {len(pending)} of {len(scenes)} scenes with {args.workers} workers")
+
+    results, failures, wall = render_all(
+        [(path, name) for path, name, _ in pending], args.quality, args.workers,
+        cache=not args.no_cache, elide_holds=args.elide_holds,
+    )
+    # Not a serial baseline: scenes competing for the CPU each take longer than alone.
+    aggregate = sum(r["seconds"] for r in results.values())
+    print(f"Wall clock: {wall:.1f}s | per-scene sum: {aggregate:.1f}s | "
+          f"aggregate/wall: {aggregate / wall if wall else 0:.2f}x")
+    if cache:
+        for _, name, key in pending:
+            if name in results:
+                cache.store(key, name, results[name]["movie"])
+        cache.report()
+    results.update(cached)
+    if failures:
+        return 1
+
+    if not args.no_concat:
+        videos = [results[name]["movie"] for name in order if name in results]
+        if len(videos) != len(order):
+            print("Skipping concat: not every scene in the file list was rendered")
+            return 0
+        output = args.output or Path(videos[0]).parent / "final_video.mp4"
+        try:
+            manifest = assemble(videos, output, names=order, workers=args.workers)
+        except AssemblyError as exc:
+            print(f"Not assembling {output}: {exc}")
+            return 1
+        print(f"Wrote {output} and {output.with_suffix('.json')}")
+        report_durations(manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
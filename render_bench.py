@@ -0,0 +1,193 @@
+"""
+Render Benchmark
+Description: Renders every scene at a fixed low quality, one fresh process per
+scene, and records wall time, play() calls, frames written, peak RSS and
+bytes written. Results are compared against a stored JSON baseline and any
+scene slower than the threshold is flagged (exit status 1).
+
+Usage:
+    python render_bench.py --save-baseline     # record render_bench.json
+    python render_bench.py                     # compare against it
+    python render_bench.py -t 0.25 --repeat 3 RobinHoodInsertion
+    python render_bench.py --elide-holds       # static_holds render mode vs the baseline
+    python render_bench.py --step-chains RobinHoodInsertion RobinHoodDeletion
+                                               # unbatched cascades vs the baseline
+
+Everything is rendered with Cairo on the CPU into .render_bench/media, so the
+normal media/ tree and the render cache are left alone. TeX compiled on the
+first run stays in .render_bench/media/Tex; later runs time the scenes
+themselves rather than latex.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from render_all import _load_module, discover_scenes
+
+ROOT = Path(__file__).resolve().parent
+BASELINE = ROOT / "render_bench.json"
+MEDIA_DIR = ROOT / ".render_bench" / "media"
+QUALITY = "low_quality"
+METRICS = ("seconds", "plays", "frames", "peak_rss", "bytes_written")
+
+
+def _bytes_written():
+    """Bytes this process has passed to write(), or None off Linux."""
+    try:
+        with open("/proc/self/io") as fp:
+            for line in fp:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def bench_scene(path, scene_name, media_dir=MEDIA_DIR, elide_holds=False, step_chains=False):
+    """Render one scene in this (fresh) process and return its metrics."""
+    os.chdir(path.parent)
+    from manim import config, logger
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    config.quality = QUALITY
+    config.input_file = str(path)
+    config.media_dir = str(media_dir)
+    config.disable_caching = True
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+    logger.setLevel("WARNING")
+
+    frames = 0
+    write_frame = SceneFileWriter.write_frame
+
+    def counting_write_frame(self, frame_or_renderer, num_frames=1):
+        nonlocal frames
+        frames += num_frames
+        return write_frame(self, frame_or_renderer, num_frames)
+
+    SceneFileWriter.write_frame = counting_write_frame
+    if elide_holds:
+        import static_holds
+
+        static_holds.install()
+    module = _load_module(path)
+    written = _bytes_written()
+    start = time.perf_counter()
+    scene_cls = getattr(module, scene_name)
+    if step_chains and hasattr(scene_cls, "batch_chains"):
+        scene_cls.batch_chains = False
+    scene = scene_cls()
+    scene.render()
+    seconds = time.perf_counter() - start
+    after = _bytes_written()
+    return {
+        "seconds": seconds,
+        "plays": scene.renderer.num_plays,
+        "frames": frames,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "bytes_written": None if written is None else after - written,
+    }
+
+
+def run_benchmarks(scenes, repeat=1, elide_holds=False, step_chains=False):
+    """Bench each scene ``repeat`` times, one at a time; keep the fastest run."""
+    results = {}
+    for path, name in scenes:
+        runs = []
+        for _ in range(repeat):
+            # Serial, one process per render: timings are not skewed by other
+            # scenes and manim's global state never leaks between runs.
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                runs.append(pool.submit(
+                    bench_scene, path, name, MEDIA_DIR, elide_holds, step_chains
+                ).result())
+        results[name] = min(runs, key=lambda r: r["seconds"])
+        print(_format_row(name, results[name]))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the scenes whose wall time grew by more than ``threshold``."""
+    regressions = []
+    print(f"\n{'scene':<26} {'base s':>8} {'now s':>8} {'change':>8}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<26} {'-':>8} {now['seconds']:8.2f}      new")
+            continue
+        change = now["seconds"] / before["seconds"] - 1 if before["seconds"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26} {before['seconds']:8.2f} {now['seconds']:8.2f} {change:+8.1%}{flag}")
+        for metric in ("plays", "frames"):
+            if now[metric] != before.get(metric):
+                print(f"{'':<26} {metric}: {before.get(metric)} -> {now[metric]}")
+    return regressions
+
+
+def _format_row(name, metrics):
+    written = metrics["bytes_written"]
+    return (
+        f"  {name:<26} {metrics['seconds']:7.2f}s {metrics['plays']:4d} plays "
+        f"{metrics['frames']:6d} frames {metrics['peak_rss'] / 1024**2:7.1f} MiB RSS "
+        + ("" if written is None else f"{written / 1024**2:7.1f} MiB written")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline instead of comparing")
+    parser.add_argument("-t", "--threshold", type=float, default=0.15,
+                        help="flag scenes slower than baseline by this fraction (default: 0.15)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="renders per scene; the fastest is kept (default: 1)")
+    parser.add_argument("--elide-holds", action="store_true",
+                        help="render with static_holds (compare against a normal baseline)")
+    parser.add_argument("--step-chains", action="store_true",
+                        help="play Robin Hood cascades step by step (batch_chains = False)")
+    parser.add_argument("scenes", nargs="*", help="only bench these scenes")
+    args = parser.parse_args(argv)
+
+    scenes = discover_scenes()
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+    print(f"Benchmarking {len(scenes)} scenes at {QUALITY}")
+    results = run_benchmarks(scenes, args.repeat, args.elide_holds, args.step_chains)
+
+    if args.save_baseline or not args.baseline.exists():
+        stored = {}
+        if args.baseline.exists():
+            stored = json.loads(args.baseline.read_text())["scenes"]
+        stored.update(results)
+        args.baseline.write_text(json.dumps({
+            "quality": QUALITY,
+            "machine": platform.platform(),
+            "python": platform.python_version(),
+            "scenes": stored,
+        }, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline["scenes"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} scene(s) regressed by more than {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    print(f"\nNo scene regressed by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Render Cache
+Description: Content-addressed store of finished scene movies, so a build only
+re-renders the scenes whose inputs changed.
+
+A scene's key hashes its file's source minus the other scenes' classes (so
+construct, helpers on the class and module-level helpers such as
+robin_hood_array.ChainTimeline all count), the source of local modules its
+file imports, every asset file the class references by name (flag.svg,
+cross.svg, ...), the render quality/fps and the installed manim version.
+Entries are evicted least-recently-used once the cache grows past its size
+budget; processes sharing a cache directory merge their changes to its index.
+
+:func:`cached_run` keeps the results of the scenes' engine runs (training,
+experiments, benchmarks) on disk, keyed on the call and the engine's source,
+so the TeX pre-pass's dry run and the render that follows compute each once;
+they are trimmed least-recently-used like the movies, in a budget of their own.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: index writes stay atomic, but concurrent writers are not serialized
+    fcntl = None
+
+ASSET_SUFFIXES = (".svg", ".png", ".jpg", ".wav", ".mp3", ".json")
+ENGINE_CACHE_DIR = Path(__file__).resolve().parent / ".render_cache" / "engines"
+ENGINE_CACHE_SIZE = 512  # MiB
+
+
+def _manim_version():
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _local_imports(tree, root):
+    """Source files in ``root`` imported at module level by ``tree``."""
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    paths = [root / f"{name.split('.')[0]}.py" for name in names]
+    return sorted({p for p in paths if p.exists()})
+
+
+def _other_scene_lines(tree, class_node):
+    """Line numbers of every Scene class in ``tree`` other than ``class_node``."""
+    lines = set()
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node is not class_node and any(
+            getattr(base, "id", getattr(base, "attr", "")).endswith("Scene")
+            for base in node.bases
+        ):
+            lines.update(range(node.lineno, node.end_lineno + 1))
+    return lines
+
+
+def _referenced_assets(class_node, root):
+    assets = set()
+    for node in ast.walk(class_node):
+        if (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, str)
+            and node.value.lower().endswith(ASSET_SUFFIXES)
+        ):
+            path = root / node.value
+            if path.exists():
+                assets.add(path)
+    return sorted(assets)
+
+
+def scene_key(path, scene_name, quality):
+    """Hex digest identifying one rendered movie of ``scene_name``."""
+    path = Path(path)
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    class_node = next(
+        node for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == scene_name
+    )
+
+    digest = hashlib.sha256()
+    for part in (scene_name, quality, _manim_version()):
+        digest.update(part.encode() + b"\0")
+    # Other scenes in the file do not affect this one; everything else might.
+    excluded = _other_scene_lines(tree, class_node)
+    for number, line in enumerate(source.splitlines(), start=1):
+        if number not in excluded:
+            digest.update(line.encode() + b"\n")
+    for dependency in _local_imports(tree, path.parent):
+        digest.update(dependency.name.encode() + b"\0" + dependency.read_bytes())
+    for asset in _referenced_assets(class_node, path.parent):
+        digest.update(asset.name.encode() + b"\0" + asset.read_bytes())
+    return digest.hexdigest()
+
+
+def cached_run(function, *args, **kwargs):
+    """``function(*args, **kwargs)``, computed once per arguments and engine source.
+
+    The key hashes the function's qualified name, its pickled arguments and
+    the source of its module plus the local modules that module imports. The
+    pickled result is kept in a :class:`RenderCache` in :data:`ENGINE_CACHE_DIR`,
+    trimmed least-recently-used to :data:`ENGINE_CACHE_SIZE` MiB.
+    """
+    path = Path(inspect.getsourcefile(function)).resolve()
+    name = f"{function.__module__}.{function.__qualname__}"
+    digest = hashlib.sha256()
+    digest.update(name.encode() + b"\0")
+    digest.update(pickle.dumps((args, sorted(kwargs.items()))))
+    for source in [path, *_local_imports(ast.parse(path.read_bytes()), path.parent)]:
+        digest.update(source.name.encode() + b"\0" + source.read_bytes())
+    key = digest.hexdigest()
+
+    cache = RenderCache(ENGINE_CACHE_DIR, max_bytes=ENGINE_CACHE_SIZE * 1024**2, suffix=".pkl")
+    # Scenes run in parallel processes; each works on its own copy of the blob.
+    scratch = cache.directory / f"{key}.{os.getpid()}.result"
+    try:
+        if cache.fetch(key, name, scratch):
+            return pickle.loads(scratch.read_bytes())
+        result = function(*args, **kwargs)
+        scratch.write_bytes(pickle.dumps(result))
+        cache.store(key, name, scratch)
+        return result
+    finally:
+        scratch.unlink(missing_ok=True)
+
+
+class RenderCache:
+    """Size-bounded LRU store of scene movies keyed by :func:`scene_key` (or of other
+    files, such as :func:`cached_run`'s pickles, ending in ``suffix``).
+
+    Several processes may share one directory. Every change re-reads the index
+    under a file lock, applies itself, evicts and writes the index aside before
+    renaming it into place, so no process drops another's entries or reads a
+    half-written index.
+    """
+
+    def __init__(self, directory, max_bytes=2 * 1024**3, suffix=".mp4"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = []
+        self.misses = []
+        self.evicted = []
+        self.pinned = set()  # keys _evict must keep, e.g. while they are still to be fetched
+        self.index = self._read_index()
+
+    def _blob(self, key):
+        return self.directory / f"{key}{self.suffix}"
+
+    def _read_index(self):
+        try:
+            return json.loads(self.index_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    @contextmanager
+    def _update(self):
+        """Lock the directory and yield the index as it is on disk now; evict and write it back."""
+        with open(self.directory / "index.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+            self.index = self._read_index()
+            yield self.index
+            self._evict()
+            partial = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_text(json.dumps(self.index, indent=2))
+            os.replace(partial, self.index_path)
+
+    def __contains__(self, key):
+        return key in self.index and self._blob(key).exists()
+
+    def fetch(self, key, scene_name, target):
+        """Copy the cached movie for ``key`` to ``target``; False on a miss."""
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._update() as index:
+            try:
+                if key not in index:
+                    raise FileNotFoundError(key)
+                shutil.copyfile(self._blob(key), target)
+            except FileNotFoundError:
+                index.pop(key, None)
+                self.misses.append(scene_name)
+                return False
+            index[key]["last_used"] = time.time()
+        self.hits.append(scene_name)
+        return True
+
+    def store(self, key, scene_name, movie):
+        blob = self._blob(key)
+        partial = blob.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(movie, partial)
+        os.replace(partial, blob)
+        with self._update() as index:
+            index[key] = {
+                "scene": scene_name,
+                "size": blob.stat().st_size,
+                "last_used": time.time(),
+            }
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key in self.pinned:
+                continue
+            entry = self.index.pop(key)
+            self._blob(key).unlink(missing_ok=True)
+            total -= entry["size"]
+            self.evicted.append(entry["scene"])
+
+    def report(self):
+        size = sum(entry["size"] for entry in self.index.values())
+        print(f"Render cache: {len(self.hits)} hits, {len(self.misses)} misses, "
+              f"{len(self.evicted)} evicted ({size / 1024**2:.1f} MiB in use)")
+        if self.hits:
+            print("  reused:   " + ", ".join(self.hits))
+        if self.misses:
+            print("  rendered: " + ", ".join(self.misses))
@@ -0,0 +1,1022 @@
+"""
+Reinforcement Learning Engines
+Description: NumPy implementations of the algorithms animated in rl_manim.py,
+so the numbers on screen come from real computations and the same code can
+be benchmarked on problems far larger than a scene can show.
+
+Gridworld conventions: a grid of shape (rows, cols) is flattened row-major,
+row 0 is the top row, and actions are 0=up, 1=right, 2=down, 3=left.
+
+Run ``python rl_engines.py <engine> --help`` for the benchmarks, e.g.
+``value-iteration`` times value iteration on 200x200 and larger grids.
+"""
+
+import argparse
+import heapq
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+ACTIONS = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])  # (d_row, d_col)
+ACTION_NAMES = ("up", "right", "down", "left")
+
+
+def grid_transitions(shape, walls=None):
+    """Next state of every (action, state) pair, as an int array of shape (4, S).
+
+    Moving off the grid or into a wall leaves the agent where it is.
+    """
+    rows, cols = shape
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    blocked = np.zeros(rows * cols, dtype=bool) if walls is None else np.asarray(walls).ravel()
+    nxt = np.empty((len(ACTIONS), rows * cols), dtype=np.int64)
+    for a, (dr, dc) in enumerate(ACTIONS):
+        nr, nc = r + dr, c + dc
+        inside = (nr >= 0) & (nr < rows) & (nc >= 0) & (nc < cols)
+        target = np.where(inside, nr * cols + nc, 0)
+        nxt[a] = np.where(inside & ~blocked[target], target, np.arange(rows * cols))
+    return nxt
+
+
+class ValueIterationResult(NamedTuple):
+    values: np.ndarray   # V*, shape (rows, cols)
+    policy: np.ndarray   # greedy action per cell, shape (rows, cols)
+    sweeps: int
+    history: list        # V after each sweep, if recorded
+
+
+def value_iteration(rewards, terminal, walls=None, gamma=0.9, slip=0.1,
+                    tol=1e-6, max_sweeps=10_000, record=False):
+    """Solve a stochastic gridworld with synchronous Bellman backups.
+
+    ``rewards`` holds R(s) for every cell; ``terminal`` and ``walls`` are
+    boolean masks of the same shape. The intended move succeeds with
+    probability ``1 - 2 * slip`` and slips to each perpendicular direction
+    with probability ``slip``. Every sweep backs up all states and actions at
+    once::
+
+        V(s) = R(s) + gamma * max_a sum_s' T(s, a, s') V(s')
+
+    and iteration stops once no value moves by more than ``tol``.
+    """
+    rewards = np.asarray(rewards, dtype=np.float64)
+    shape = rewards.shape
+    terminal = np.asarray(terminal, dtype=bool).ravel()
+    walls = np.zeros(shape, dtype=bool) if walls is None else np.asarray(walls, dtype=bool)
+    nxt = grid_transitions(shape, walls)
+    reward = rewards.ravel()
+    fixed = terminal | walls.ravel()
+    fixed_values = np.where(terminal, reward, 0.0)
+    live = ~fixed
+
+    values = fixed_values.copy()
+    history = [values.reshape(shape).copy()] if record else []
+    sweeps = 0
+    for sweeps in range(1, max_sweeps + 1):
+        after = values[nxt]  # (4, S): value of landing after each intended move
+        # Perpendicular slips of action a are the moves a +/- 1 (mod 4).
+        q = (1 - 2 * slip) * after + slip * (np.roll(after, 1, axis=0) + np.roll(after, -1, axis=0))
+        new = np.where(live, reward + gamma * q.max(axis=0), fixed_values)
+        delta = np.abs(new - values).max()
+        values = new
+        if record:
+            history.append(values.reshape(shape).copy())
+        if delta < tol:
+            break
+
+    after = values[nxt]
+    q = (1 - 2 * slip) * after + slip * (np.roll(after, 1, axis=0) + np.roll(after, -1, axis=0))
+    return ValueIterationResult(
+        values.reshape(shape), q.argmax(axis=0).reshape(shape), sweeps, history
+    )
+
+
+def greedy_path(policy, start, terminal, walls=None):
+    """Cells visited when following ``policy`` without slipping from ``start``."""
+    shape = policy.shape
+    nxt = grid_transitions(shape, walls)
+    terminal = np.asarray(terminal, dtype=bool).ravel()
+    state = start[0] * shape[1] + start[1]
+    path = [state]
+    while not terminal[state] and len(path) <= policy.size:
+        state = int(nxt[policy.flat[state], state])
+        if state == path[-1]:
+            break  # the policy walks into a wall
+        path.append(state)
+    return [divmod(s, shape[1]) for s in path]
+
+
+class GridWorld(NamedTuple):
+    """Deterministic gridworld: boolean ``walls`` and ``goal`` masks, per-cell ``penalty`` rewards."""
+    walls: np.ndarray
+    penalty: np.ndarray  # reward for stepping onto a cell, <= 0
+    goal: np.ndarray
+    start: tuple
+
+    @property
+    def shape(self):
+        return self.walls.shape
+
+
+def make_gridworld(shape, start, goals, penalties=None, walls=()):
+    """GridWorld from cell lists: ``goals`` and ``walls`` are (row, col) cells,
+    ``penalties`` maps cells to their (negative) reward."""
+    world = GridWorld(np.zeros(shape, dtype=bool), np.zeros(shape), np.zeros(shape, dtype=bool),
+                      tuple(start))
+    for cell in walls:
+        world.walls[tuple(cell)] = True
+    for cell in np.atleast_2d(goals):
+        world.goal[tuple(cell)] = True
+    for cell, reward in (penalties or {}).items():
+        world.penalty[tuple(cell)] = reward
+    return world
+
+
+def random_gridworld(shape, wall_density=0.2, penalty_density=0.05, seed=0):
+    """Random world from the top-left to the bottom-right corner, for benchmarks."""
+    rng = np.random.default_rng(seed)
+    draw = rng.random(shape)
+    walls = draw < wall_density
+    penalty = np.where((draw >= wall_density) & (draw < wall_density + penalty_density), -1.0, 0.0)
+    goal = np.zeros(shape, dtype=bool)
+    goal[-1, -1] = True
+    walls[0, 0] = walls[-1, -1] = False
+    penalty[0, 0] = penalty[-1, -1] = 0.0
+    return GridWorld(walls, penalty, goal, (0, 0))
+
+
+def plan_path(world, goal=None, avoid_penalties=True):
+    """Cheapest path from ``world.start`` to any ``goal`` cell (default: the world's goal), or None.
+
+    Every step costs 1, plus the penalty of the cell it enters when
+    ``avoid_penalties`` is set, so a penalty of -1 is worth a detour of up to
+    one extra step. A* with the Manhattan distance when there is a single
+    goal cell, Dijkstra otherwise. Ties go to the move listed first in
+    ``ACTIONS``.
+    """
+    shape = world.shape
+    cols = shape[1]
+    goal = world.goal if goal is None else np.asarray(goal, dtype=bool)
+    targets = np.flatnonzero(goal)
+    if targets.size == 0:
+        return None
+    nxt = grid_transitions(shape, world.walls).T.tolist()  # state -> 4 successors
+    step = (1 - world.penalty.ravel() if avoid_penalties else np.ones(world.walls.size)).tolist()
+    is_goal = goal.ravel().tolist()
+    if targets.size == 1:
+        goal_row, goal_col = divmod(int(targets[0]), cols)
+
+        def heuristic(state):
+            row, col = divmod(state, cols)
+            return abs(row - goal_row) + abs(col - goal_col)
+    else:
+        def heuristic(state):
+            return 0
+
+    source = world.start[0] * cols + world.start[1]
+    best = {source: 0.0}
+    parent = {source: source}
+    heap = [(heuristic(source), 0, 0.0, source)]
+    pushed = 0
+    while heap:
+        _, _, cost, state = heapq.heappop(heap)
+        if cost > best[state]:
+            continue  # stale entry
+        if is_goal[state]:
+            path = [state]
+            while path[-1] != source:
+                path.append(parent[path[-1]])
+            return [divmod(s, cols) for s in reversed(path)]
+        for successor in nxt[state]:
+            new = cost + step[successor]
+            if successor != state and new < best.get(successor, np.inf):
+                best[successor] = new
+                parent[successor] = state
+                pushed += 1
+                heapq.heappush(heap, (new + heuristic(successor), pushed, new, successor))
+    return None
+
+
+def sample_wrong_path(world):
+    """A path that walks from the start straight onto the nearest penalty cell, or None."""
+    return plan_path(world, goal=world.penalty < 0, avoid_penalties=False)
+
+
+def bench_planning(sizes=(100, 250, 500, 1000), seed=0):
+    """Time building and planning random worlds; return rows of (size, build s, plan s, steps)."""
+    rows = []
+    for n in sizes:
+        start = time.perf_counter()
+        world = random_gridworld((n, n), seed=seed)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        path = plan_path(world)
+        rows.append((n, built, time.perf_counter() - start, None if path is None else len(path) - 1))
+    return rows
+
+
+class TDUpdate(NamedTuple):
+    """One state's batched TD(0) update, averaged over the walkers that left it."""
+    episode: int        # first episode of the batch
+    step: int
+    state: int
+    walkers: int
+    reward: float       # mean reward of those walkers
+    next_value: float   # mean V(s') they bootstrapped from (0 at the ends)
+    value: float        # V(s) before the update
+    updated: float      # V(s) after the update
+
+
+class TDResult(NamedTuple):
+    values: np.ndarray
+    snapshots: np.ndarray          # V sampled evenly over training, shape (k, n_states)
+    snapshot_episodes: np.ndarray  # episodes completed at each snapshot
+    log: list                      # the first TDUpdates, in order
+
+
+def td0_random_walk(n_states=5, episodes=10_000, alpha=0.1, gamma=1.0, batch=1000,
+                    start=None, init=0.5, snapshots=10, log=20, seed=0):
+    """TD(0) prediction on the classic random walk, ``batch`` episodes at a time.
+
+    States 0..n_states-1 sit between two terminals; each step moves left or
+    right with equal probability and leaving on the right pays +1. A batch of
+    walkers runs in lock-step: at every step each visited state takes one
+    alpha-step towards the mean TD target of the walkers that left it,
+    so a batch of one is ordinary TD(0).
+    """
+    rng = np.random.default_rng(seed)
+    start = n_states // 2 if start is None else start
+    values = np.full(n_states, init, dtype=np.float64)
+    history, done_at, updates = [values.copy()], [0], []
+    for first in range(0, episodes, batch):
+        size = min(batch, episodes - first)
+        pos = np.full(size, start)
+        step = 0
+        while pos.size:
+            nxt = pos + rng.choice((-1, 1), size=pos.size)
+            reward = (nxt == n_states).astype(np.float64)
+            ended = (nxt < 0) | (nxt >= n_states)
+            next_value = np.where(ended, 0.0, values[np.clip(nxt, 0, n_states - 1)])
+            delta = reward + gamma * next_value - values[pos]
+
+            counts = np.bincount(pos, minlength=n_states)
+            visited = counts > 0
+            new = values.copy()
+            new[visited] += alpha * np.bincount(pos, delta, n_states)[visited] / counts[visited]
+            for state in np.flatnonzero(visited)[: max(0, log - len(updates))]:
+                mask = pos == state
+                updates.append(TDUpdate(
+                    first, step, int(state), int(counts[state]),
+                    float(reward[mask].mean()), float(next_value[mask].mean()),
+                    float(values[state]), float(new[state]),
+                ))
+            values = new
+            pos = nxt[~ended]
+            step += 1
+        history.append(values.copy())
+        done_at.append(first + size)
+
+    pick = np.unique(np.linspace(0, len(history) - 1, snapshots).round().astype(int))
+    return TDResult(values, np.array(history)[pick], np.array(done_at)[pick], updates)
+
+
+CLIFF_SHAPE = (4, 12)
+CLIFF_START, CLIFF_GOAL = (3, 0), (3, 11)
+
+
+def _cliff_tables():
+    """Next state, reward and done flag for every (action, state) of the cliff walk."""
+    rows, cols = CLIFF_SHAPE
+    nxt = grid_transitions(CLIFF_SHAPE)
+    start, goal = CLIFF_START[0] * cols, CLIFF_GOAL[0] * cols + CLIFF_GOAL[1]
+    cliff = np.zeros(rows * cols, dtype=bool)
+    cliff[start + 1:goal] = True  # bottom row between start and goal
+    reward = np.where(cliff[nxt], -100.0, -1.0)
+    nxt = np.where(cliff[nxt], start, nxt)  # falling sends the agent back to the start
+    return nxt, reward, nxt == goal
+
+
+def cliff_walk(method, seeds, episodes=500, alpha=0.5, gamma=1.0, epsilon=0.1):
+    """Train one epsilon-greedy agent per seed on the cliff walk, all in lock-step.
+
+    ``method`` is ``"sarsa"`` or ``"q-learning"``. Q has a leading seed axis and
+    every step updates all seeds with one fancy-indexed assignment; a seed that
+    finishes an episode starts its next one straight away. Each seed draws from
+    its own generator, so its run is the same whichever seeds share its batch.
+    Returns ``(returns of shape (seeds, episodes), Q of shape (seeds, S, 4), steps)``.
+    """
+    nxt, reward, done = _cliff_tables()
+    k = len(seeds)
+    streams = [np.random.default_rng(np.random.SeedSequence(seed)) for seed in seeds]
+    block, drawn = 256, [None, 256]
+    start = CLIFF_START[0] * CLIFF_SHAPE[1] + CLIFF_START[1]
+    q = np.zeros((k, nxt.shape[1], len(ACTIONS)))
+    returns = np.zeros((k, episodes))
+    rows = np.arange(k)
+
+    def uniforms():
+        # One row of uniforms per seed per call, refilled a block at a time.
+        if drawn[1] == block:
+            drawn[0] = np.stack([g.random((block, len(ACTIONS) + 2)) for g in streams])
+            drawn[1] = 0
+        drawn[1] += 1
+        return drawn[0][:, drawn[1] - 1]
+
+    def choose(states):
+        values = q[rows, states]
+        u = uniforms()
+        # Random tie-breaking among equal Q values, then epsilon exploration.
+        greedy = (values + u[:, :len(ACTIONS)] * 1e-9).argmax(axis=1)
+        explore = u[:, -2] < epsilon
+        return np.where(explore, (u[:, -1] * len(ACTIONS)).astype(np.int64), greedy)
+
+    state = np.full(k, start)
+    action = choose(state)
+    episode = np.zeros(k, dtype=np.int64)
+    ret = np.zeros(k)
+    steps = 0
+    while True:
+        active = episode < episodes
+        if not active.any():
+            break
+        new_state, r, end = nxt[action, state], reward[action, state], done[action, state]
+        new_action = choose(new_state)
+        if method == "sarsa":
+            bootstrap = q[rows, new_state, new_action]
+        else:
+            bootstrap = q[rows, new_state].max(axis=1)
+        target = r + gamma * np.where(end, 0.0, bootstrap)
+        live = rows[active]
+        q[live, state[live], action[live]] += alpha * (target - q[rows, state, action])[live]
+        ret += r
+        steps += int(active.sum())
+
+        finished = end & active
+        returns[finished, episode[finished]] = ret[finished]
+        episode += finished
+        ret[end] = 0.0
+        state = np.where(end, start, new_state)
+        action = np.where(end, choose(state), new_action)
+    return returns, q, steps
+
+
+def _cliff_chunk(method, seeds, episodes, alpha, epsilon):
+    returns, q, steps = cliff_walk(method, seeds, episodes, alpha=alpha, epsilon=epsilon)
+    return method, returns, q.sum(axis=0), steps
+
+
+def cliff_path(q, max_steps=100):
+    """Cells visited greedily under ``q`` (shape (S, 4)) from the start, stopping at the goal or the cliff."""
+    nxt, reward, _ = _cliff_tables()
+    cols = CLIFF_SHAPE[1]
+    state = CLIFF_START[0] * cols + CLIFF_START[1]
+    path = [divmod(state, cols)]
+    while len(path) <= max_steps and path[-1] != CLIFF_GOAL:
+        action = int(q[state].argmax())
+        if reward[action, state] < -1:
+            break  # the greedy policy steps off the cliff
+        state = int(nxt[action, state])
+        path.append(divmod(state, cols))
+    return path
+
+
+class CliffExperiment(NamedTuple):
+    mean: dict     # method -> mean return per episode
+    ci: dict       # method -> 95% confidence half-width per episode
+    paths: dict    # method -> greedy path under the seed-averaged Q
+    seeds: int
+    steps: int
+    seconds: float
+
+
+def run_cliff_experiment(n_seeds=200, episodes=500, alpha=0.5, epsilon=0.1,
+                         workers=None, chunk=50):
+    """Sarsa and Q-learning over ``n_seeds`` seeds, chunks of seeds spread over a process pool.
+
+    Seeds are seeded one by one, so the results do not depend on ``chunk`` or ``workers``.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = ("sarsa", "q-learning")
+    chunks = [list(range(i, min(i + chunk, n_seeds))) for i in range(0, n_seeds, chunk)]
+    returns = {m: [] for m in methods}
+    q_sum = {m: 0.0 for m in methods}
+    steps = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_cliff_chunk, m, seeds, episodes, alpha, epsilon)
+            for m in methods for seeds in chunks
+        ]
+        for future in futures:
+            method, chunk_returns, chunk_q, chunk_steps = future.result()
+            returns[method].append(chunk_returns)
+            q_sum[method] = q_sum[method] + chunk_q
+            steps += chunk_steps
+    seconds = time.perf_counter() - start
+
+    mean, ci = {}, {}
+    for method in methods:
+        stacked = np.concatenate(returns[method])
+        mean[method] = stacked.mean(axis=0)
+        ci[method] = 1.96 * stacked.std(axis=0, ddof=1) / np.sqrt(len(stacked)) if n_seeds > 1 \
+            else np.zeros(episodes)
+    paths = {m: cliff_path(q_sum[m] / n_seeds) for m in methods}
+    return CliffExperiment(mean, ci, paths, n_seeds, steps, seconds)
+
+
+class SumTree:
+    """Binary sum tree over ``capacity`` leaf priorities, stored in one flat array.
+
+    Node i has children 2i and 2i+1; leaves live at ``size + index`` and the
+    root (node 1) holds the total. Updates and searches take O(log n) and
+    both work on whole batches of leaves at once.
+    """
+
+    def __init__(self, capacity):
+        self.size = 1 << max(0, int(capacity - 1).bit_length())
+        self.depth = self.size.bit_length() - 1
+        self.tree = np.zeros(2 * self.size)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices) + self.size
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def set(self, index, priority):
+        """Single-leaf update, without the array overhead of :meth:`update`."""
+        tree = self.tree
+        node = index + self.size
+        tree[node] = priority
+        node >>= 1
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node >>= 1
+
+    def find(self, mass):
+        """Leaf index holding each prefix-sum ``mass`` (a batch of values in [0, total))."""
+        nodes = np.ones(len(mass), dtype=np.int64)
+        mass = np.array(mass, dtype=np.float64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            right = mass >= left
+            mass -= left * right
+            nodes = 2 * nodes + right
+        return nodes - self.size
+
+    def leaves(self, indices):
+        return self.tree[np.asarray(indices) + self.size]
+
+
+class PrioritizedReplayBuffer:
+    """Preallocated ring buffer of transitions with proportional prioritized sampling.
+
+    New transitions get the largest priority seen so far, so each is likely
+    to be replayed at least once. ``sample`` draws one index per equal slice
+    of the total priority mass and returns importance-sampling weights
+    ``(N * P(i)) ** -beta``, normalised to a maximum of 1.
+    """
+
+    def __init__(self, capacity, state_shape=(), alpha=0.6, state_dtype=np.float32):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.states = np.zeros((capacity, *state_shape), dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, *state_shape), dtype=state_dtype)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+        self.position = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, state, action, reward, next_state, done):
+        """Store one transition, overwriting the oldest when full; return its slot."""
+        slot = self.position
+        self.states[slot] = state
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.next_states[slot] = next_state
+        self.dones[slot] = done
+        self.tree.set(slot, self.max_priority ** self.alpha)
+        self.position = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return slot
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        slots = (self.position + np.arange(len(actions))) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+        self.dones[slots] = dones
+        self.tree.update(slots, self.max_priority ** self.alpha)
+        self.position = int(slots[-1] + 1) % self.capacity
+        self.count = min(self.count + len(slots), self.capacity)
+        return slots
+
+    def sample(self, batch_size, beta=0.4, rng=None):
+        """Return ``(slots, (s, a, r, s', done), weights)`` for a prioritized batch."""
+        rng = np.random.default_rng() if rng is None else rng
+        total = self.tree.total
+        mass = (np.arange(batch_size) + rng.random(batch_size)) * (total / batch_size)
+        slots = np.minimum(self.tree.find(mass), self.count - 1)
+        probs = self.tree.leaves(slots) / total
+        weights = (self.count * probs) ** -beta
+        weights /= weights.max()
+        batch = (self.states[slots], self.actions[slots], self.rewards[slots],
+                 self.next_states[slots], self.dones[slots])
+        return slots, batch, weights
+
+    def update_priorities(self, slots, td_errors, eps=1e-6):
+        priorities = np.abs(td_errors) + eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(slots, priorities ** self.alpha)
+
+    def priorities(self):
+        """Sampling weight p_i ** alpha of every stored slot."""
+        return self.tree.leaves(np.arange(self.count))
+
+
+def bench_replay(capacity=10**6, batch=256, rounds=2000, seed=0):
+    """Insert, sample and priority-update throughput of a full buffer of ``capacity``."""
+    rng = np.random.default_rng(seed)
+    buffer = PrioritizedReplayBuffer(capacity, state_shape=(4,))
+    chunk = 1000
+    states = rng.random((chunk, 4), dtype=np.float32)
+    actions, rewards = rng.integers(3, size=chunk), rng.random(chunk)
+    dones = rng.random(chunk) < 0.01
+
+    start = time.perf_counter()
+    for _ in range(capacity // chunk):
+        buffer.add_batch(states, actions, rewards, states, dones)
+    batched = capacity / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(rounds * 10):
+        buffer.add(states[i % chunk], actions[i % chunk], rewards[i % chunk], states[i % chunk], False)
+    single = rounds * 10 / (time.perf_counter() - start)
+
+    sample_time = update_time = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        slots, _, _ = buffer.sample(batch, rng=rng)
+        sample_time += time.perf_counter() - start
+        start = time.perf_counter()
+        buffer.update_priorities(slots, rng.random(batch) * 2)
+        update_time += time.perf_counter() - start
+    return {
+        "insert_batched": batched,
+        "insert_single": single,
+        "sample": rounds * batch / sample_time,
+        "update": rounds * batch / update_time,
+    }
+
+
+class CorridorEnv:
+    """Batch of 1-D corridors: reach the right end, jumping over the pits.
+
+    Actions are 0=left, 1=right, 2=jump (two cells right). Stepping into a
+    pit pays -1 and ends the episode, reaching the last cell pays +1, every
+    other step costs a little (a jump costs more). Each of the ``n_envs``
+    corridors resets on its own when its episode ends. The state is a
+    one-hot row of the agent's cell, a one-pixel-high "image".
+    """
+
+    ACTIONS = ("Left", "Right", "Jump")
+
+    def __init__(self, n_envs=1, length=10, pits=(3, 6), max_steps=30, seed=0):
+        self.n_envs = n_envs
+        self.length = length
+        self.pit = np.zeros(length + 2, dtype=bool)
+        self.pit[list(pits)] = True
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros(n_envs, dtype=np.int64)
+        self.clock = np.zeros(n_envs, dtype=np.int64)
+
+    def observe(self, position=None):
+        position = self.position if position is None else np.asarray(position)
+        return np.eye(self.length, dtype=np.float32)[np.minimum(position, self.length - 1)]
+
+    def step(self, actions):
+        """Advance every corridor; return ``(next_states, rewards, dones)`` before auto-reset."""
+        moves = np.array([-1, 1, 2])[actions]
+        position = np.clip(self.position + moves, 0, self.length - 1)
+        fell, arrived = self.pit[position], position == self.length - 1
+        reward = np.where(fell, -1.0, np.where(arrived, 1.0, np.where(actions == 2, -0.05, -0.01)))
+        self.clock += 1
+        done = fell | arrived | (self.clock >= self.max_steps)
+        next_states = self.observe(position)
+        self.position = np.where(done, 0, position)
+        self.clock[done] = 0
+        return next_states, reward, done
+
+
+class MLP:
+    """Fully connected ReLU network with a linear output layer, on batches of row vectors."""
+
+    def __init__(self, sizes, rng):
+        self.weights = [rng.normal(0, np.sqrt(2 / m), (m, n)) for m, n in zip(sizes, sizes[1:])]
+        self.biases = [np.zeros(n) for n in sizes[1:]]
+
+    def forward(self, x):
+        """Return the output and every layer's activations, input first."""
+        activations = [x]
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < len(self.weights) - 1:
+                x = np.maximum(x, 0)
+            activations.append(x)
+        return x, activations
+
+    def backward(self, activations, grad):
+        """Gradients of the weights and biases given d(loss)/d(output)."""
+        grads_w, grads_b = [], []
+        for i in reversed(range(len(self.weights))):
+            grads_w.append(activations[i].T @ grad)
+            grads_b.append(grad.sum(axis=0))
+            if i:
+                grad = (grad @ self.weights[i].T) * (activations[i] > 0)
+        return grads_w[::-1], grads_b[::-1]
+
+    def params(self):
+        return self.weights + self.biases
+
+    def load(self, other):
+        for mine, theirs in zip(self.params(), other.params()):
+            mine[...] = theirs
+
+
+class Adam:
+    def __init__(self, params, lr=1e-3, betas=(0.9, 0.999), eps=1e-8):
+        self.params, self.lr, self.betas, self.eps = params, lr, betas, eps
+        self.m = [np.zeros_like(p) for p in params]
+        self.v = [np.zeros_like(p) for p in params]
+        self.t = 0
+
+    def step(self, grads):
+        self.t += 1
+        b1, b2 = self.betas
+        for p, g, m, v in zip(self.params, grads, self.m, self.v):
+            m *= b1
+            m += (1 - b1) * g
+            v *= b2
+            v += (1 - b2) * g * g
+            p -= self.lr * (m / (1 - b1 ** self.t)) / (np.sqrt(v / (1 - b2 ** self.t)) + self.eps)
+
+
+class DQNSnapshot(NamedTuple):
+    step: int
+    q_values: np.ndarray    # Q(start state, a) for every action
+    activations: list       # per-layer unit activations on the start state, input first
+    loss: float             # mean loss over the updates since the last snapshot
+
+
+class DQNResult(NamedTuple):
+    net: MLP
+    target: MLP
+    env: CorridorEnv
+    snapshots: list
+    samples_per_second: float
+    gamma: float
+
+
+def dqn_td_errors(net, target, batch, gamma):
+    """r + gamma * max_a' Q_target(s', a') - Q(s, a) for a batch of transitions."""
+    states, actions, rewards, next_states, dones = batch
+    q, activations = net.forward(states)
+    next_q, _ = target.forward(next_states)
+    bootstrap = np.where(dones, 0.0, next_q.max(axis=1))
+    rows = np.arange(len(actions))
+    return rewards + gamma * bootstrap - q[rows, actions], q, activations
+
+
+def train_dqn(steps=6000, n_envs=16, batch_size=64, hidden=(32, 32), gamma=0.95, lr=1e-3,
+              target_every=200, buffer_size=50_000, snapshots=12, seed=0):
+    """Train a DQN on :class:`CorridorEnv` with prioritized replay and a target network.
+
+    Every iteration steps all ``n_envs`` corridors epsilon-greedily and takes
+    one gradient step on a replayed batch of the scene's loss::
+
+        L(theta) = (r + gamma * max_a' Q_target(s', a') - Q(s, a)) ** 2
+
+    each sample scaled by its importance-sampling weight. Returns the nets,
+    ``snapshots`` Q-value/activation readings on the start state taken
+    evenly through training, and the gradient-update throughput.
+    """
+    rng = np.random.default_rng(seed)
+    env = CorridorEnv(n_envs, seed=seed)
+    sizes = (env.length, *hidden, len(CorridorEnv.ACTIONS))
+    net, target = MLP(sizes, rng), MLP(sizes, rng)
+    target.load(net)
+    optimizer = Adam(net.params(), lr)
+    buffer = PrioritizedReplayBuffer(buffer_size, state_shape=(env.length,))
+    probe = env.observe([0])
+    every = max(1, steps // snapshots)
+    history, losses = [], []
+    trained = train_time = 0.0
+
+    states = env.observe()
+    for step in range(1, steps + 1):
+        epsilon = max(0.05, 1 - step / (0.6 * steps))
+        q, _ = net.forward(states)
+        explore = rng.random(n_envs) < epsilon
+        actions = np.where(explore, rng.integers(len(CorridorEnv.ACTIONS), size=n_envs), q.argmax(axis=1))
+        next_states, rewards, dones = env.step(actions)
+        buffer.add_batch(states, actions, rewards, next_states, dones)
+        states = env.observe()
+
+        if len(buffer) >= batch_size:
+            start = time.perf_counter()
+            slots, batch, weights = buffer.sample(batch_size, beta=0.4 + 0.6 * step / steps, rng=rng)
+            delta, q, activations = dqn_td_errors(net, target, batch, gamma)
+            losses.append(float(np.mean(weights * delta ** 2)))
+            grad = np.zeros_like(q)
+            grad[np.arange(batch_size), batch[1]] = -2 * weights * delta / batch_size
+            grads_w, grads_b = net.backward(activations, grad)
+            optimizer.step(grads_w + grads_b)
+            buffer.update_priorities(slots, delta)
+            train_time += time.perf_counter() - start
+            trained += batch_size
+        if step % target_every == 0:
+            target.load(net)
+        if step % every == 0 or step == steps:
+            q, activations = net.forward(probe)
+            loss = float(np.mean(losses)) if losses else 0.0
+            history.append(DQNSnapshot(step, q[0], [a[0] for a in activations], loss))
+            losses = []
+    return DQNResult(net, target, env, history, trained / train_time if train_time else 0.0, gamma)
+
+
+def greedy_rollout(net, env, max_steps=None):
+    """Cells visited by the greedy policy of ``net`` from the start of one corridor."""
+    corridor = CorridorEnv(1, env.length, np.flatnonzero(env.pit), env.max_steps)
+    path, actions = [0], []
+    for _ in range(max_steps or env.max_steps):
+        q, _ = net.forward(corridor.observe())
+        action = int(q.argmax())
+        cell = int(min(corridor.position[0] + (-1, 1, 2)[action], env.length - 1))
+        _, _, done = corridor.step(np.array([action]))
+        path.append(cell)
+        actions.append(action)
+        if done[0]:
+            break
+    return path, actions
+
+
+def _discounted_scan(read, shape, discount, dones=None, chunk=4096, out=None):
+    """x_t + discount * (1 - done_t) * y_{t+1} along the last axis, chunk by chunk.
+
+    ``read(start, stop)`` returns the input for time steps ``start:stop``, so
+    the input (and ``dones``/``out``, e.g. np.memmap) never has to be in RAM
+    at once. Chunks are processed from the end and stay short enough that
+    ``discount**k`` cannot underflow; within a chunk the scan is a reversed
+    cumulative sum of ``discount**k * x_k`` divided by ``discount**t``, cut
+    at episode ends.
+    """
+    out = np.empty(shape) if out is None else out
+    horizon = shape[-1]
+    if 0 < discount < 1:
+        chunk = max(1, min(chunk, int(200 * np.log(10) / -np.log(discount))))
+    carry = np.zeros(shape[:-1])
+    for stop in range(horizon, 0, -chunk):
+        start = max(0, stop - chunk)
+        x = np.asarray(read(start, stop), dtype=np.float64)
+        length = stop - start
+        if discount == 0:
+            out[..., start:stop] = x
+            carry = x[..., 0]
+            continue
+        if dones is None:
+            cut = np.full(x.shape, length)
+        else:
+            # Index of the first episode end at or after each step (length if none).
+            ends = np.where(np.asarray(dones[..., start:stop], dtype=bool), np.arange(length), length)
+            cut = np.minimum.accumulate(ends[..., ::-1], axis=-1)[..., ::-1]
+        powers = discount ** np.arange(length, dtype=np.float64)
+        tail = np.cumsum((x * powers)[..., ::-1], axis=-1)[..., ::-1]
+        tail = np.concatenate([tail, np.zeros((*tail.shape[:-1], 1))], axis=-1)
+        after = np.take_along_axis(tail, np.minimum(cut + 1, length), axis=-1)
+        bootstrap = np.where(cut == length, carry[..., None] * discount ** length, 0.0)
+        result = (tail[..., :length] - after + bootstrap) / powers
+        out[..., start:stop] = result
+        carry = result[..., 0]
+    return out
+
+
+def discounted_returns(rewards, gamma, dones=None, chunk=4096, out=None):
+    """G_t = r_t + gamma * (1 - done_t) * G_{t+1} along the last axis, without a loop over t.
+
+    Works on arbitrarily long streams: ``rewards``, ``dones`` and ``out`` may
+    be np.memmap arrays (e.g. columns of a trajectory_log) and are read and
+    written one chunk at a time.
+    """
+    return _discounted_scan(lambda a, b: rewards[..., a:b], np.shape(rewards), gamma, dones, chunk, out)
+
+
+def gae(rewards, values, gamma, lam, dones=None, last_value=0.0, chunk=4096, out=None):
+    """Generalised advantage estimates A_t = sum_k (gamma * lam)^k delta_{t+k}, within episodes.
+
+    ``delta_t = r_t + gamma * (1 - done_t) * V_{t+1} - V_t``, where the value
+    after the last step is ``last_value``. Streams in chunks like
+    :func:`discounted_returns`; lam=1 gives returns minus V, lam=0 the TD errors.
+    """
+    horizon = np.shape(rewards)[-1]
+
+    def deltas(start, stop):
+        v = np.asarray(values[..., start:stop], dtype=np.float64)
+        if stop < horizon:
+            next_v = np.asarray(values[..., start + 1:stop + 1], dtype=np.float64)
+        else:
+            last = np.broadcast_to(last_value, v.shape[:-1])[..., None]
+            next_v = np.concatenate([np.asarray(values[..., start + 1:stop], dtype=np.float64), last], axis=-1)
+        if dones is not None:
+            next_v = next_v * ~np.asarray(dones[..., start:stop], dtype=bool)
+        return np.asarray(rewards[..., start:stop], dtype=np.float64) + gamma * next_v - v
+
+    return _discounted_scan(deltas, np.shape(rewards), gamma * lam, dones, chunk, out)
+
+
+class ReinforceResult(NamedTuple):
+    theta: np.ndarray          # policy logits per (state, action)
+    probs: np.ndarray          # pi(. | start) after each update, shape (updates + 1, actions)
+    mean_return: np.ndarray    # mean return of each batch
+    episodes_per_second: float
+
+
+def softmax(logits):
+    z = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return z / z.sum(axis=-1, keepdims=True)
+
+
+def reinforce(updates=200, batch=64, alpha=0.1, gamma=0.95, seed=0):
+    """REINFORCE with a tabular softmax policy on :class:`CorridorEnv`.
+
+    Each update rolls out ``batch`` episodes side by side, computes every G_t
+    with :func:`discounted_returns` and applies the batch-mean of
+    ``theta <- theta + alpha * G_t * grad log pi(a_t | s_t)``, where for a
+    softmax over logits grad log pi(a | s) = onehot(a) - pi(. | s).
+    """
+    rng = np.random.default_rng(seed)
+    env = CorridorEnv(batch, seed=seed)
+    n_actions = len(CorridorEnv.ACTIONS)
+    theta = np.zeros((env.length, n_actions))
+    horizon = env.max_steps
+    probs_log, returns_log = [softmax(theta[0])], []
+    rows = np.arange(batch)
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(updates):
+        env.position[:] = 0
+        env.clock[:] = 0
+        states = np.zeros((batch, horizon), dtype=np.int64)
+        actions = np.zeros((batch, horizon), dtype=np.int64)
+        rewards = np.zeros((batch, horizon))
+        alive = np.ones((batch, horizon), dtype=bool)
+        running = np.ones(batch, dtype=bool)
+        for t in range(horizon):
+            states[:, t] = env.position
+            pi = softmax(theta[env.position])
+            # Inverse-CDF sampling of one action per episode
+            a = (rng.random((batch, 1)) > pi.cumsum(axis=1)).sum(axis=1).clip(max=n_actions - 1)
+            _, r, done = env.step(a)
+            actions[:, t], rewards[:, t], alive[:, t] = a, r * running, running
+            running &= ~done
+            if not running.any():
+                break
+        returns = discounted_returns(rewards, gamma) * alive
+
+        pi = softmax(theta[states])                       # (batch, horizon, actions)
+        grad_log = -pi
+        grad_log[rows[:, None], np.arange(horizon), actions] += 1
+        grad = np.zeros_like(theta)
+        np.add.at(grad, states[alive], (returns[..., None] * grad_log)[alive])
+        theta += alpha * grad / batch
+
+        probs_log.append(softmax(theta[0]))
+        returns_log.append(float(returns[:, 0].mean()))
+        episodes += batch
+    elapsed = time.perf_counter() - start
+    return ReinforceResult(theta, np.array(probs_log), np.array(returns_log), episodes / elapsed)
+
+
+def bench_value_iteration(sizes=(50, 100, 200, 400), seed=0):
+    """Time value iteration on random square gridworlds; return rows of (size, sweeps, s)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in sizes:
+        rewards = np.full((n, n), -0.04)
+        terminal = np.zeros((n, n), dtype=bool)
+        walls = rng.random((n, n)) < 0.1
+        goal, pit = (0, n - 1), (n // 2, n // 2)
+        for cell, reward in ((goal, 1.0), (pit, -1.0)):
+            rewards[cell], terminal[cell], walls[cell] = reward, True, False
+        start = time.perf_counter()
+        result = value_iteration(rewards, terminal, walls)
+        rows.append((n, result.sweeps, time.perf_counter() - start))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the RL engines")
+    commands = parser.add_subparsers(dest="command", required=True)
+    vi = commands.add_parser("value-iteration", help="value iteration on NxN grids")
+    vi.add_argument("sizes", nargs="*", type=int, default=[50, 100, 200, 400])
+    td = commands.add_parser("td", help="TD(0) on the random walk")
+    td.add_argument("-n", "--states", type=int, default=5)
+    td.add_argument("-e", "--episodes", type=int, default=100_000)
+    td.add_argument("-b", "--batch", type=int, default=1000)
+    td.add_argument("--alpha", type=float, default=0.05)
+    td.add_argument("--gamma", type=float, default=1.0)
+    cliff = commands.add_parser("cliff", help="Sarsa vs Q-learning on the cliff walk")
+    cliff.add_argument("-s", "--seeds", type=int, default=200)
+    cliff.add_argument("-e", "--episodes", type=int, default=500)
+    cliff.add_argument("-j", "--workers", type=int, default=None)
+    replay = commands.add_parser("replay", help="prioritized replay buffer throughput")
+    replay.add_argument("-c", "--capacity", type=int, default=10**6)
+    replay.add_argument("-b", "--batch", type=int, default=256)
+    dqn = commands.add_parser("dqn", help="train the corridor DQN")
+    dqn.add_argument("-s", "--steps", type=int, default=6000)
+    pg = commands.add_parser("reinforce", help="REINFORCE episodes/s as the batch grows")
+    pg.add_argument("batches", nargs="*", type=int, default=[1, 8, 64, 512, 4096])
+    pg.add_argument("-e", "--episodes", type=int, default=20_000)
+    plan = commands.add_parser("plan", help="A* on random NxN gridworlds")
+    plan.add_argument("sizes", nargs="*", type=int, default=[100, 250, 500, 1000])
+    ret = commands.add_parser("returns", help="discounted returns and GAE over a long stream")
+    ret.add_argument("-n", "--steps", type=int, default=10**7)
+    ret.add_argument("--gamma", type=float, default=0.999)
+    ret.add_argument("--lam", type=float, default=0.95)
+    args = parser.parse_args(argv)
+
+    if args.command == "value-iteration":
+        print(f"{'grid':>9} {'states':>8} {'sweeps':>7} {'seconds':>8}")
+        for n, sweeps, seconds in bench_value_iteration(args.sizes):
+            print(f"{n:>4}x{n:<4} {n * n:8,d} {sweeps:7d} {seconds:8.3f}")
+    elif args.command == "plan":
+        print(f"{'grid':>11} {'build s':>8} {'plan s':>8} {'steps':>6}")
+        for n, built, planned, steps in bench_planning(args.sizes):
+            print(f"{n:>5}x{n:<5} {built:8.3f} {planned:8.3f} {steps if steps is not None else '-':>6}")
+    elif args.command == "td":
+        start = time.perf_counter()
+        run = td0_random_walk(args.states, args.episodes, args.alpha, args.gamma, args.batch)
+        print(f"{args.episodes:,} episodes in {time.perf_counter() - start:.2f}s")
+        print("V =", np.round(run.values, 3))
+    elif args.command == "replay":
+        rates = bench_replay(args.capacity, args.batch)
+        print(f"capacity {args.capacity:,}, batch {args.batch}")
+        for name, rate in rates.items():
+            print(f"  {name:<15} {rate:14,.0f} transitions/s")
+    elif args.command == "dqn":
+        start = time.perf_counter()
+        run = train_dqn(args.steps)
+        print(f"{args.steps:,} steps in {time.perf_counter() - start:.1f}s, "
+              f"{run.samples_per_second:,.0f} samples/s through the gradient updates")
+        for snap in run.snapshots:
+            q = ", ".join(f"{name} {v:+.2f}" for name, v in zip(CorridorEnv.ACTIONS, snap.q_values))
+            print(f"  step {snap.step:6d}  loss {snap.loss:.4f}  Q(start): {q}")
+        path, actions = greedy_rollout(run.net, run.env)
+        print("  greedy:", " ".join(CorridorEnv.ACTIONS[a] for a in actions), "->", path[-1])
+    elif args.command == "reinforce":
+        print(f"{'batch':>6} {'updates':>8} {'episodes/s':>12} {'final return':>13}  pi(. | start)")
+        for batch in args.batches:
+            updates = max(1, args.episodes // batch)
+            run = reinforce(updates, batch)
+            probs = " ".join(f"{p:.2f}" for p in run.probs[-1])
+            print(f"{batch:6d} {updates:8d} {run.episodes_per_second:12,.0f} "
+                  f"{run.mean_return[-1]:13.3f}  {probs}")
+    elif args.command == "returns":
+        rng = np.random.default_rng(0)
+        rewards = rng.random(args.steps, dtype=np.float32)
+        values = rng.random(args.steps, dtype=np.float32)
+        dones = rng.random(args.steps) < 1e-3
+        for name, kernel in (
+            ("returns", lambda: discounted_returns(rewards, args.gamma, dones)),
+            ("GAE", lambda: gae(rewards, values, args.gamma, args.lam, dones)),
+        ):
+            start = time.perf_counter()
+            kernel()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<8} {args.steps:,} steps in {elapsed:.2f}s ({args.steps / elapsed:,.0f} steps/s)")
+    elif args.command == "cliff":
+        run = run_cliff_experiment(args.seeds, args.episodes, workers=args.workers)
+        print(f"{run.seeds} seeds x {args.episodes} episodes x 2 methods: {run.steps:,} steps "
+              f"in {run.seconds:.2f}s ({run.steps / run.seconds:,.0f} steps/s)")
+        for method, mean in run.mean.items():
+            tail = mean[-50:].mean()
+            print(f"  {method:<10} mean return over the last 50 episodes: {tail:7.1f}, "
+                  f"greedy path {len(run.paths[method]) - 1} steps")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,39 @@ Description: This module contains animations demonstrating core concepts of RL
 
 from manim import *
 
+from compact_mobjects import BarChartPath, CellGrid
+from mobject_pool import pool
+from render_cache import cached_run
+from rl_engines import (
+    CLIFF_GOAL,
+    CLIFF_SHAPE,
+    CLIFF_START,
+    CorridorEnv,
+    PrioritizedReplayBuffer,
+    discounted_returns,
+    dqn_td_errors,
+    greedy_path,
+    make_gridworld,
+    plan_path,
+    reinforce,
+    run_cliff_experiment,
+    sample_wrong_path,
+    td0_random_walk,
+    train_dqn,
+    value_iteration,
+)
+
 
 class IntroRLScene(Scene):
     """Introduction scene demonstrating basic RL concepts through a grid world example"""
-    
+
+    # Grid world shown; the correct and wrong paths are planned on it with A*
+    shape = (3, 3)  # (rows, cols)
+    start = (0, 2)
+    goal = (2, 0)
+    penalties = {(1, 1): -1}
+    walls = ()
+
     def construct(self):
         # Initialize title sequence
         title = Text("Reinforcement Learning: 101", font_size=60, color=YELLOW)
@@ -23,59 +52,77 @@ class IntroRLScene(Scene):
         self.wait(0.9)
         self.play(FadeOut(VGroup(title, presenter)), run_time=0.9)
 
-        # Create 3x3 grid environment
-        grid = VGroup()
-        for x in range(3):
-            for y in range(3):
-                square = Square(side_length=1.2, stroke_width=2).move_to(
-                    RIGHT * x + DOWN * y
-                )
-                grid.add(square)
+        # Grid world model: start, goal and penalty cells; both paths are planned on it
+        world = make_gridworld(
+            self.shape, self.start, [self.goal], self.penalties, self.walls
+        )
+        correct_path = plan_path(world)
+        wrong_path = sample_wrong_path(world)
+        rows, cols = self.shape
+        cell = min(1.2, 5.0 / max(rows, cols))
+
+        # one mobject for all cell outlines and one for the wall fills, whatever the size;
+        # cells sit at most one unit apart, so the default 3x3 keeps its overlapping 1.2 squares
+        pitch = min(1.0, cell)
+        board = CellGrid(rows, cols, size=cell, pitch=pitch, stroke_width=2)
+        walls = CellGrid(
+            rows, cols, size=cell, pitch=pitch, cells=np.flatnonzero(world.walls),
+            color=GREY, stroke_width=0, fill_opacity=0.8,
+        )
+        grid = VGroup(walls, board)
         grid.move_to(ORIGIN)
         self.play(Create(grid), run_time=1.2)
 
+        def center(cell_rc):
+            return board.cell_center(cell_rc)
+
+        def walk(path):
+            # Short walks step cell by cell; long ones glide along the whole path.
+            if len(path) <= 12:
+                for rc in path[1:]:
+                    self.play(agent.animate.move_to(center(rc)), run_time=0.26)
+            else:
+                route = VMobject().set_points_as_corners([center(rc) for rc in path])
+                self.play(MoveAlongPath(agent, route), run_time=3.0, rate_func=linear)
+
         # Initialize agent and goal states
-        agent = Dot(color=RED).move_to(grid[6].get_center())  # Starting position
+        agent = Dot(color=RED).move_to(center(self.start))  # Starting position
         goal_flag = (
-            SVGMobject("flag.svg")
-            .scale(0.2)
+            pool.svg("flag.svg")
+            .scale(0.2 * min(1.0, cell / 1.2))
             .set_color(GOLD)
-            .move_to(grid[2].get_center())
+            .move_to(center(self.goal))
         )
         self.play(FadeIn(agent), FadeIn(goal_flag), run_time=0.9)
 
         # Demonstrate wrong path with penalty
-        wrong_path = [grid[6], grid[3]]
-        for cell in wrong_path:
-            self.play(agent.animate.move_to(cell.get_center()), run_time=0.26)
-
-        penalty_cell = grid[4]
-        penalty_label = Text("-1", font_size=30, color=RED).move_to(
-            penalty_cell.get_center()
-        )
-        self.play(FadeIn(penalty_label), run_time=0.35)
-
-        self.play(agent.animate.move_to(grid[4].get_center()), run_time=0.26)
-        self.play(Flash(agent), run_time=0.26)
-        wrong_icon = (
-            SVGMobject("cross.svg")
-            .scale(0.2)
-            .move_to(grid.get_corner(UR) + RIGHT * 0.5)
-        )
-        self.play(FadeIn(wrong_icon), run_time=0.26)
-        self.wait(0.3)
-        self.play(FadeOut(wrong_icon), FadeOut(penalty_label), run_time=0.26)
-        self.wait(0.5)
+        if wrong_path is not None:
+            walk(wrong_path[:-1])
+            penalty_cell = wrong_path[-1]
+            penalty_label = Text(
+                f"{world.penalty[penalty_cell]:g}", font_size=30, color=RED
+            ).move_to(center(penalty_cell))
+            self.play(FadeIn(penalty_label), run_time=0.35)
+
+            walk(wrong_path[-2:])
+            self.play(Flash(agent), run_time=0.26)
+            wrong_icon = (
+                pool.svg("cross.svg")
+                .scale(0.2)
+                .move_to(grid.get_corner(UR) + RIGHT * 0.5)
+            )
+            self.play(FadeIn(wrong_icon), run_time=0.26)
+            self.wait(0.3)
+            self.play(FadeOut(wrong_icon), FadeOut(penalty_label), run_time=0.26)
+            self.wait(0.5)
 
-        self.play(agent.animate.move_to(grid[6].get_center()), run_time=0.26)
+            self.play(agent.animate.move_to(center(self.start)), run_time=0.26)
 
         # Demonstrate correct path to goal
-        correct_path = [grid[6], grid[7], grid[8], grid[5], grid[2]]
-        for cell in correct_path:
-            self.play(agent.animate.move_to(cell.get_center()), run_time=0.26)
+        walk(correct_path)
         self.play(Indicate(goal_flag, scale_factor=1.5), run_time=0.26)
 
-        success_icon = SVGMobject("accept.svg").scale(0.4)
+        success_icon = pool.svg("accept.svg").scale(0.4)
         success_icon.move_to(grid.get_corner(UR) + RIGHT * 0.8 + DOWN * 0.2)
         self.play(FadeIn(success_icon), run_time=0.35)
         self.wait(0.3)
@@ -156,93 +203,123 @@ class MDPPolicyScene(Scene):
 
 class DiscountedRewardsScene(Scene):
     """Illustrates the concept of discounted rewards in RL"""
-    
+
+    gamma = 0.8
+    horizon = 40  # reward steps drawn; any length renders as one bar-chart mobject
+    ticks = 5
+
     def construct(self):
         title = Text(
-            "Discounted Rewards (γ = 0.8)", font_size=48, color=YELLOW
+            f"Discounted Rewards (γ = {self.gamma:g})", font_size=48, color=YELLOW
         ).to_edge(UP)
         self.play(Write(title), run_time=1.2)
 
-        now_box = Square().set_color(BLUE).move_to(LEFT * 4)
-        now_label = Text("Now", font_size=30).next_to(now_box, DOWN)
-
-        self.play(FadeIn(now_box), Write(now_label), run_time=0.9)
-
-        gamma = 0.8
-        base_size = 0.9
-        rewards = VGroup()
-        for i in range(8):
-            scale = base_size * (gamma ** (i + 1))
-            box = (
-                Square()
-                .set_color(GREEN)
-                .scale(scale)
-                .move_to(LEFT * 4 + RIGHT * (i + 1) * 1.2)
-            )
-            label = MathTex(rf"0.8^{(i+1)}", font_size=24).next_to(box, DOWN)
-            rewards.add(VGroup(box, label))
+        # Weight gamma^t of the reward t steps ahead, as a single VMobject
+        weights = self.gamma ** np.arange(self.horizon)
+        chart = BarChartPath(weights, width=10, height=2.5).move_to(UP * 0.4)
+        chart.set_fill(GREEN, opacity=0.8)
+        baseline = Line(chart.get_corner(DOWN + LEFT), chart.get_corner(DOWN + RIGHT), stroke_width=2)
 
-        for reward_group in rewards:
-            self.play(FadeIn(reward_group), run_time=0.35)
+        now_label = Text("Now", font_size=30, color=BLUE).next_to(
+            [chart.bar_center_x(0), chart.get_bottom()[1], 0], DOWN, buff=0.5
+        )
+        self.play(Create(baseline), Write(now_label), run_time=0.9)
+        self.play(GrowFromEdge(chart, DOWN), run_time=1.5)
+
+        steps = np.unique(np.linspace(0, self.horizon - 1, self.ticks).round().astype(int))
+        tick_labels = VGroup(*[
+            MathTex(rf"\gamma^{{{t}}}", font_size=24).next_to(
+                [chart.bar_center_x(t), chart.get_bottom()[1], 0], DOWN, buff=0.1
+            )
+            for t in steps[1:]
+        ])
+        self.play(FadeIn(tick_labels), run_time=0.6)
 
         formula = MathTex(
             r"R(s) = r_1 + \gamma r_2 + \gamma^2 r_3 + \gamma^3 r_4 + \gamma^4 r_5 + \cdots",
             font_size=36,
         ).move_to(DOWN * 2)
         self.play(Write(formula), run_time=1.5)
-        now_box.set_stroke(width=2)
+
+        # Return of a reward of 1 per step over the horizon, from rl_engines.discounted_returns
+        total = discounted_returns(np.ones(self.horizon), self.gamma)[0]
+        value = MathTex(
+            rf"r_t = 1:\quad \sum_{{t=0}}^{{{self.horizon - 1}}} \gamma^t r_t = {total:.3f}",
+            font_size=30,
+            color=GOLD,
+        ).next_to(formula, DOWN, buff=0.4)
+        self.play(Write(value), run_time=1.0)
         self.wait(2.8)
-        self.play(FadeOut(VGroup(title, now_box, now_label, rewards, formula)))
+        self.play(FadeOut(VGroup(title, chart, baseline, now_label, tick_labels, formula, value)))
 
 
 class ValueGuidesScene(Scene):
     """Shows how value functions guide the agent's decisions"""
-    
+
+    # 3x4 gridworld (row 0 on top) solved by value iteration in rl_engines
+    rewards = [
+        [-0.04, -0.04, -0.04, 1.0],
+        [-0.04, -0.04, -0.04, -1.0],
+        [-0.04, -0.04, -0.04, -0.04],
+    ]
+    terminals = [(0, 3), (1, 3)]
+    start = (2, 0)
+
     def construct(self):
         title = Text("Value Leads the Way", font_size=50, color=YELLOW).to_edge(UP)
         self.play(Write(title), run_time=1.2)
 
-        grid = VGroup()
-        values = {
-            0: "-0.04",
-            1: "-0.04",
-            2: "-0.04",
-            3: "+1.0",
-            4: "-0.04",
-            5: "-0.04",
-            6: "-0.04",
-            7: "-1.0",
-            8: "START",
-            9: "-0.04",
-            10: "-0.04",
-            11: "-0.04",
-        }
-
-        positions = []
-        for i in range(3):
-            for j in range(4):
-                idx = (2 - i) * 4 + j
-                pos = RIGHT * j + DOWN * (2 - i)
-                square = Square(side_length=1.2, stroke_width=2).move_to(pos)
-                label_text = values.get(idx, "-0.04")
-                label = Text(label_text, font_size=22).move_to(square.get_center())
-                if label_text == "+1.0":
-                    label.set_color(GOLD)
-                cell = VGroup(square, label)
-                grid.add(cell)
-                positions.append(pos)
-
+        rewards = np.array(self.rewards)
+        terminal = np.zeros(rewards.shape, dtype=bool)
+        terminal[tuple(zip(*self.terminals))] = True
+        solved = value_iteration(rewards, terminal, tol=1e-3, record=True)
+        n_rows, n_cols = rewards.shape
+
+        def value_label(idx, values):
+            r, c = divmod(idx, n_cols)
+            label = pool.text(f"{values[r, c]:+.2f}", font_size=22)
+            if terminal[r, c] and values[r, c] > 0:
+                label.set_color(GOLD)
+            return label
+
+        # 1.2-wide cells one unit apart, all outlines in a single mobject
+        board = CellGrid(n_rows, n_cols, size=1.2, pitch=1.0, stroke_width=2)
+        labels = {}
+        for idx, center in enumerate(board.cell_centers()):
+            if divmod(idx, n_cols) == self.start:
+                label = pool.text("START", font_size=22)
+            else:
+                label = value_label(idx, rewards)
+            labels[idx] = label.move_to(center)
+
+        grid = VGroup(board, *labels.values())
         grid.move_to(ORIGIN)
         self.play(Create(grid), run_time=1.4)
 
-        start_idx = 0
-        agent = Dot(color=RED).scale(1.2).move_to(grid[start_idx][0].get_center())
+        # Bellman sweeps: every cell is backed up at once, sweep by sweep; START keeps its marker
+        start = self.start[0] * n_cols + self.start[1]
+        sweep_label = pool.text("sweep 0", font_size=24, color=BLUE).next_to(grid, RIGHT, buff=0.6)
+        self.play(FadeIn(sweep_label), run_time=0.4)
+        for k, values in enumerate(solved.history[1:], start=1):
+            updates = [
+                Transform(label, value_label(idx, values).move_to(label))
+                for idx, label in labels.items()
+                if not terminal.flat[idx] and idx != start
+            ]
+            self.play(
+                *updates,
+                Transform(sweep_label, pool.text(f"sweep {k}", font_size=24, color=BLUE).move_to(sweep_label)),
+                run_time=0.35,
+            )
+        self.wait(0.6)
+
+        agent = Dot(color=RED).scale(1.2).move_to(board.cell_center(self.start))
 
         self.play(FadeIn(agent), run_time=0.6)
 
-        path_indices = [0, 1, 2, 6, 10, 11]
-        for idx in path_indices:
-            self.play(agent.animate.move_to(grid[idx][0].get_center()), run_time=0.5)
+        # Greedy path with respect to V*
+        for r, c in greedy_path(solved.policy, self.start, terminal)[1:]:
+            self.play(agent.animate.move_to(board.cell_center((r, c))), run_time=0.5)
 
         bellman_eq = MathTex(
             r"V^*(s) = \max_{a \epsilon A} \sum_{s' \epsilon S} T(s, a, s') \left[ R(s, a, s') + \gamma V^*(s') \right]",
@@ -250,56 +327,76 @@ class ValueGuidesScene(Scene):
         ).next_to(grid, DOWN, buff=1)
         self.play(Write(bellman_eq), run_time=1.5)
         self.wait(2)
-        elements = VGroup(title, *grid, agent, bellman_eq)
+        elements = VGroup(title, grid, sweep_label, agent, bellman_eq)
         self.play(FadeOut(elements))
 
 
 class TemporalDifferenceScene(Scene):
     """Explains Temporal-Difference Learning with examples"""
-    
+
+    # random walk over the tiles, learned by rl_engines.td0_random_walk
+    n_states = 4
+    episodes = 2000
+    batch = 50
+    alpha = 0.1
+    gamma = 0.9
+    snapshots = 8  # value tables drawn, however many episodes are run
+
     def construct(self):
         title = Text(
             "Temporal-Difference Learning", font_size=48, color=YELLOW
         ).to_edge(UP)
         self.play(Write(title), run_time=1.2)
 
-        tiles = VGroup()
-        values = [0.5, 0.6, 0.2, 0.0]
-        for i, v in enumerate(values):
-            tile = Square(side_length=1.2, color=BLUE).move_to(RIGHT * (i - 1.5) * 2)
-            label = Text(f"S{i}", font_size=24).next_to(tile, UP, buff=0.1)
-            value = Text(f"V={v}", font_size=24).next_to(tile, DOWN, buff=0.1)
-            tiles.add(VGroup(tile, label, value))
+        run = td0_random_walk(
+            self.n_states, self.episodes, alpha=self.alpha, gamma=self.gamma,
+            batch=self.batch, snapshots=self.snapshots, log=2,
+        )
+
+        board = CellGrid(1, len(run.snapshots[0]), size=1.2, pitch=2.0, color=BLUE)
+        names, value_labels = VGroup(), VGroup()
+        for i, (v, center) in enumerate(zip(run.snapshots[0], board.cell_centers())):
+            names.add(Text(f"S{i}", font_size=24).next_to(center + 0.6 * UP, UP, buff=0.1))
+            value_labels.add(pool.text(f"V={v:.2f}", font_size=24).next_to(center + 0.6 * DOWN, DOWN, buff=0.1))
+        tiles = VGroup(board, names, value_labels)
 
         tiles.move_to(ORIGIN)
         self.play(Create(tiles), run_time=1.3)
 
-        agent = Dot(color=RED).scale(1.2).move_to(tiles[0][0].get_center())
+        agent = Dot(color=RED).scale(1.2).move_to(board.cell_center(run.log[0].state))
         self.play(FadeIn(agent), run_time=0.5)
 
-        reward1 = Text("r = +1", font_size=28, color=GOLD).next_to(
-            tiles[1][0], UP, buff=0.5
-        )
-        update_eq1 = MathTex(
-            r"V(S_0) \leftarrow 0.5 + 0.1 \cdot [1 + 0.9 \cdot 0.6 - 0.5] = 0.59",
-            font_size=28,
-        ).to_edge(DOWN)
-        self.play(agent.animate.move_to(tiles[1][0].get_center()), run_time=0.6)
-        self.play(Write(reward1), Write(update_eq1), run_time=1.0)
-        self.wait(0.4)
-        self.play(FadeOut(reward1), FadeOut(update_eq1), run_time=0.5)
-
-        reward2 = Text("r = 0", font_size=28, color=GOLD).next_to(
-            tiles[2][0], UP, buff=0.5
-        )
-        update_eq2 = MathTex(
-            r"V(S_1) \leftarrow 0.6 + 0.1 \cdot [0 + 0.9 \cdot 0.2 - 0.6] = 0.57",
-            font_size=28,
-        ).to_edge(DOWN)
-        self.play(agent.animate.move_to(tiles[2][0].get_center()), run_time=0.6)
-        self.play(Write(reward2), Write(update_eq2), run_time=1.0)
-        self.wait(0.4)
-        self.play(FadeOut(reward2), FadeOut(update_eq2), run_time=0.5)
+        # The first logged updates, exactly as the engine computed them
+        for update in run.log:
+            s = update.state
+            note = Text(
+                f"mean over {update.walkers} walkers leaving S{s}", font_size=24, color=GOLD
+            ).next_to(tiles, UP, buff=0.5)
+            update_eq = MathTex(
+                rf"V(S_{s}) \leftarrow {update.value:.2f} + {self.alpha:g} \cdot "
+                rf"[{update.reward:.2f} + {self.gamma:g} \cdot {update.next_value:.2f} - {update.value:.2f}]"
+                rf" = {update.updated:.3f}",
+                font_size=28,
+            ).to_edge(DOWN)
+            self.play(agent.animate.move_to(board.cell_center(s)), run_time=0.6)
+            self.play(Write(note), Write(update_eq), run_time=1.0)
+            self.wait(0.4)
+            self.play(FadeOut(note), FadeOut(update_eq), run_time=0.5)
+        self.play(FadeOut(agent), run_time=0.4)
+
+        # Sampled value tables while thousands of episodes run
+        counter = pool.text("episodes: 0", font_size=26, color=GOLD).next_to(tiles, UP, buff=0.5)
+        self.play(FadeIn(counter), run_time=0.4)
+        for done, values in zip(run.snapshot_episodes[1:], run.snapshots[1:]):
+            self.play(
+                *[
+                    Transform(label, pool.text(f"V={v:.2f}", font_size=24).move_to(label))
+                    for label, v in zip(value_labels, values)
+                ],
+                Transform(counter, pool.text(f"episodes: {done}", font_size=26, color=GOLD).move_to(counter)),
+                run_time=0.5,
+            )
+        self.wait(0.6)
 
         summary = Text(
             "TD(0): Update after every step using next state's value",
@@ -308,24 +405,41 @@ class TemporalDifferenceScene(Scene):
         ).next_to(tiles, DOWN, buff=0.8)
         self.play(Write(summary), run_time=1.2)
         self.wait(1.8)
-        self.play(FadeOut(VGroup(title, tiles, agent, summary)), run_time=0.6)
+        self.play(FadeOut(VGroup(title, tiles, counter, summary)), run_time=0.6)
 
 
 class SarsaVsQLearningScene(Scene):
     """Compares Sarsa and Q-Learning algorithms"""
-    
+
+    # cliff-walking experiment from rl_engines.run_cliff_experiment
+    n_seeds = 50
+    episodes = 300
+    smooth = 10  # episodes per point of the learning curves
+
     def construct(self):
         title = Text("Sarsa vs Q-Learning", font_size=48, color=YELLOW).to_edge(UP)
         self.play(Write(title), run_time=1.2)
 
-        sarsa_grid = VGroup()
-        q_grid = VGroup()
-        for i in range(3):
-            s_tile = Square(side_length=1).move_to(LEFT * 4 + RIGHT * i * 1.2)
-            q_tile = Square(side_length=1).move_to(RIGHT * 1 + RIGHT * i * 1.2)
-            sarsa_grid.add(s_tile)
-            q_grid.add(q_tile)
-
+        # One worker: render_all already runs a process per scene.
+        run = cached_run(run_cliff_experiment, self.n_seeds, self.episodes, workers=1)
+        n_rows, n_cols = CLIFF_SHAPE
+        cell = 0.4
+
+        def cliff_grid(center):
+            grid = VGroup()
+            for r in range(n_rows):
+                for c in range(n_cols):
+                    tile = Square(side_length=cell, stroke_width=1)
+                    tile.move_to(center + RIGHT * (c - (n_cols - 1) / 2) * cell + DOWN * (r - (n_rows - 1) / 2) * cell)
+                    if r == n_rows - 1 and 0 < c < n_cols - 1:
+                        tile.set_fill(RED_E, opacity=0.6)
+                    grid.add(tile)
+            grid.add(pool.text("S", font_size=16).move_to(grid[CLIFF_START[0] * n_cols + CLIFF_START[1]]))
+            grid.add(pool.text("G", font_size=16, color=GOLD).move_to(grid[CLIFF_GOAL[0] * n_cols + CLIFF_GOAL[1]]))
+            return grid
+
+        sarsa_grid = cliff_grid(LEFT * 3.6 + UP * 1.4)
+        q_grid = cliff_grid(RIGHT * 3.6 + UP * 1.4)
         self.play(Create(sarsa_grid), Create(q_grid), run_time=0.9)
 
         sarsa_label = Text("Sarsa (On-policy)", font_size=28, color=BLUE).next_to(
@@ -336,55 +450,82 @@ class SarsaVsQLearningScene(Scene):
         )
         self.play(Write(sarsa_label, run_time=0.9), Write(q_label, run_time=0.9))
 
-        agent_s = Dot(color=BLUE).scale(1.2).move_to(sarsa_grid[0].get_center())
-        agent_q = Dot(color=RED).scale(1.2).move_to(q_grid[0].get_center())
-        self.play(FadeIn(agent_s), FadeIn(agent_q), run_time=0.8)
-
-        self.play(agent_s.animate.move_to(sarsa_grid[1].get_center()), run_time=0.6)
         update_s = (
             MathTex(
                 r"Q(s,a) \leftarrow Q(s,a) + \alpha [r + \gamma Q(s',a') - Q(s,a)]",
                 color=BLUE,
             )
-            .scale(0.8)
-            .shift(LEFT * 3 + DOWN * 1.5)
-        )
-
-        a_label = Text("Follows taken action a'", font_size=24, color=BLUE).next_to(
-            sarsa_grid, DOWN, buff=0.5
+            .scale(0.55)
+            .next_to(sarsa_grid, DOWN, buff=0.4)
         )
-
-        self.play(agent_q.animate.move_to(q_grid[1].get_center()), run_time=0.6)
         update_q = (
             MathTex(
                 r"Q(s,a) \leftarrow Q(s,a) + \alpha [r + \gamma \max_{a'} Q(s',a') - Q(s,a)]",
                 color=RED,
             )
-            .scale(0.8)
-            .shift(RIGHT * 3 + DOWN * 1.5)
-        )
-
-        q_label2 = Text("Assumes best future action", font_size=24, color=RED).next_to(
-            q_grid, DOWN, buff=0.5
+            .scale(0.55)
+            .next_to(q_grid, DOWN, buff=0.4)
         )
-
-        eq_group = (
-            VGroup(update_s, update_q).arrange(DOWN, buff=0.3).move_to(DOWN * 2.5)
+        self.play(Write(update_s), Write(update_q), run_time=1.2)
+
+        # Greedy paths learned across all seeds
+        agents, trails = [], []
+        for grid, method, color in ((sarsa_grid, "sarsa", BLUE), (q_grid, "q-learning", RED)):
+            points = [grid[r * n_cols + c].get_center() for r, c in run.paths[method]]
+            agents.append(Dot(color=color).scale(1.2).move_to(points[0]))
+            trails.append(VMobject(color=color, stroke_width=4).set_points_as_corners(points))
+        self.play(*[FadeIn(agent) for agent in agents], run_time=0.8)
+        self.play(
+            *[MoveAlongPath(agent, trail) for agent, trail in zip(agents, trails)],
+            *[Create(trail) for trail in trails],
+            run_time=2.5,
+            rate_func=linear,
         )
 
+        a_label = Text("Follows taken action a': safe path", font_size=24, color=BLUE).move_to(update_s)
+        q_label2 = Text("Assumes best future action: cliff edge", font_size=24, color=RED).move_to(update_q)
         self.play(
-            Write(eq_group, run_time=1.2),
-            Write(a_label, run_time=0.9),
-            Write(q_label2, run_time=0.9),
+            ReplacementTransform(update_s, a_label),
+            ReplacementTransform(update_q, q_label2),
+            run_time=0.9,
         )
+
+        # Learning curves: mean return per episode with a 95% confidence band
+        axes = Axes(
+            x_range=[0, self.episodes, 100],
+            y_range=[-100, 0, 25],
+            x_length=9,
+            y_length=2.4,
+            tips=False,
+            axis_config={"include_numbers": True, "font_size": 18},
+        ).move_to(DOWN * 2.2)
+        axes_label = Text(
+            f"return per episode, mean of {run.seeds} seeds", font_size=20
+        ).next_to(axes, RIGHT, buff=0.2).shift(UP * 0.8).scale(0.8)
+        self.play(Create(axes), FadeIn(axes_label), run_time=1.0)
+
+        kernel = np.ones(self.smooth) / self.smooth
+        episodes = np.arange(self.smooth - 1, self.episodes)
+        curves = VGroup()
+        for method, color in (("sarsa", BLUE), ("q-learning", RED)):
+            mean = np.clip(np.convolve(run.mean[method], kernel, "valid"), -100, 0)
+            ci = np.convolve(run.ci[method], kernel, "valid")
+            upper = [axes.c2p(x, y) for x, y in zip(episodes, np.clip(mean + ci, -100, 0))]
+            lower = [axes.c2p(x, y) for x, y in zip(episodes, np.clip(mean - ci, -100, 0))]
+            band = Polygon(*upper, *reversed(lower), stroke_width=0, fill_color=color, fill_opacity=0.3)
+            line = VMobject(color=color, stroke_width=3).set_points_as_corners(
+                [axes.c2p(x, y) for x, y in zip(episodes, mean)]
+            )
+            curves.add(VGroup(band, line))
+        self.play(*[FadeIn(curve[0]) for curve in curves], *[Create(curve[1]) for curve in curves], run_time=2.0)
         self.wait(1.8)
 
         summary = Text(
             "Sarsa: Learns from experience  |  Q-Learning: Learns from imagined optimal future",
             font_size=28,
             color=WHITE,
-        ).to_edge(DOWN)
-        self.play(Write(summary), run_time=0.9)
+        ).scale_to_fit_width(13).move_to(a_label.get_center()[1] * UP)
+        self.play(FadeOut(VGroup(a_label, q_label2, axes_label)), Write(summary), run_time=0.9)
 
         self.wait(1.4)
         self.play(
@@ -393,14 +534,12 @@ class SarsaVsQLearningScene(Scene):
                     title,
                     sarsa_grid,
                     q_grid,
-                    agent_s,
-                    agent_q,
-                    update_s,
-                    update_q,
-                    a_label,
-                    q_label2,
+                    *agents,
+                    *trails,
                     sarsa_label,
                     q_label,
+                    axes,
+                    curves,
                     summary,
                 )
             ),
@@ -410,7 +549,13 @@ class SarsaVsQLearningScene(Scene):
 
 class DeepQScene(Scene):
     """Illustrates Deep Q-Learning with neural networks"""
-    
+
+    # replay buffer drawn at the bottom (rl_engines.PrioritizedReplayBuffer)
+    buffer_slots = 8
+    inserts = 10
+    batch_size = 4
+    train_steps = 6000  # corridor DQN from rl_engines.train_dqn
+
     def construct(self):
         title = Text("Deep Q-Learning", font_size=50, color=YELLOW).to_edge(UP)
         self.play(Write(title), run_time=1.2)
@@ -446,15 +591,104 @@ class DeepQScene(Scene):
         ).next_to(q_vals, DOWN, buff=0.8)
         self.play(Write(loss_eq), run_time=1.4)
 
-        memory = Rectangle(width=2, height=1, color=GREEN).to_corner(DOWN + LEFT)
+        # Train the network (rl_engines.train_dqn) and replay its readings on the start state
+        run = cached_run(train_dqn, self.train_steps)
+        peaks = [
+            max(np.abs(snap.activations[i]).mean() for snap in run.snapshots) or 1.0
+            for i in range(len(layers))
+        ]
+
+        def q_labels(q_values):
+            return (
+                VGroup(*[
+                    pool.text(f"Q({name}) = {value:+.2f}", font_size=24)
+                    for name, value in zip(CorridorEnv.ACTIONS, q_values)
+                ])
+                .arrange(DOWN, buff=0.2, aligned_edge=LEFT)
+                .next_to(layers[-1], RIGHT, buff=0.6)
+            )
+
+        counter = pool.text("training step 0", font_size=22, color=GOLD).next_to(net, UP, buff=0.5)
+        self.play(FadeIn(counter), run_time=0.4)
+        for snap in run.snapshots:
+            self.play(
+                Transform(q_vals, q_labels(snap.q_values)),
+                *[
+                    layer.animate.set_fill(BLUE, opacity=0.9 * np.abs(act).mean() / peak)
+                    for layer, act, peak in zip(layers, snap.activations, peaks)
+                ],
+                Transform(
+                    counter,
+                    pool.text(f"training step {snap.step}", font_size=22, color=GOLD).move_to(counter),
+                ),
+                run_time=0.4,
+            )
+        self.wait(0.6)
+
+        # Prioritized replay: a real ring buffer + sum tree, drawn slot by slot
+        corridor = CorridorEnv(1, seed=1)
+        buffer = PrioritizedReplayBuffer(self.buffer_slots, state_shape=(corridor.length,))
+        rng = np.random.default_rng(0)
+        memory = VGroup(
+            *[Square(side_length=0.35, color=GREEN, stroke_width=2) for _ in range(self.buffer_slots)]
+        ).arrange(RIGHT, buff=0).to_corner(DOWN + LEFT).shift(UP * 0.5)
         mem_label = Text("Replay Buffer", font_size=24).next_to(memory, UP, buff=0.1)
-        batch = Rectangle(width=1, height=0.4, color=GOLD).next_to(
-            memory, RIGHT, buff=0.5
-        )
+        batch = VGroup(
+            *[Square(side_length=0.35, color=GOLD, stroke_width=2) for _ in range(self.batch_size)]
+        ).arrange(RIGHT, buff=0).next_to(memory, RIGHT, buff=0.5)
         batch_label = Text("Sample Batch", font_size=20).next_to(batch, UP, buff=0.1)
 
+        def show_priorities():
+            weights = buffer.priorities() / buffer.priorities().max()
+            return [
+                memory[slot].animate.set_fill(GREEN, opacity=0.15 + 0.75 * w)
+                for slot, w in enumerate(weights)
+            ]
+
         self.play(Create(memory), Write(mem_label), run_time=0.9)
+
+        # Transitions stream in; the ring wraps and overwrites the oldest slots
+        drops, slots = VGroup(), []
+        for _ in range(self.inserts):
+            state, action = corridor.observe()[0], rng.integers(3, size=1)
+            next_state, reward, done = corridor.step(action)
+            slots.append(buffer.add(state, action[0], reward[0], next_state[0], done[0]))
+            drops.add(Dot(radius=0.06, color=GREEN).move_to(frame.get_center()))
+        self.play(
+            LaggedStart(
+                *[drop.animate.move_to(memory[slot]) for drop, slot in zip(drops, slots)],
+                lag_ratio=0.25,
+            ),
+            run_time=1.6,
+        )
+        self.play(FadeOut(drops), *show_priorities(), run_time=0.5)
+
+        # The trained network's TD errors re-weight the sum tree
+        stored = np.arange(len(buffer))
+        delta, _, _ = dqn_td_errors(
+            run.net, run.target,
+            (buffer.states[stored], buffer.actions[stored], buffer.rewards[stored],
+             buffer.next_states[stored], buffer.dones[stored]),
+            run.gamma,
+        )
+        buffer.update_priorities(stored, delta)
+        prio_eq = MathTex(r"P(i) = \frac{p_i^\alpha}{\sum_k p_k^\alpha}", font_size=26).next_to(
+            mem_label, UP, buff=0.2
+        )
+        self.play(*show_priorities(), Write(prio_eq), run_time=0.8)
+
+        # Priority-weighted draw of a batch
+        drawn, _, _ = buffer.sample(self.batch_size, rng=rng)
+        picks = VGroup(*[memory[slot].copy() for slot in drawn])
         self.play(FadeIn(batch), Write(batch_label), run_time=0.9)
+        self.play(
+            *[Indicate(memory[slot], color=GOLD) for slot in set(drawn.tolist())],
+            run_time=0.6,
+        )
+        self.play(
+            *[pick.animate.move_to(cell) for pick, cell in zip(picks, batch)],
+            run_time=0.8,
+        )
 
         summary = Text(
             "Scaling RL with pixels & neural nets", font_size=28, color=BLUE
@@ -470,10 +704,13 @@ class DeepQScene(Scene):
                     frame_label,
                     layers,
                     q_vals,
+                    counter,
                     loss_eq,
                     memory,
                     mem_label,
+                    prio_eq,
                     batch,
+                    picks,
                     batch_label,
                     summary,
                 )
@@ -484,44 +721,75 @@ class DeepQScene(Scene):
 
 class PolicyGradientScene(Scene):
     """Explains Policy Gradient Methods in RL"""
-    
+
+    # REINFORCE on the corridor task (rl_engines.reinforce)
+    updates = 150
+    batch = 32
+    alpha = 1.0
+    frames = 8  # policy snapshots drawn
+
     def construct(self):
         title = Text("Policy Gradient Methods", font_size=50, color=YELLOW).to_edge(UP)
         self.play(Write(title), run_time=1.2)
 
+        run = cached_run(reinforce, self.updates, self.batch, alpha=self.alpha)
+        names = [name.lower() for name in CorridorEnv.ACTIONS]
+
         state = Square(color=BLUE).scale(1).shift(LEFT * 4)
         state_label = Text("State s", font_size=24).next_to(state, DOWN)
         self.play(FadeIn(state), Write(state_label), run_time=0.9)
 
-        action_probs = (
-            VGroup(
-                Text("π(left|s)", font_size=24),
-                Text("π(right|s)", font_size=24),
-                Text("π(jump|s)", font_size=24),
+        def prob_labels(probs):
+            return (
+                VGroup(*[pool.text(f"π({name}|s) = {p:.2f}", font_size=24) for name, p in zip(names, probs)])
+                .arrange(DOWN, buff=0.4, aligned_edge=LEFT)
+                .shift(RIGHT * 3)
             )
-            .arrange(DOWN, buff=0.4)
-            .shift(RIGHT * 3)
-        )
 
-        for i, action in enumerate(action_probs):
-            arrow = Arrow(state.get_right(), action.get_left(), buff=0.1)
+        def policy_arrows(labels, probs):
+            return VGroup(*[
+                Arrow(state.get_right(), label.get_left(), buff=0.1,
+                      stroke_width=1 + 14 * p, max_stroke_width_to_length_ratio=20)
+                for label, p in zip(labels, probs)
+            ])
+
+        action_probs = prob_labels(run.probs[0])
+        arrows = policy_arrows(action_probs, run.probs[0])
+        for arrow, action in zip(arrows, action_probs):
             self.play(GrowArrow(arrow), Write(action), run_time=0.6)
 
-        reinforce = MathTex(
+        reinforce_eq = MathTex(
             r"\theta \leftarrow \theta + \alpha G_t \nabla \log \pi(a|s, \theta)",
             font_size=32,
         ).to_edge(DOWN)
-        self.play(Write(reinforce), run_time=1.4)
+        self.play(Write(reinforce_eq), run_time=1.4)
+
+        # Batches of episodes update the policy; arrow width follows pi(a|s)
+        counter = pool.text("episodes: 0", font_size=22, color=GOLD).next_to(state, UP, buff=0.4)
+        self.play(FadeIn(counter), run_time=0.4)
+        picks = np.unique(np.linspace(0, self.updates, self.frames + 1).round().astype(int))[1:]
+        for k in picks:
+            labels = prob_labels(run.probs[k])
+            self.play(
+                Transform(action_probs, labels),
+                Transform(arrows, policy_arrows(labels, run.probs[k])),
+                Transform(
+                    counter,
+                    pool.text(f"episodes: {k * self.batch}", font_size=22, color=GOLD).move_to(counter),
+                ),
+                run_time=0.5,
+            )
+        self.wait(0.6)
 
         summary = Text(
             "REINFORCE: Learn policy directly from returns", font_size=28, color=BLUE
-        ).next_to(reinforce, UP, buff=0.4)
+        ).next_to(reinforce_eq, UP, buff=0.4)
         self.play(Write(summary), run_time=1.2)
 
         self.wait(1.4)
         self.play(
             FadeOut(
-                VGroup(title, state, state_label, action_probs, reinforce, summary)
+                VGroup(title, state, state_label, arrows, action_probs, counter, reinforce_eq, summary)
             ),
             run_time=1.1,
         )
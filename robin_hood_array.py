@@ -1,12 +1,200 @@
+import json
+from collections import deque
+from pathlib import Path
+
 from manim import *
 
-class RobinHoodInsertion(Scene):
+from compact_mobjects import BarChartPath, CellGrid, IndexLabels
+from hash_bench import run_benchmarks
+from hash_tables import EMPTY, RobinHoodTable, home_slots, probe_length_timeline
+from mobject_pool import pool
+from render_cache import cached_run
+from section_cache import SectionCachedScene
+
+INSTANT = 1e-3  # run time of a state change inside a batched chain
+
+
+class ChainTimeline:
+    """Plays one displacement cascade step by step, or compiles it into one Succession.
+
+    Batched sub-animations only begin when their turn comes, so every step is
+    built from ApplyMethod (not ``.animate``, which captures its target up
+    front), and keys that leave a slot are hidden with set_opacity instead of
+    FadeOut, which would only remove them once the whole Succession ends.
+    """
+
+    def __init__(self, scene, batched):
+        self.scene = scene
+        self.batched = batched
+        self.steps = []
+
+    def play(self, *animations, run_time):
+        if self.batched:
+            self.steps.append(AnimationGroup(*animations, run_time=run_time))
+        else:
+            self.scene.play(*animations, run_time=run_time)
+
+    def wait(self, duration):
+        if self.batched:
+            self.steps.append(Wait(run_time=duration))
+        else:
+            self.scene.wait(duration)
+
+    def set(self, method, *args):
+        """Apply ``method(*args)`` when the chain reaches this point."""
+        if self.batched:
+            self.steps.append(ApplyMethod(method, *args, run_time=INSTANT))
+        else:
+            method(*args)
+
+    def hide(self, mob, run_time):
+        if self.batched:
+            self.play(ApplyMethod(mob.set_opacity, 0), run_time=run_time)
+        else:
+            self.play(FadeOut(mob), run_time=run_time)
+
+    def reveal(self, mob):
+        """Undo :meth:`hide`; the unbatched FadeOut already restored the key."""
+        if self.batched:
+            self.set(mob.set_opacity, 1)
+
+    def flush(self, *on_stage):
+        """Play the collected steps; ``on_stage`` are the mobjects already in the scene."""
+        if self.steps:
+            self.scene.play(Succession(*self.steps, group=Group(*on_stage)))
+        self.steps = []
+
+
+class TableWindow(VGroup):
+    """Scrolling view of a RobinHoodTable that only builds mobjects for ``n_slots`` slots.
+
+    Slot ``i`` is drawn at x = ``i * pitch``; past the end of the table the
+    view keeps going (slot ``capacity + 3`` shows slot 3), so a cascade that
+    wraps around still moves right. An updater centres the window on the
+    camera ``frame`` every frame. When the frame has moved by a whole slot,
+    the outlines shift along, the index labels are rebuilt and the occupant
+    mobjects of slots that scrolled out are handed to the slots that
+    scrolled in. Each occupant shows its key's probe distance, from green
+    (at home) to red (``hot`` or further).
+    """
+
+    def __init__(self, table, frame, n_slots, pitch=0.8, y=0.0, hot=16, **kwargs):
+        self.table, self.frame = table, frame
+        self.n_slots, self.pitch, self.y, self.hot = n_slots, pitch, y, hot
+        self.overrides = {}  # slot -> distance shown instead of the table's (None: empty)
+        self.outlines = CellGrid(1, n_slots, size=pitch, color=WHITE, stroke_width=2)
+        self.indices = IndexLabels([], [], font_size=16)
+        self.occupants = VGroup()
+        super().__init__(self.outlines, self.indices, self.occupants, **kwargs)
+        self.first = None
+        self.created = 0  # occupant mobjects ever built; at most n_slots
+        self._shown = {}  # unwrapped slot -> occupant
+        self._free = []
+        self._glyphs = {}  # distance -> template label
+        self.follow()
+        self.add_updater(lambda window: window.follow())
+
+    def slot_center(self, slot):
+        return np.array([slot * self.pitch, self.y, 0.0])
+
+    def dist(self, slot):
+        """Probe distance shown in ``slot`` (wrapped), or None when it is empty."""
+        if slot in self.overrides:
+            return self.overrides[slot]
+        return None if self.table.keys[slot] == EMPTY else int(self.table.dists[slot])
+
+    def follow(self):
+        first = int(round(self.frame.get_x() / self.pitch)) - self.n_slots // 2
+        if first != self.first:
+            self.scroll_to(first)
+
+    def scroll_to(self, first):
+        last = first + self.n_slots
+        self.outlines.move_to(self.slot_center(first + (self.n_slots - 1) / 2))
+        centers = self.outlines.cell_centers()
+        self.indices.set_points(IndexLabels(
+            [slot % self.table.capacity for slot in range(first, last)],
+            centers + (self.pitch / 2 + 0.1) * DOWN, font_size=16, edge=UP,
+        ).points)
+        for slot in [slot for slot in self._shown if not first <= slot < last]:
+            self._release(slot)
+        self.first = first
+        for slot in range(first, last):
+            if slot not in self._shown:
+                self._show(slot)
+
+    def refresh(self, slot):
+        """Redraw every visible copy of ``slot`` (wrapped) after its distance changed."""
+        for shown in range(self.first, self.first + self.n_slots):
+            if shown % self.table.capacity == slot:
+                if shown in self._shown:
+                    self._release(shown)
+                self._show(shown)
+
+    def _show(self, slot):
+        dist = self.dist(slot % self.table.capacity)
+        if dist is None:
+            return
+        if self._free:
+            occupant = self._free.pop()
+        else:
+            occupant = VMobject()
+            self.created += 1
+        occupant.become(self.glyph(dist)).move_to(self.slot_center(slot))
+        self._shown[slot] = occupant
+        self.occupants.add(occupant)
+
+    def _release(self, slot):
+        occupant = self._shown.pop(slot)
+        self.occupants.remove(occupant)
+        self._free.append(occupant)
+
+    def glyph(self, dist):
+        """Template label for a key ``dist`` slots from home; copy it before use."""
+        if dist not in self._glyphs:
+            color = interpolate_color(GREEN, RED, min(dist, self.hot) / self.hot)
+            self._glyphs[dist] = pool.text(str(dist), font_size=22, color=color)
+        return self._glyphs[dist]
+
+
+def pin_to_frame(mob, frame):
+    """Keep ``mob`` at its current place and size on screen while ``frame`` pans and zooms."""
+    width, offset = frame.width, mob.get_center() - frame.get_center()
+    mob.zoom = 1.0
+
+    def update(m):
+        zoom = frame.width / width
+        m.scale(zoom / m.zoom)
+        m.zoom = zoom
+        m.move_to(frame.get_center() + offset * zoom)
+
+    mob.add_updater(update)
+    return mob
+
+
+class RobinHoodInsertion(SectionCachedScene):
+    """Robin Hood insertion, animated from the events of a real RobinHoodTable."""
+
+    # play each insert's displacement cascade as a single Succession
+    batch_chains = True
+
+    # (name, home slot, color) in insertion order
+    keys = [
+        ("A", 5, PINK),
+        ("B", 5, BLUE_E),
+        ("C", 5, GREEN),
+        ("D", 8, ORANGE),
+        ("E", 7, PURPLE_D),
+        ("F", 6, GOLD),
+        ("G", 5, TEAL),
+    ]
 
     def construct(self):
         #  0) TITLE SLIDE 
-        title1 = Text("Robin Hood Addressing", font_size=48, color=WHITE)
-        title2 = Text("Insertion & Deletion Process", font_size=36, color=WHITE).next_to(title1, DOWN, buff=0.5)
-        title3 = Text("Presented by Sagnik Das", font_size=28, color=YELLOW).next_to(title2, DOWN, buff=0.5)
+        self.section("title")
+        title1 = pool.text("Robin Hood Addressing", font_size=48, color=WHITE)
+        title2 = pool.text("Insertion & Deletion Process", font_size=36, color=WHITE).next_to(title1, DOWN, buff=0.5)
+        title3 = pool.text("Presented by Sagnik Das", font_size=28, color=YELLOW).next_to(title2, DOWN, buff=0.5)
         titles = VGroup(title1, title2, title3)
         titles.move_to(UP * 1.0)
         self.play(FadeIn(titles), run_time=1.0)
@@ -15,8 +203,9 @@ class RobinHoodInsertion(Scene):
         self.wait(0.3)
 
         #  1) SMALL HEADER ─
-        header_title = Text("Robin Hood Addressing", font_size=36, color=BLUE)
-        header_text = Text(
+        self.section("header")
+        header_title = pool.text("Robin Hood Addressing", font_size=36, color=BLUE)
+        header_text = pool.text(
             "When we insert an element, if the element we’re inserting is\n"
             "further from home than the current element, we displace that\n"
             "element to make room for the new one.",
@@ -31,38 +220,32 @@ class RobinHoodInsertion(Scene):
         self.wait(1.0)
 
         #  2) ARRAY SLOTS (indices 4..13) 
+        self.section("array")
         n_slots = 10  # showing indices 4 through 13
+        first_slot = 4
         slot_width = 0.8
         array_y = -1.5  # move array just below center
         total_width = n_slots * slot_width
-        leftmost = -total_width / 2 + slot_width / 2
-
-        slot_centers = []
-        slot_rects = VGroup()
-        slot_labels = VGroup()
-        for i in range(n_slots):
-            idx = 4 + i
-            center = [leftmost + i * slot_width, array_y, 0]
-            slot_centers.append(center)
 
-            rect = Rectangle(width=slot_width, height=slot_width, color=WHITE, stroke_width=2)
-            rect.move_to(center)
-            slot_rects.add(rect)
-
-            lbl = Text(str(idx), font_size=18, color=WHITE)
-            lbl.next_to(center, DOWN, buff=0.2)
-            slot_labels.add(lbl)
+        # every slot outline is a subpath of one mobject; index labels likewise
+        slot_rects = CellGrid(1, n_slots, size=slot_width, color=WHITE, stroke_width=2)
+        slot_rects.move_to([0, array_y, 0])
+        slot_centers = slot_rects.cell_centers()
+        slot_labels = IndexLabels(
+            range(first_slot, first_slot + n_slots), slot_centers + 0.2 * DOWN,
+            font_size=18, color=WHITE, edge=UP,
+        )
 
         self.play(Create(slot_rects), Write(slot_labels), run_time=1.0)
         self.wait(0.8)
 
         #  3) PENDING KEYS DISPLAYED JUST ABOVE ARRAY ─
-        pending_texts = ["A(5)", "B(5)", "C(5)", "D(8)", "E(7)", "F(6)", "G(5)"]
+        self.section("pending keys")
         pending_keys = []  # list of Text mobjects
         start_x = -total_width / 4
-        for j, text in enumerate(pending_texts):
+        for j, (name, home, _) in enumerate(self.keys):
             pos = [start_x + j * slot_width * 1.2, array_y + 1.2, 0]
-            key_mob = Text(text, font_size=22, color=WHITE).move_to(pos)
+            key_mob = pool.text(f"{name}({home})", font_size=22, color=WHITE).move_to(pos)
             pending_keys.append(key_mob)
             self.add(key_mob)
 
@@ -72,9 +255,9 @@ class RobinHoodInsertion(Scene):
         occupied = {}
 
         # Helper to show notification (1.5 seconds) at bottom
-        def show_notification(msg):
+        def show_notification(chain, msg):
             wrapped = msg.replace(". ", ".\n")
-            note = Text(
+            note = pool.text(
                 wrapped,
                 font_size=18,
                 color=YELLOW,
@@ -83,148 +266,83 @@ class RobinHoodInsertion(Scene):
             note.to_edge(DOWN).shift(UP * 0.5)
             box = SurroundingRectangle(note, color=YELLOW, buff=0.15)
             grp = VGroup(box, note)
-            self.play(FadeIn(grp), run_time=0.3)
-            self.wait(2)
-            self.play(FadeOut(grp), run_time=0.3)
-
-        #  STEP 1: Insert A(5) into index 5 
-        a_key = pending_keys.pop(0)  # "A(5)"
-        self.play(a_key.animate.scale(1.1), run_time=0.2)
-        target = slot_centers[5 - 4]  # index 5 → slot 1
-        self.play(a_key.animate.move_to([target[0], target[1] + 0.6, 0]), run_time=0.4)
-        a_permanent = Text("A(5)", font_size=22, color=PINK).move_to(target)
-        self.play(FadeOut(a_key), Create(a_permanent), run_time=0.4)
-        occupied[5] = a_permanent
-        self.wait(1)
-
-        #  STEP 2: Insert B(5) → hover 5 then place at 6 ─
-        b_key = pending_keys.pop(0)
-        self.play(b_key.animate.scale(1.1), run_time=0.2)
-        hover5 = slot_centers[5 - 4]
-        self.play(b_key.animate.move_to([hover5[0], hover5[1] + 0.6, 0]), run_time=0.4)
-        target6 = slot_centers[6 - 4]
-        self.play(b_key.animate.move_to([target6[0], target6[1] + 0.6, 0]), run_time=0.4)
-        b_permanent = Text("B(5)", font_size=22, color=BLUE_E).move_to(target6)
-        self.play(FadeOut(b_key), Create(b_permanent), run_time=0.4)
-        occupied[6] = b_permanent
-        self.wait(1)
-
-        #  STEP 3: Insert C(5) → hover5→hover6→place7 ─
-        c_key = pending_keys.pop(0)
-        self.play(c_key.animate.scale(1.1), run_time=0.2)
-        hover5 = slot_centers[5 - 4]
-        self.play(c_key.animate.move_to([hover5[0], hover5[1] + 0.6, 0]), run_time=0.3)
-        hover6 = slot_centers[6 - 4]
-        self.play(c_key.animate.move_to([hover6[0], hover6[1] + 0.6, 0]), run_time=0.3)
-        target7 = slot_centers[7 - 4]
-        self.play(c_key.animate.move_to([target7[0], target7[1] + 0.6, 0]), run_time=0.3)
-        c_permanent = Text("C(5)", font_size=22, color=GREEN).move_to(target7)
-        self.play(FadeOut(c_key), Create(c_permanent), run_time=0.3)
-        occupied[7] = c_permanent
-        self.wait(1)
-
-        #  STEP 4: Insert D(8) directly at index 8 
-        d_key = pending_keys.pop(0)
-        self.play(d_key.animate.scale(1.1), run_time=0.2)
-        target8 = slot_centers[8 - 4]
-        self.play(d_key.animate.move_to([target8[0], target8[1] + 0.6, 0]), run_time=0.4)
-        d_permanent = Text("D(8)", font_size=22, color=ORANGE).move_to(target8)
-        self.play(FadeOut(d_key), Create(d_permanent), run_time=0.4)
-        occupied[8] = d_permanent
-        self.wait(1)
-
-        #  STEP 5: Insert E(7) → hover7→hover8→steal D→place E@8, D@9 
-        e_key = pending_keys.pop(0)
-        self.play(e_key.animate.scale(1.1), run_time=0.2)
-        hover7 = slot_centers[7 - 4]
-        self.play(e_key.animate.move_to([hover7[0], hover7[1] + 0.6, 0]), run_time=0.3)
-        hover8 = slot_centers[8 - 4]
-        self.play(e_key.animate.move_to([hover8[0], hover8[1] + 0.6, 0]), run_time=0.3)
-        show_notification("E is further from home than D.\nIt's not fair D gets this slot.")
-        self.play(FadeOut(occupied[8]), run_time=0.3)
-        e_permanent = Text("E(7)", font_size=22, color=PURPLE_D).move_to(target8)
-        self.play(Create(e_permanent), FadeOut(e_key), run_time=0.3)
-        occupied[8] = e_permanent
-        target9 = slot_centers[9 - 4]
-        self.play(d_permanent.animate.move_to(target9), run_time=0.4)
-        occupied[9] = d_permanent
-        self.wait(1)
-
-        #  STEP 6: Insert F(6) → hover6→7→8→steal E→place F@8, E@9→steal D→place E@9, D@10 ─
-        f_key = pending_keys.pop(0)
-        self.play(f_key.animate.scale(1.1), run_time=0.2)
-        hover6 = slot_centers[6 - 4]
-        self.play(f_key.animate.move_to([hover6[0], hover6[1] + 0.6, 0]), run_time=0.3)
-        hover7 = slot_centers[7 - 4]
-        self.play(f_key.animate.move_to([hover7[0], hover7[1] + 0.6, 0]), run_time=0.3)
-        hover8 = slot_centers[8 - 4]
-        self.play(f_key.animate.move_to([hover8[0], hover8[1] + 0.6, 0]), run_time=0.3)
-        show_notification("F is further from home than E.\nIt's not fair that E gets this slot.")
-        self.play(FadeOut(occupied[8]), run_time=0.3)
-        f_permanent = Text("F(6)", font_size=22, color=GOLD).move_to(target8)
-        self.play(Create(f_permanent), FadeOut(f_key), run_time=0.3)
-        occupied[8] = f_permanent
-        target9 = slot_centers[9 - 4]
-        self.play(e_permanent.animate.move_to([target9[0], target9[1] + 0.6, 0]), run_time=0.4)
-        show_notification("E is further from home than D.\nIt's not fair that D gets this slot.")
-        self.play(FadeOut(occupied[9]), run_time=0.3)
-        e_permanent.move_to(target9)
-        self.play(Create(e_permanent), run_time=0.3)
-        occupied[9] = e_permanent
-        target10 = slot_centers[10 - 4]
-        self.play(d_permanent.animate.move_to(target10), run_time=0.4)
-        occupied[10] = d_permanent
-        self.wait(1)
-
-        #  STEP 7: Insert G(5) → hover5→6→7→8→steal F→place G@8, F@9→steal E→place F@9, E@10→steal D→place E@10, D@11 ─
-        g_key = pending_keys.pop(0)
-        self.play(g_key.animate.scale(1.1), run_time=0.2)
-        hover5 = slot_centers[5 - 4]
-        self.play(g_key.animate.move_to([hover5[0], hover5[1] + 0.6, 0]), run_time=0.2)
-        hover6 = slot_centers[6 - 4]
-        self.play(g_key.animate.move_to([hover6[0], hover6[1] + 0.6, 0]), run_time=0.2)
-        hover7 = slot_centers[7 - 4]
-        self.play(g_key.animate.move_to([hover7[0], hover7[1] + 0.6, 0]), run_time=0.2)
-        hover8 = slot_centers[8 - 4]
-        self.play(g_key.animate.move_to([hover8[0], hover8[1] + 0.6, 0]), run_time=0.2)
-        show_notification("G is further from home than F.\nIt's not fair that F gets this slot.")
-        self.play(FadeOut(occupied[8]), run_time=0.3)
-        g_permanent = Text("G(5)", font_size=22, color=TEAL).move_to(target8)
-        self.play(Create(g_permanent), FadeOut(g_key), run_time=0.3)
-        occupied[8] = g_permanent
-        target9 = slot_centers[9 - 4]
-        self.play(f_permanent.animate.move_to([target9[0], target9[1] + 0.6, 0]), run_time=0.4)
-        show_notification("F is further from home than E.\nIt's not fair that E gets this slot.")
-        self.play(FadeOut(occupied[9]), run_time=0.3)
-        f_permanent.move_to(target9)
-        self.play(Create(f_permanent), run_time=0.3)
-        occupied[9] = f_permanent
-        target10 = slot_centers[10 - 4]
-        self.play(e_permanent.animate.move_to([target10[0], target10[1] + 0.6, 0]), run_time=0.4)
-        show_notification("E is further from home than D.\nIt's not fair that D gets this slot.")
-        self.play(FadeOut(occupied[10]), run_time=0.3)
-        e_permanent.move_to(target10)
-        self.play(Create(e_permanent), run_time=0.3)
-        occupied[10] = e_permanent
-        target11 = slot_centers[11 - 4]
-        self.play(d_permanent.animate.move_to(target11), run_time=0.4)
-        occupied[11] = d_permanent
-        self.wait(1)
+            chain.play(FadeIn(grp), run_time=0.3)
+            chain.wait(2)
+            chain.play(FadeOut(grp), run_time=0.3)
+
+        def slot_center(slot):
+            return slot_centers[slot - first_slot]
+
+        def above(slot):
+            c = slot_center(slot)
+            return [c[0], c[1] + 0.6, 0]
+
+        def permanent(key):
+            name, home, color = self.keys[key]
+            return pool.text(f"{name}({home})", font_size=22, color=color)
+
+        #  STEPS: replay the engine's probe / swap / place events for each key
+        table = RobinHoodTable(first_slot + n_slots)
+        for key, (name, home, _) in enumerate(self.keys):
+            self.section(f"insert {name}", key, name, home)
+            carried = pending_keys.pop(0)  # white key still waiting to be placed
+            is_pending = True
+            on_stage = [carried, *occupied.values()]
+            chain = ChainTimeline(self, self.batch_chains)
+            chain.play(ApplyMethod(carried.scale, 1.1), run_time=0.2)
+            for event in table.insert(key, home=home):
+                if event.kind == "probe":
+                    # hover above the slot and compare distances from home
+                    chain.play(ApplyMethod(carried.move_to, above(event.slot)), run_time=0.3)
+                elif event.kind == "swap":
+                    mover, victim = self.keys[event.key][0], self.keys[event.evicted][0]
+                    show_notification(
+                        chain,
+                        f"{mover} is further from home than {victim}.\n"
+                        f"It's not fair that {victim} gets this slot.",
+                    )
+                    evicted_mob = occupied[event.slot]
+                    chain.hide(evicted_mob, run_time=0.3)
+                    if is_pending:
+                        placed = permanent(key).move_to(slot_center(event.slot))
+                        chain.play(Create(placed), FadeOut(carried), run_time=0.3)
+                    else:
+                        placed = carried
+                        chain.set(placed.move_to, slot_center(event.slot))
+                        chain.play(Create(placed), run_time=0.3)
+                    occupied[event.slot] = placed
+                    carried, is_pending = evicted_mob, False
+                    chain.reveal(carried)
+                elif is_pending:  # place a new key in an empty slot
+                    chain.play(ApplyMethod(carried.move_to, above(event.slot)), run_time=0.4)
+                    placed = permanent(key).move_to(slot_center(event.slot))
+                    chain.play(FadeOut(carried), Create(placed), run_time=0.4)
+                    occupied[event.slot] = placed
+                else:  # the displaced key slides into the next empty slot
+                    chain.play(ApplyMethod(carried.move_to, slot_center(event.slot)), run_time=0.4)
+                    occupied[event.slot] = carried
+            chain.wait(1)
+            chain.flush(*on_stage)
 
         #  FINAL END 
+        self.section("end")
         self.wait(2.0)
 
-class RobinHoodDeletion(Scene):
+class RobinHoodDeletion(SectionCachedScene):
     """
     Manual, step‐by‐step Robin Hood hashing deletion (indices 4..13).
     We begin with the array fully populated (as after insertion), then delete F(6)
     at index 9 and “pull back” E, D, H in turn until we reach H’s home slot.
     """
 
+    # play each delete / pull-back step as a single Succession
+    batch_chains = True
+
     def construct(self):
         #  1) HEADER (same style as insertion) 
-        header_title = Text("Robin Hood Addressing", font_size=36, color=BLUE)
-        header_text = Text(
+        self.section("header")
+        header_title = pool.text("Robin Hood Addressing", font_size=36, color=BLUE)
+        header_text = pool.text(
             "When we delete an element, we must fill its slot by\n"
             "pulling each subsequent key closer to its home until\n"
             "we reach one that is already home.",
@@ -239,32 +357,23 @@ class RobinHoodDeletion(Scene):
         self.wait(1.0)
 
         #  2) DRAW ARRAY SLOTS (indices 4..13) ─
+        self.section("array")
         n_slots = 10           # showing slots 4..13
         slot_width = 0.8
         array_y = -1.5         # push array down slightly
-        total_width = n_slots * slot_width
-        leftmost = -total_width / 2 + slot_width / 2
-
-        slot_centers = []
-        slot_rects = VGroup()
-        slot_indices = VGroup()
-        for i in range(n_slots):
-            idx = 4 + i
-            center = np.array([leftmost + i * slot_width, array_y, 0])
-            slot_centers.append(center)
-
-            rect = Rectangle(width=slot_width, height=slot_width, color=WHITE, stroke_width=2)
-            rect.move_to(center)
-            slot_rects.add(rect)
 
-            lbl = Text(str(idx), font_size=18, color=WHITE)
-            lbl.next_to(center, DOWN, buff=0.2)
-            slot_indices.add(lbl)
+        slot_rects = CellGrid(1, n_slots, size=slot_width, color=WHITE, stroke_width=2)
+        slot_rects.move_to([0, array_y, 0])
+        slot_centers = slot_rects.cell_centers()
+        slot_indices = IndexLabels(
+            range(4, 4 + n_slots), slot_centers + 0.2 * DOWN, font_size=18, color=WHITE, edge=UP,
+        )
 
         self.play(Create(slot_rects), Write(slot_indices), run_time=1.0)
         self.wait(1.0)
 
         #  3) PLACE “PERMANENT” KEYS AT THEIR SLOTS 
+        self.section("keys")
         #  Initial state (after insertion):
         #    index 5 → A(5) (PINK)
         #    index 6 → B(5) (BLUE_E)
@@ -276,15 +385,15 @@ class RobinHoodDeletion(Scene):
         #    index 12 → H(12) (WHITE)
         #    index 13 → I(13) (WHITE)
 
-        a_mob = Text("A(5)", font_size=22, color=PINK).move_to(slot_centers[5 - 4])
-        b_mob = Text("B(5)", font_size=22, color=BLUE_E).move_to(slot_centers[6 - 4])
-        c_mob = Text("C(5)", font_size=22, color=GREEN).move_to(slot_centers[7 - 4])
-        g_mob = Text("G(5)", font_size=22, color=TEAL).move_to(slot_centers[8 - 4])
-        f_mob = Text("F(6)", font_size=22, color=GOLD).move_to(slot_centers[9 - 4])
-        e_mob = Text("E(7)", font_size=22, color=PURPLE_D).move_to(slot_centers[10 - 4])
-        d_mob = Text("D(8)", font_size=22, color=ORANGE).move_to(slot_centers[11 - 4])
-        h_mob = Text("H(12)", font_size=22, color=WHITE).move_to(slot_centers[12 - 4])
-        i_mob = Text("I(13)", font_size=22, color=WHITE).move_to(slot_centers[13 - 4])
+        a_mob = pool.text("A(5)", font_size=22, color=PINK).move_to(slot_centers[5 - 4])
+        b_mob = pool.text("B(5)", font_size=22, color=BLUE_E).move_to(slot_centers[6 - 4])
+        c_mob = pool.text("C(5)", font_size=22, color=GREEN).move_to(slot_centers[7 - 4])
+        g_mob = pool.text("G(5)", font_size=22, color=TEAL).move_to(slot_centers[8 - 4])
+        f_mob = pool.text("F(6)", font_size=22, color=GOLD).move_to(slot_centers[9 - 4])
+        e_mob = pool.text("E(7)", font_size=22, color=PURPLE_D).move_to(slot_centers[10 - 4])
+        d_mob = pool.text("D(8)", font_size=22, color=ORANGE).move_to(slot_centers[11 - 4])
+        h_mob = pool.text("H(12)", font_size=22, color=WHITE).move_to(slot_centers[12 - 4])
+        i_mob = pool.text("I(13)", font_size=22, color=WHITE).move_to(slot_centers[13 - 4])
 
         occupied = {
             5: a_mob,
@@ -317,7 +426,7 @@ class RobinHoodDeletion(Scene):
         def show_notification(msg, position=UP * 0.5):
             # Wrap at the “. ” boundary
             wrapped = msg.replace(". ", ".\n")
-            note = Text(wrapped, font_size=18, color=YELLOW, line_spacing=0.3)
+            note = pool.text(wrapped, font_size=18, color=YELLOW, line_spacing=0.3)
             note.move_to(position)
 
             box = SurroundingRectangle(note, color=YELLOW, buff=0.15)
@@ -327,15 +436,17 @@ class RobinHoodDeletion(Scene):
             self.play(FadeOut(grp), run_time=0.3)
 
         #  5) STEP 1: DELETE F(6) at index 9 
+        self.section("delete F")
+        chain = ChainTimeline(self, self.batch_chains)
         #   Fade out F(6); leave slot 9 empty
-        self.play(FadeOut(f_mob), run_time=0.4)
+        chain.play(FadeOut(f_mob), run_time=0.4)
         occupied.pop(9)
-        self.wait(1.0)
+        chain.wait(1.0)
 
         # Show message: “We can’t leave this slot blank. How should we fill it?”
         # We’ll point to slot 9
         msg1 = "We can’t leave this slot blank.\nHow should we fill it?"
-        box1 = Text("We can’t leave this slot blank.\nHow should we fill it?", font_size=20, color=WHITE)
+        box1 = pool.text("We can’t leave this slot blank.\nHow should we fill it?", font_size=20, color=WHITE)
         # Place message slightly above the array (centered)
         box1.move_to(UP * 0.5)
         arrow1 = Arrow(
@@ -344,15 +455,17 @@ class RobinHoodDeletion(Scene):
             color=BLUE,
             buff=0
         )
-        self.play(FadeIn(box1), Create(arrow1), run_time=0.4)
-        self.wait(1.5)
-        self.play(FadeOut(box1), FadeOut(arrow1), run_time=0.3)
-        self.wait(0.6)
+        chain.play(FadeIn(box1), Create(arrow1), run_time=0.4)
+        chain.wait(1.5)
+        chain.play(FadeOut(box1), FadeOut(arrow1), run_time=0.3)
+        chain.wait(0.6)
+        chain.flush(f_mob)
 
         #  6) STEP 2: “PULL BACK” E(7) from index 10 to fill index 9 ─
+        self.section("pull back E")
         # Show notification arrow from E’s home‐distance context:
         msg2 = "This element is far from home.\nLet’s move it closer!"
-        box2 = Text(msg2, font_size=20, color=WHITE)
+        box2 = pool.text(msg2, font_size=20, color=WHITE)
         box2.move_to(UP * 0.5)
         arrow2 = Arrow(
             start=box2.get_bottom() + 0.1 * DOWN,
@@ -360,20 +473,22 @@ class RobinHoodDeletion(Scene):
             color=BLUE,
             buff=0
         )
-        self.play(FadeIn(box2), Create(arrow2), run_time=0.4)
-        self.wait(1.5)
-        self.play(FadeOut(box2), FadeOut(arrow2), run_time=0.3)
-        self.wait(0.6)
+        chain.play(FadeIn(box2), Create(arrow2), run_time=0.4)
+        chain.wait(1.5)
+        chain.play(FadeOut(box2), FadeOut(arrow2), run_time=0.3)
+        chain.wait(0.6)
 
         # Animate: E from slot 10 → slot 9
-        self.play(e_mob.animate.move_to(slot_centers[9 - 4]), run_time=0.5)
+        chain.play(ApplyMethod(e_mob.move_to, slot_centers[9 - 4]), run_time=0.5)
         occupied[9] = e_mob
         occupied.pop(10)
-        self.wait(0.8)
+        chain.wait(0.8)
+        chain.flush(e_mob)
 
         #  7) STEP 3: “PULL BACK” D(8) from index 11 → index 10 ─
+        self.section("pull back D")
         msg3 = "This element is far from home.\nLet’s move it closer!"
-        box3 = Text(msg3, font_size=20, color=WHITE)
+        box3 = pool.text(msg3, font_size=20, color=WHITE)
         box3.move_to(UP * 0.5)
         arrow3 = Arrow(
             start=box3.get_bottom() + 0.1 * DOWN,
@@ -381,21 +496,23 @@ class RobinHoodDeletion(Scene):
             color=BLUE,
             buff=0
         )
-        self.play(FadeIn(box3), Create(arrow3), run_time=0.4)
-        self.wait(1.5)
-        self.play(FadeOut(box3), FadeOut(arrow3), run_time=0.3)
-        self.wait(0.6)
+        chain.play(FadeIn(box3), Create(arrow3), run_time=0.4)
+        chain.wait(1.5)
+        chain.play(FadeOut(box3), FadeOut(arrow3), run_time=0.3)
+        chain.wait(0.6)
 
         # Animate: D from slot 11 → slot 10
-        self.play(d_mob.animate.move_to(slot_centers[10 - 4]), run_time=0.5)
+        chain.play(ApplyMethod(d_mob.move_to, slot_centers[10 - 4]), run_time=0.5)
         occupied[10] = d_mob
         occupied.pop(11)
-        self.wait(0.6)
+        chain.wait(0.6)
+        chain.flush(d_mob)
 
         #  8) STEP 4: “CHECK” H(12) at index 12 ─
+        self.section("check H")
         # Because H’s home is 12, it does not move. Show a final message.
         msg4 = "This element is already home.\nWe’re done."
-        box4 = Text(msg4, font_size=20, color=WHITE)
+        box4 = pool.text(msg4, font_size=20, color=WHITE)
         box4.move_to(UP * 0.5)
         arrow4 = Arrow(
             start=box4.get_bottom() + 0.1 * DOWN,
@@ -406,10 +523,334 @@ class RobinHoodDeletion(Scene):
         # Actually, we want to point at H’s slot 12 to show it stays in place:
         arrow4_end = slot_centers[12 - 4] + 0.2 * UP
         arrow4 = Arrow(start=box4.get_bottom() + 0.1 * DOWN, end=arrow4_end, color=BLUE, buff=0)
-        self.play(FadeIn(box4), Create(arrow4), run_time=0.4)
-        self.wait(1.5)
-        self.play(FadeOut(box4), FadeOut(arrow4), run_time=0.3)
-        self.wait(0.6)
+        chain.play(FadeIn(box4), Create(arrow4), run_time=0.4)
+        chain.wait(1.5)
+        chain.play(FadeOut(box4), FadeOut(arrow4), run_time=0.3)
+        chain.wait(0.6)
+        chain.flush(h_mob)
 
         #  9) FINAL PAUSE 
-        self.wait(2.0)
\ No newline at end of file
+        self.section("end")
+        self.wait(2.0)
+
+class RobinHoodLargeTable(MovingCameraScene):
+    """Displacement cascades in a 10^5-slot Robin Hood table near full load.
+
+    The table is filled to ``load_factor`` off screen, then three of
+    ``candidates`` random keys are inserted one by one: the ones whose
+    cascades sit at the ``quantiles`` of all the candidates' lengths (a
+    typical, a long and the longest). The camera follows the probe along the array and
+    zooms out for long cascades; a TableWindow keeps only ``window_slots``
+    slots on screen, so the scene costs the same for any ``capacity``.
+    """
+
+    capacity = 100_000
+    load_factor = 0.95
+    quantiles = (0.5, 0.9, 1.0)
+    candidates = 1_000
+    window_slots = 40
+    pitch = 0.8
+    slots_per_second = 30  # probe speed along the array ...
+    max_sweep = 10.0  # ... unless a cascade would take longer than this
+    seed = 0
+
+    def construct(self):
+        rng = np.random.default_rng(self.seed)
+        table = RobinHoodTable(self.capacity)
+        n_filled = int(self.load_factor * self.capacity)
+        keys = rng.choice(2**62, size=n_filled + self.candidates, replace=False)
+        table.insert_many(keys[:n_filled])
+        candidates = keys[n_filled:]
+        by_length = np.argsort(table.cascade_lengths(home_slots(candidates, self.capacity)))
+        picked = [int(candidates[by_length[round(q * (len(by_length) - 1))]]) for q in self.quantiles]
+
+        frame = self.camera.frame
+        cursor = ValueTracker(0)  # unwrapped slot the probe is at
+        zoom = ValueTracker(config.frame_width)
+        max_width = (self.window_slots - 2) * self.pitch
+        # Look ahead: the probe only moves right, so keep it in the left third.
+        frame.add_updater(lambda f: f.scale_to_fit_width(zoom.get_value()).set_x(
+            cursor.get_value() * self.pitch + zoom.get_value() / 6
+        ))
+        self.add(frame)
+        window = TableWindow(table, frame, self.window_slots, pitch=self.pitch, y=-0.5)
+
+        marker = Square(side_length=self.pitch, color=YELLOW, stroke_width=5)
+        carried = VMobject()
+        probe = VGroup(marker, carried)
+        pending = deque()  # (unwrapped slot, event) not yet reached by the probe
+
+        def replay(group):
+            marker.move_to(window.slot_center(cursor.get_value()))
+            while pending and pending[0][0] <= cursor.get_value() + 1e-6:
+                slot, event = pending.popleft()
+                if event.kind == "swap":  # the evicted key is carried on
+                    carried.become(window.glyph(window.dist(event.slot)))
+                else:
+                    carried.become(window.glyph(event.dist))
+                if event.kind != "probe":
+                    window.overrides[event.slot] = event.dist
+                    window.refresh(event.slot)
+            carried.next_to(marker, UP, buff=0.2)
+
+        probe.add_updater(replay)
+
+        title = pool.text(
+            f"Robin Hood table: {self.capacity:,} slots, load factor {self.load_factor:.2f}",
+            font_size=30, color=BLUE,
+        ).to_edge(UP)
+        status = pool.text(f"{n_filled:,} keys inserted", font_size=22, color=WHITE).next_to(title, DOWN, buff=0.3)
+        legend = pool.text(
+            "each slot shows how far its key is from home", font_size=18, color=GRAY
+        ).to_edge(DOWN)
+        hud = VGroup(title, status, legend)
+        for mob in hud:
+            pin_to_frame(mob, frame)
+
+        self.add(window, probe)
+        self.play(FadeIn(hud), run_time=1.0)
+        self.wait(1.0)
+
+        for k, key in enumerate(picked, start=1):
+            home = int(home_slots([key], self.capacity)[0])
+            length = int(table.cascade_lengths([home])[0])
+            span = np.arange(home, home + length + 1) % self.capacity
+            before = {int(slot): window.dist(int(slot)) for slot in span}
+            events = table.insert(key, home=home)
+            swaps = sum(event.kind == "swap" for event in events)
+
+            # Cut to the new home with the table still showing its state before the insert.
+            window.overrides.update(before)
+            cursor.set_value(home - 0.5)
+            pending.extend((home + (event.slot - home) % self.capacity, event) for event in events)
+            status.become(pool.text(
+                f"insert {k}: home slot {home:,}, shifts {length + 1} slots with {swaps} swaps",
+                font_size=22, color=WHITE,
+            ))
+            status.zoom = 1.0
+            sweep = float(np.clip(length / self.slots_per_second, 1.0, self.max_sweep))
+            # Zoom out until about one second of the sweep is in view.
+            width = np.clip(length / sweep * self.pitch, config.frame_width, max_width)
+            self.play(
+                zoom.animate.set_value(width),
+                cursor.animate.set_value(home),
+                run_time=1.0,
+            )
+            self.play(
+                cursor.animate.set_value(home + length),
+                run_time=sweep,
+                rate_func=linear,
+            )
+            window.overrides.clear()  # the table itself now matches the screen
+            self.wait(1.5)
+
+        logger.info(
+            f"{self}: {window.created} slot mobjects drawn for a {self.capacity:,}-slot table"
+        )
+        self.play(FadeOut(hud), FadeOut(probe), run_time=0.8)
+        self.wait(1.0)
+
+
+class RobinHoodLoadDashboard(Scene):
+    """Probe-length histogram, mean, variance and max as millions of keys stream in.
+
+    The statistics for ``samples`` load factors between ``loads`` are
+    computed up front by hash_tables.probe_length_timeline, in NumPy
+    batches. During the sweep, updaters read the sample under the current
+    time (interpolating the histogram between samples) and redraw one
+    BarChartPath and two curves, so each frame costs the same whatever the
+    ``capacity``.
+    """
+
+    capacity = 2**22  # about four million slots
+    loads = (0.1, 0.95)
+    samples = 160
+    bins = 32  # the last bin counts probe lengths of bins - 1 and longer
+    duration = 12.0  # seconds for the sweep from the first load to the last
+    seed = 0
+
+    def construct(self):
+        timeline = cached_run(
+            probe_length_timeline, self.capacity, np.linspace(*self.loads, self.samples),
+            bins=self.bins, seed=self.seed,
+        )
+        progress = ValueTracker(0)
+
+        def sample():
+            """(row below the current time, fraction of the way to the next row)."""
+            position = progress.get_value() * (self.samples - 1)
+            row = min(int(position), self.samples - 2)
+            return row, position - row
+
+        title = pool.text(
+            f"Robin Hood probe lengths as {self.capacity:,} slots fill up", font_size=32, color=BLUE
+        ).to_edge(UP)
+
+        #  Histogram of probe lengths (one mobject for all bars)
+        chart = BarChartPath(timeline["hist"][0], width=7, height=3.6, color=GREEN)
+        chart.move_to([-2.6, -0.2, 0])
+        baseline_y = chart.get_bottom()[1]
+        ticks = list(range(0, self.bins - 1, 5))
+        tick_labels = IndexLabels(
+            ticks, [[chart.bar_center_x(t), baseline_y - 0.1, 0] for t in ticks], font_size=18, edge=UP
+        )
+        overflow = pool.text(f"{self.bins - 1}+", font_size=16).next_to(
+            [chart.bar_center_x(self.bins - 1), baseline_y - 0.1, 0], DOWN, buff=0
+        )
+        x_caption = pool.text("probe length (slots from home)", font_size=20).next_to(tick_labels, DOWN, buff=0.25)
+        baseline = Line([chart.get_left()[0], baseline_y, 0], [chart.get_right()[0], baseline_y, 0], stroke_width=2)
+
+        def redraw_chart(mob):
+            row, f = sample()
+            hist = (1 - f) * timeline["hist"][row] + f * timeline["hist"][row + 1]
+            mob.set_values(hist)
+
+        chart.add_updater(redraw_chart)
+
+        #  Running statistics: pooled labels, numbers updated in place
+        labels = VGroup(*(
+            pool.text(name, font_size=22)
+            for name in ("load factor", "keys", "mean", "variance", "max", "tallest bar")
+        )).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
+        values = VGroup(
+            DecimalNumber(0, num_decimal_places=3, font_size=22, edge_to_fix=RIGHT),
+            Integer(0, font_size=22, edge_to_fix=RIGHT),
+            DecimalNumber(0, num_decimal_places=2, font_size=22, edge_to_fix=RIGHT),
+            DecimalNumber(0, num_decimal_places=2, font_size=22, edge_to_fix=RIGHT),
+            Integer(0, font_size=22, edge_to_fix=RIGHT),
+            DecimalNumber(0, num_decimal_places=1, unit=r"\%", font_size=22, edge_to_fix=RIGHT),
+        )
+        column = labels.get_right()[0] + 1.6
+        for label, value in zip(labels, values):
+            value.move_to([column, label.get_center()[1], 0], RIGHT)
+        stats = VGroup(labels, values).to_corner(UR).shift(DOWN * 1.0 + LEFT * 0.4)
+
+        def redraw_stats(mob):
+            row, f = sample()
+            load = (1 - f) * timeline["load"][row] + f * timeline["load"][row + 1]
+            numbers = (
+                load, int(load * self.capacity), timeline["mean"][row], timeline["var"][row],
+                int(timeline["max"][row]), 100 * timeline["hist"][row].max(),
+            )
+            # DecimalNumber builds its digits from a per-character cache, so
+            # only a value that changed costs anything.
+            for value, number in zip(values, numbers):
+                if value.get_value() != number:
+                    value.set_value(number)
+
+        stats.add_updater(redraw_stats)
+
+        #  Mean and max probe length against load factor
+        top = int(np.ceil(timeline["max"].max() / 10) * 10)
+        axes = Axes(
+            x_range=[0, 1, 0.1], y_range=[0, top, top / 4], x_length=4.2, y_length=2.4, tips=False,
+        ).to_corner(DR).shift(UP * 0.3 + LEFT * 0.2)
+        axes_labels = VGroup(
+            pool.text("load factor", font_size=16).next_to(axes, DOWN, buff=0.1),
+            pool.text(f"0 to {top} slots", font_size=16).rotate(PI / 2).next_to(axes, LEFT, buff=0.1),
+        )
+        curves = {}
+        for key, color in (("mean", YELLOW), ("max", RED)):
+            curve = VMobject(color=color, stroke_width=3)
+
+            def redraw_curve(mob, key=key):
+                row, f = sample()
+                ys = timeline[key][:row + 2].astype(float)
+                xs = timeline["load"][:row + 2].copy()
+                # End the curve at the current time rather than the next sample.
+                xs[-1] = (1 - f) * xs[-2] + f * xs[-1]
+                ys[-1] = (1 - f) * ys[-2] + f * ys[-1]
+                mob.set_points_as_corners(axes.coords_to_point(xs, ys).T)
+
+            curve.add_updater(redraw_curve)
+            curves[key] = curve
+        legend = VGroup(
+            pool.text("mean", font_size=16, color=YELLOW),
+            pool.text("max", font_size=16, color=RED),
+        ).arrange(RIGHT, buff=0.4).next_to(axes, UP, buff=0.1)
+
+        histogram = VGroup(chart, baseline, tick_labels, overflow, x_caption)
+        plot = VGroup(axes, axes_labels, legend, *curves.values())
+        for mob in (chart, stats, *curves.values()):
+            mob.update()
+        self.play(Write(title), FadeIn(histogram), FadeIn(plot), FadeIn(stats), run_time=1.2)
+        self.wait(0.8)
+        self.play(progress.animate.set_value(1), run_time=self.duration, rate_func=linear)
+        self.wait(2.0)
+        self.play(FadeOut(VGroup(title, histogram, plot, stats)), run_time=1.0)
+
+
+class HashTableComparison(Scene):
+    """Robin Hood vs linear probing vs cuckoo hashing, drawn from hash_bench.py's measurements.
+
+    The curves come from ``results`` (written by ``python hash_bench.py``);
+    without it a small benchmark is run first. One panel per metric, one
+    curve per engine, against load factor.
+    """
+
+    results = "hash_bench.json"
+    engines = {"robin_hood": ("Robin Hood", PINK), "linear_probing": ("linear probing", BLUE),
+               "cuckoo": ("cuckoo", GREEN)}
+    # (column, panel title, divisor)
+    metrics = [
+        ("insert_per_s", "inserts / s (thousands)", 1e3),
+        ("hit_per_s", "successful finds / s (thousands)", 1e3),
+        ("miss_per_s", "unsuccessful finds / s (thousands)", 1e3),
+        ("delete_per_s", "deletes / s (thousands)", 1e3),
+        ("p99_probe", "99th percentile probe length", 1),
+        ("miss_probes", "slots examined per miss", 1),
+    ]
+
+    def construct(self):
+        path = Path(__file__).resolve().parent / self.results
+        if path.exists():
+            results = json.loads(path.read_text())
+        else:
+            logger.info(f"{self}: no {self.results}, running a small benchmark")
+            results = cached_run(run_benchmarks, capacity=2**14, ops=2000)
+        rows = {name: [row for row in results["rows"] if row["engine"] == name] for name in self.engines}
+        rows = {name: engine_rows for name, engine_rows in rows.items() if engine_rows}
+
+        title = pool.text(
+            f"Hash tables with {results['capacity']:,} slots, by load factor", font_size=32, color=YELLOW
+        ).to_edge(UP)
+        legend = VGroup(*[
+            pool.text(self.engines[name][0], font_size=22, color=self.engines[name][1]) for name in rows
+        ]).arrange(RIGHT, buff=0.8).next_to(title, DOWN, buff=0.25)
+
+        panels = VGroup()
+        for column, label, divisor in self.metrics:
+            peak = max(row[column] for engine_rows in rows.values() for row in engine_rows) / divisor
+            magnitude = 10 ** np.floor(np.log10(peak)) if peak > 0 else 1
+            top = float(np.ceil(peak / magnitude * 2) / 2 * magnitude)
+            axes = Axes(
+                x_range=[0, 1, 0.5],
+                y_range=[0, top, top / 2],
+                x_length=3.4,
+                y_length=1.6,
+                tips=False,
+                axis_config={"include_numbers": True, "font_size": 16},
+            )
+            caption = pool.text(label, font_size=16).next_to(axes, UP, buff=0.1)
+            panels.add(VGroup(axes, caption))
+        panels.arrange_in_grid(rows=2, cols=3, buff=(0.7, 0.6)).next_to(legend, DOWN, buff=0.35)
+
+        # Curves are placed through the axes, so only once the panels are laid out.
+        curves = {name: VGroup() for name in rows}
+        for (column, _, divisor), (axes, _) in zip(self.metrics, panels):
+            for name, engine_rows in rows.items():
+                points = axes.coords_to_point(
+                    [row["load"] for row in engine_rows], [row[column] / divisor for row in engine_rows]
+                ).T
+                curve = VMobject(color=self.engines[name][1], stroke_width=3)
+                if len(points) > 1:
+                    curve.set_points_as_corners(points)
+                curves[name].add(curve)
+        x_caption = pool.text("load factor", font_size=18).next_to(panels, DOWN, buff=0.15)
+
+        self.play(Write(title), FadeIn(panels), FadeIn(x_caption), run_time=1.2)
+        for name, label in zip(rows, legend):
+            self.play(FadeIn(label), Create(curves[name]), run_time=1.5)
+            self.wait(0.5)
+        self.wait(3.0)
+        self.play(FadeOut(VGroup(title, legend, panels, x_caption, *curves.values())), run_time=1.0)
@@ -0,0 +1,251 @@
+"""
+Scene Profiler
+Description: Opt-in instrumentation that times every play()/wait() in a scene
+and splits it into phases, so a slow scene shows whether its time goes to TeX
+compilation, Text/SVG construction, rasterization or video encoding.
+
+Usage:
+    python scene_profile.py OutroScene RobinHoodInsertion
+    python scene_profile.py -n 5 -q medium_quality DeepQScene
+
+Each scene is rendered in its own process with these hooks installed:
+
+    play    Scene.play (wait() goes through play as a Wait animation)
+    tex     latex + dvisvgm, via manim's tex_to_svg_file
+    text    Text construction (Pango layout)
+    svg     SVGMobject parsing, including the SVG behind Text and MathTex
+    raster  Camera.capture_mobjects, i.e. drawing one frame with Cairo
+    encode  PyAV encoding, which runs on the file writer's thread
+
+Spans are labelled with the line in ``construct`` they came from. A Chrome
+trace (loadable in chrome://tracing, Perfetto or speedscope) is written to
+.render_profile/<Scene>.json and the most expensive lines are printed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from render_all import QUALITY_DIRS, SCENE_FILES, _load_module, discover_scenes
+
+ROOT = Path(__file__).resolve().parent
+PROFILE_DIR = ROOT / ".render_profile"
+PHASES = ("tex", "text", "svg", "raster", "encode")
+_USER_FILES = {str(path) for path in SCENE_FILES}
+
+
+def _source_label():
+    """``file:line`` of the construct-level statement that led here.
+
+    Helpers such as ``show_notification`` or ``ChainTimeline.flush`` are
+    skipped so all their work lands on the line in ``construct`` that called
+    them; the innermost scene-file line is appended when it differs.
+    """
+    frame = sys._getframe(2)
+    lines = []
+    while frame is not None:
+        if frame.f_code.co_filename in _USER_FILES:
+            lines.append((Path(frame.f_code.co_filename).name, frame.f_lineno))
+        frame = frame.f_back
+    if not lines:
+        return "<manim>"
+    name, outer = lines[-1]
+    inner = lines[0][1]
+    return f"{name}:{outer}" + (f" via :{inner}" if inner != outer else "")
+
+
+class Profiler:
+    """Records nested spans as Chrome trace events and per-line phase totals."""
+
+    def __init__(self):
+        self.events = []
+        self.totals = defaultdict(lambda: defaultdict(float))  # label -> phase -> seconds
+        self.calls = defaultdict(int)
+        self.names = {}
+        self.threads = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._current = None  # label of the top-level span on the main thread
+        self._origin = time.perf_counter()
+
+    def wrap(self, phase, function, name=None):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            with profiler.span(phase, name(args) if name else phase):
+                return function(*args, **kwargs)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def span(self, phase, name):
+        return _Span(self, phase, name)
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _record(self, phase, name, label, start, duration, self_time, top_level):
+        event = {
+            "name": name,
+            "cat": phase,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": {"line": label},
+        }
+        with self._lock:
+            self.events.append(event)
+            self.threads[event["tid"]] = threading.current_thread().name
+            if phase != "play":
+                self.totals[label][phase] += self_time
+            if top_level:
+                self.calls[label] += 1
+                self.totals[label]["total"] += duration
+                self.names.setdefault(label, name)
+
+    def trace(self, scene_name):
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+             "args": {"name": name}}
+            for tid, name in self.threads.items()
+        ]
+        return {
+            "traceEvents": names + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"scene": scene_name},
+        }
+
+    def summary(self, top=10):
+        rows = sorted(self.totals.items(), key=lambda item: -item[1]["total"])[:top]
+        header = f"  {'line':<30} {'calls':>5} {'total s':>8}" + "".join(
+            f" {phase:>7}" for phase in PHASES
+        )
+        lines = [header]
+        for label, phases in rows:
+            lines.append(
+                f"  {label:<30} {self.calls[label]:5d} {phases['total']:8.2f}"
+                + "".join(f" {phases[phase]:7.2f}" for phase in PHASES)
+                + f"  {self.names[label]}"
+            )
+        return "\n".join(lines)
+
+
+class _Span:
+    def __init__(self, profiler, phase, name):
+        self.profiler = profiler
+        self.phase = phase
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler._stack()
+        self.top_level = not stack and threading.current_thread() is threading.main_thread()
+        if self.top_level:
+            self.label = _source_label()
+            profiler._current = self.label
+        elif stack:
+            self.label = stack[-1].label
+        else:
+            # Writer thread: charge the encode to whatever play() is running.
+            self.label = profiler._current or "<manim>"
+        self.children = 0.0
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        self.profiler._record(
+            self.phase, self.name, self.label, self.start, duration,
+            duration - self.children, self.top_level,
+        )
+        if self.top_level:
+            self.profiler._current = None
+        return False
+
+
+def _animation_names(args):
+    scene, *animations = args
+    names = [type(a).__name__.lstrip("_").replace("AnimationBuilder", "animate")
+             for a in animations]
+    return "play(" + ", ".join(names) + ")"
+
+
+def install(profiler):
+    """Patch manim's hot paths to report to ``profiler``."""
+    from manim import Camera, Scene, SVGMobject, Text
+    from manim.mobject.text import tex_mobject
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    Scene.play = profiler.wrap("play", Scene.play, _animation_names)
+    tex_mobject.tex_to_svg_file = profiler.wrap("tex", tex_mobject.tex_to_svg_file)
+    Text.__init__ = profiler.wrap("text", Text.__init__)
+    SVGMobject.__init__ = profiler.wrap("svg", SVGMobject.__init__)
+    Camera.capture_mobjects = profiler.wrap("raster", Camera.capture_mobjects)
+    SceneFileWriter.encode_and_write_frame = profiler.wrap(
+        "encode", SceneFileWriter.encode_and_write_frame
+    )
+
+
+def profile_scene(path, scene_name, quality, out_dir=PROFILE_DIR, top=10):
+    """Render one scene with the hooks installed; write its trace, return the summary."""
+    os.chdir(path.parent)
+    from manim import config, logger
+
+    config.quality = quality
+    config.input_file = str(path)
+    config.media_dir = str(out_dir / "media")
+    config.disable_caching = True
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+    logger.setLevel("WARNING")
+
+    profiler = Profiler()
+    install(profiler)
+    module = _load_module(path)
+    start = time.perf_counter()
+    getattr(module, scene_name)().render()
+    elapsed = time.perf_counter() - start
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    trace = out_dir / f"{scene_name}.json"
+    trace.write_text(json.dumps(profiler.trace(scene_name)))
+    return f"{scene_name}: {elapsed:.1f}s, trace in {trace}\n{profiler.summary(top)}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-q", "--quality", default="low_quality", choices=QUALITY_DIRS)
+    parser.add_argument("-n", "--top", type=int, default=10,
+                        help="lines to list per scene (default: 10)")
+    parser.add_argument("--out", type=Path, default=PROFILE_DIR)
+    parser.add_argument("scenes", nargs="*", help="default: every scene")
+    args = parser.parse_args(argv)
+
+    scenes = discover_scenes()
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+    for path, name in scenes:
+        # Fresh process per scene: the patches and manim's config stay local.
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            print(pool.submit(profile_scene, path, name, args.quality,
+                              args.out.resolve(), args.top).result())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Section Cache
+Description: Scene base class that renders only the sections whose inputs
+changed and stitches cached movies back in for the rest.
+
+A scene marks its steps with ``self.section(name, *inputs)``. Each section's
+key hashes:
+
+    - the code from its ``self.section`` call up to the next one in construct
+    - the rest of the file (helpers, class attributes, construct's preamble),
+      minus the other scenes and the other sections' code
+    - the local modules the file imports
+    - ``inputs``, for values a loop feeds into one shared section body
+    - every mobject on screen when the section starts
+    - the previous section's key, resolution, frame rate and manim version
+
+A section with a cached movie is played with manim's ``skip_animations`` so
+the scene state still advances, but nothing is rasterized or encoded. After
+the render, cached and freshly rendered section movies are concatenated into
+the scene's movie. Cached movies live in .render_cache/sections/<Scene>, one
+directory and size budget per scene, and are trimmed least-recently-used like
+the scene cache. ``--disable_caching`` (or
+``cache_sections = False`` on the scene) renders everything.
+"""
+
+import ast
+import hashlib
+import inspect
+import sys
+from pathlib import Path
+
+import numpy as np
+from manim import Scene, config, logger
+from manim.utils.file_ops import open_media_file
+
+from render_cache import RenderCache, _local_imports, _manim_version, _other_scene_lines
+
+SECTION_CACHE_DIR = Path(__file__).resolve().parent / ".render_cache" / "sections"
+
+
+class SectionCacheError(RuntimeError):
+    """A section that was skipped as cached has no cached movie to stitch in."""
+
+
+def mobject_digest(mobjects):
+    """Hash of everything that decides how ``mobjects`` (and their families) are drawn."""
+    digest = hashlib.sha256()
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            digest.update(type(member).__name__.encode())
+            digest.update(np.ascontiguousarray(member.points).tobytes())
+            for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+                values = getattr(member, attr, None)
+                if values is not None:
+                    digest.update(np.ascontiguousarray(values).tobytes())
+            digest.update(repr((getattr(member, "stroke_width", None), member.z_index)).encode())
+    return digest.digest()
+
+
+class _SourceMap:
+    """Which lines of a scene file belong to which ``self.section`` call."""
+
+    def __init__(self, scene_cls):
+        path = Path(inspect.getsourcefile(scene_cls))
+        source = path.read_text(encoding="utf-8")
+        self.lines = source.splitlines()
+        tree = ast.parse(source)
+        class_node = next(
+            node for node in tree.body
+            if isinstance(node, ast.ClassDef) and node.name == scene_cls.__name__
+        )
+        construct = next(
+            node for node in class_node.body
+            if isinstance(node, ast.FunctionDef) and node.name == "construct"
+        )
+        calls = sorted({
+            node.lineno for node in ast.walk(construct)
+            if isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "section"
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "self"
+        })
+        # Section code runs from its call to the next call (or the end of construct).
+        self.ranges = {
+            line: (line, end)
+            for line, end in zip(calls, calls[1:] + [construct.end_lineno + 1])
+        }
+        # Other scenes in the file do not affect this one.
+        excluded = _other_scene_lines(tree, class_node)
+        for start, end in self.ranges.values():
+            excluded.update(range(start, end))
+
+        digest = hashlib.sha256()
+        for number, line in enumerate(self.lines, start=1):
+            if number not in excluded:
+                digest.update(line.encode() + b"\n")
+        for dependency in _local_imports(tree, path.parent):
+            digest.update(dependency.name.encode() + b"\0" + dependency.read_bytes())
+        self.shared = digest.hexdigest()
+
+    def code(self, line):
+        start, end = self.ranges[line]
+        return "\n".join(self.lines[start - 1:end - 1])
+
+
+class SectionCachedScene(Scene):
+    """Scene whose ``self.section(...)`` steps are cached and re-rendered only when they change."""
+
+    cache_sections = True
+    section_cache_dir = SECTION_CACHE_DIR
+    section_cache_size = 1024  # MiB per scene
+
+    def setup(self):
+        super().setup()
+        self._section_cache = None
+        self._section_entries = {}  # id(manim Section) -> (key, cached)
+        self._section_key = ""
+        if self.cache_sections and not config.disable_caching and not config.dry_run:
+            config.save_sections = True
+            # One directory per scene: scenes rendering in parallel never evict each other's sections.
+            self._section_cache = RenderCache(
+                self.section_cache_dir / type(self).__name__,
+                max_bytes=self.section_cache_size * 1024**2,
+            )
+            self._source_map = _SourceMap(type(self))
+
+    def section(self, name, *inputs):
+        """Start a cached section; everything played until the next call belongs to it."""
+        if self._section_cache is None:
+            self.next_section(name)
+            return
+        line = sys._getframe(1).f_lineno
+        digest = hashlib.sha256()
+        for part in (
+            self._section_key,
+            self._source_map.shared,
+            self._source_map.code(line),
+            repr(inputs),
+            f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate}",
+            str(config.background_color),
+            _manim_version(),
+        ):
+            digest.update(part.encode() + b"\0")
+        digest.update(mobject_digest(self.mobjects))
+        key = self._section_key = digest.hexdigest()
+
+        cached = key in self._section_cache
+        self.next_section(name, skip_animations=cached)
+        self._section_entries[id(self.renderer.file_writer.sections[-1])] = (key, cached)
+
+    def render(self, preview=False):
+        opening = preview or config["preview"] or config["show_in_file_browser"]
+        flags = config["preview"], config["show_in_file_browser"]
+        config["preview"] = config["show_in_file_browser"] = False
+        try:
+            result = super().render(False)
+        finally:
+            config["preview"], config["show_in_file_browser"] = flags
+        if self._section_cache is not None:
+            self._stitch_sections()
+        if opening:
+            open_media_file(self.renderer.file_writer)
+        return result
+
+    def _stitch_sections(self):
+        writer = self.renderer.file_writer
+        cache = self._section_cache
+        entries = [self._section_entries.get(id(section), (None, False)) for section in writer.sections]
+        # Storing the fresh sections below may evict; keep every entry this stitch reads.
+        cache.pinned.update(key for key, cached in entries if cached)
+        parts, reused = [], 0
+        try:
+            for section, (key, cached) in zip(writer.sections, entries):
+                if cached:
+                    part = writer.sections_output_dir / f"{writer.output_name}_cached_{key[:16]}.mp4"
+                    if not cache.fetch(key, section.name, part):
+                        # manim's movie lacks this section; never leave it to be cached or played.
+                        Path(writer.movie_file_path).unlink(missing_ok=True)
+                        raise SectionCacheError(
+                            f"{self}: cached section '{section.name}' is gone; "
+                            "render again (or with --disable_caching)"
+                        )
+                    reused += 1
+                elif section.video is not None:
+                    part = writer.sections_output_dir / section.video
+                    if key is not None:
+                        cache.store(key, section.name, part)
+                else:
+                    continue  # nothing was played in this section
+                parts.append(part)
+        finally:
+            cache.pinned.clear()
+        if reused:
+            from assemble import concat_videos
+
+            concat_videos(parts, writer.movie_file_path)
+        logger.info(f"{self}: {reused} of {len(parts)} sections reused from the section cache, "
+                    f"{len(parts) - reused} rendered")
@@ -0,0 +1,244 @@
+"""
+Snapshot Regression
+Description: Checks a scene change in seconds by comparing a handful of
+low-resolution frames against stored hashes instead of rendering the video.
+
+Each scene runs in its own process as a dry run (nothing is encoded or
+written) at 256x144 and 15 fps. The timeline is evaluated as usual, but a
+frame is only drawn at the samples asked for:
+
+    play 12     the scene right after its 13th play()/wait() call
+    t=4.500     the frame on screen 4.5 s into the scene
+
+By default every play() end is sampled. When only play ends are sampled the
+animations in between are skipped outright, like ``manim -s`` does, so no
+intermediate frame is even interpolated. Each sample's pixels are hashed and
+compared with snapshots.json; the frames themselves are saved as PNGs in
+.snapshots/<Scene>/ for a look at what changed.
+
+Usage:
+    python snapshot.py --update                       # record snapshots.json
+    python snapshot.py                                # compare, exit 1 on a change
+    python snapshot.py --times 1,2.5 --update ValueGuidesScene
+    python snapshot.py -j 4 RobinHoodDeletion ValueGuidesScene
+
+The hashes depend on the installed manim, Cairo, Pango and fonts, so record
+the goldens on the machine (or CI image) that checks them.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from render_all import _load_module, discover_scenes
+from render_cache import _manim_version
+
+ROOT = Path(__file__).resolve().parent
+GOLDEN = ROOT / "snapshots.json"
+FRAME_DIR = ROOT / ".snapshots"
+RESOLUTION = (256, 144)
+FRAME_RATE = 15
+
+
+def _make_sampling_renderer(plays, times):
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    class SamplingRenderer(CairoRenderer):
+        """Runs the timeline but only draws the frames at the requested samples."""
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.sample_plays = plays  # None: the end of every play
+            self.sample_times = sorted(times)
+            self.frames = {}
+            self._scene = None
+
+        def update_skipping_status(self):
+            super().update_skipping_status()
+            # No timestamp left inside the rest of the scene: jump to each play's end.
+            if not self.sample_times:
+                self.skip_animations = True
+
+        def save_static_frame_data(self, scene, static_mobjects):
+            self.static_image = None  # nothing is drawn between samples
+            return None
+
+        def update_frame(self, scene, mobjects=None, **kwargs):
+            pass  # only _capture draws
+
+        def _capture(self, label):
+            CairoRenderer.update_frame(self, self._scene)
+            self.frames[label] = self.get_frame()
+
+        def _capture_due(self, end):
+            while self.sample_times and self.sample_times[0] < end:
+                self._capture(f"t={self.sample_times.pop(0):.3f}")
+
+        def play(self, scene, *args, **kwargs):
+            self._scene = scene
+            index = self.num_plays
+            super().play(scene, *args, **kwargs)
+            if self.sample_plays is None or index in self.sample_plays:
+                if self.skip_animations:
+                    scene.update_mobjects(0)  # play_internal only does this when not skipping
+                self._capture(f"play {index}")
+
+        def render(self, scene, time, moving_mobjects):
+            if self.skip_animations:
+                return
+            dt = 1 / self.camera.frame_rate
+            self._capture_due(self.time + dt)
+            self.time += dt
+
+        def freeze_current_frame(self, duration):
+            if self.skip_animations:
+                return
+            dt = 1 / self.camera.frame_rate
+            end = self.time + int(duration / dt) * dt
+            self._capture_due(end)
+            self.time = end
+
+    return SamplingRenderer
+
+
+def sample_scene(path, scene_name, plays=None, times=(), frame_dir=FRAME_DIR):
+    """Dry-run one scene, drawing only the samples; return {label: frame hash}."""
+    os.chdir(path.parent)
+    import numpy as np
+    from manim import config, logger
+    from manim.scene import scene as scene_module
+    from PIL import Image
+
+    config.dry_run = True
+    config.disable_caching = True
+    config.pixel_width, config.pixel_height = RESOLUTION
+    config.frame_rate = FRAME_RATE
+    config.progress_bar = "none"
+    config.verbosity = "ERROR"
+    logger.setLevel("ERROR")
+    random.seed(0)
+    np.random.seed(0)
+
+    # Scene.__init__ builds its renderer from this name, passing its camera class.
+    scene_module.CairoRenderer = _make_sampling_renderer(plays, times)
+    module = _load_module(path)
+    scene = getattr(module, scene_name)()
+    scene.render()
+
+    out = Path(frame_dir) / scene_name
+    out.mkdir(parents=True, exist_ok=True)
+    hashes = {}
+    for label, frame in scene.renderer.frames.items():
+        hashes[label] = hashlib.sha256(frame.tobytes()).hexdigest()[:16]
+        Image.fromarray(frame).save(out / f"{label.replace(' ', '_')}.png")
+    return hashes
+
+
+def _parse_labels(labels):
+    plays = sorted(int(label[5:]) for label in labels if label.startswith("play "))
+    times = sorted(float(label[2:]) for label in labels if label.startswith("t="))
+    return plays, times
+
+
+def run_snapshots(scenes, requests, workers=None):
+    """Sample scenes in parallel; ``requests`` maps a scene to (plays, times)."""
+    results, failures = {}, {}
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(sample_scene, path, name, *requests[name]): name
+            for path, name in scenes
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as exc:
+                failures[name] = exc
+                print(f"  FAILED {name}: {exc!r}")
+    return results, failures
+
+
+def compare(results, golden):
+    """Print the outcome per scene; return the names that changed or have no golden."""
+    changed = []
+    for name in sorted(results):
+        expected = golden.get(name)
+        if expected is None:
+            changed.append(name)
+            print(f"  {name:<26} no snapshot recorded (run with --update)")
+            continue
+        diff = [label for label in expected if results[name].get(label) != expected[label]]
+        if diff:
+            changed.append(name)
+            shown = ", ".join(diff[:5]) + (" ..." if len(diff) > 5 else "")
+            print(f"  {name:<26} {len(diff)}/{len(expected)} frames changed: {shown}")
+        else:
+            print(f"  {name:<26} {len(expected)} frames match")
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--plays", help="comma-separated play() indices to sample")
+    parser.add_argument("--times", help="comma-separated timestamps (seconds) to sample")
+    parser.add_argument("--update", action="store_true",
+                        help="record the sampled hashes as the new goldens")
+    parser.add_argument("--golden", type=Path, default=GOLDEN)
+    parser.add_argument("scenes", nargs="*", help="default: every scene")
+    args = parser.parse_args(argv)
+
+    scenes = discover_scenes()
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+    stored = json.loads(args.golden.read_text()) if args.golden.exists() else {"scenes": {}}
+    golden = stored["scenes"]
+
+    requests = {}
+    for _, name in scenes:
+        if args.plays or args.times:
+            plays = [int(i) for i in args.plays.split(",")] if args.plays else []
+            times = [float(t) for t in args.times.split(",")] if args.times else []
+        elif name in golden and not args.update:
+            plays, times = _parse_labels(golden[name])
+        else:
+            plays, times = None, []
+        requests[name] = (plays, times)
+
+    start = time.perf_counter()
+    results, failures = run_snapshots(scenes, requests, args.workers)
+    print(f"Sampled {sum(map(len, results.values()))} frames from {len(results)} scenes "
+          f"in {time.perf_counter() - start:.1f}s")
+    if failures:
+        return 1
+
+    if args.update:
+        golden.update(results)
+        args.golden.write_text(json.dumps({
+            "resolution": list(RESOLUTION),
+            "frame_rate": FRAME_RATE,
+            "manim": _manim_version(),
+            "scenes": golden,
+        }, indent=2) + "\n")
+        print(f"Snapshots written to {args.golden}")
+        return 0
+
+    if stored.get("manim") not in (None, _manim_version()):
+        print(f"Note: snapshots were recorded with manim {stored['manim']}, "
+              f"this is {_manim_version()}")
+    changed = compare(results, golden)
+    if changed:
+        print(f"\n{len(changed)} scene(s) changed; frames are in {FRAME_DIR}")
+        return 1
+    print("\nAll snapshots match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
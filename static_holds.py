@@ -0,0 +1,123 @@
+"""
+Static Holds
+Description: Render mode that draws a held frame once and encodes it once,
+letting the container timestamps stretch it over the whole hold.
+
+Manim already rasterizes a bare ``self.wait()`` only once, but still hands
+the encoder one copy of that frame per 1/60 s. Waits inside a ``Succession``
+(every batched Robin Hood cascade) and waits with updaters attached are
+rasterized frame by frame too. In this mode:
+
+    - the renderer hashes the on-screen mobjects before drawing each frame
+      and reuses the previous frame when nothing changed
+    - the file writer run-length encodes repeated frames: a hold of n frames
+      is encoded at its first and last timestamp only, so the frame stays on
+      screen for exactly n frame durations
+
+The pixels in every displayed frame are the ones the normal renderer would
+produce. GIF output is re-timed frame by frame when manim combines it, so
+for GIFs only the rasterization is elided.
+
+    static_holds.install()   # before constructing the scene
+    python render_all.py --elide-holds
+"""
+
+import av
+from manim import config
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from section_cache import mobject_digest
+
+
+class HoldElidingFileWriter(SceneFileWriter):
+    """SceneFileWriter that encodes each run of identical frames as two timestamped frames."""
+
+    frames_written = 0
+    frames_encoded = 0
+
+    def open_partial_movie_stream(self, file_path=None):
+        self._pts = 0
+        self._run = None  # [frame, count] still waiting to be encoded
+        super().open_partial_movie_stream(file_path)
+
+    def listen_and_write(self):
+        super().listen_and_write()
+        self._flush_run()
+
+    def encode_and_write_frame(self, frame, num_frames):
+        # The renderer hands over the very same array for every frame of a hold.
+        if self._run is not None and self._run[0] is frame:
+            self._run[1] += num_frames
+            return
+        self._flush_run()
+        self._run = [frame, num_frames]
+
+    def _flush_run(self):
+        if self._run is None:
+            return
+        frame, count = self._run
+        self._run = None
+        if count <= 0:
+            return
+        # Frame pts are in 1/fps units; the second copy pins the end of the hold,
+        # so the duration survives even when the hold ends the partial movie.
+        for pts in sorted({self._pts, self._pts + count - 1}):
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            av_frame.pts = pts
+            for packet in self.video_stream.encode(av_frame):
+                self.video_container.mux(packet)
+            self.frames_encoded += 1
+        self._pts += count
+        self.frames_written += count
+
+
+class HoldElidingRenderer(CairoRenderer):
+    """CairoRenderer that skips rasterizing frames identical to the previous one."""
+
+    def __init__(self, **kwargs):
+        if config.format != "gif":
+            kwargs.setdefault("file_writer_class", HoldElidingFileWriter)
+        super().__init__(**kwargs)
+        self.frames_rasterized = 0
+        self.frames_reused = 0
+        self._last_frame = None
+        self._last_digest = None
+
+    def _scene_digest(self, scene):
+        mobjects = [*scene.mobjects, *scene.foreground_mobjects]
+        frame = getattr(self.camera, "frame", None)  # MovingCamera
+        if frame is not None:
+            mobjects.append(frame)
+        return mobject_digest(mobjects) + str(self.camera.background_color).encode()
+
+    def render(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return super().render(scene, time, moving_mobjects)
+        digest = self._scene_digest(scene)
+        if self._last_frame is None or digest != self._last_digest:
+            self.update_frame(scene, moving_mobjects)
+            self._last_frame = self.get_frame()
+            self._last_digest = digest
+            self.frames_rasterized += 1
+        else:
+            self.frames_reused += 1
+        self.add_frame(self._last_frame)
+
+    def stats(self):
+        writer = self.file_writer
+        return {
+            "rasterized": self.frames_rasterized,
+            "reused": self.frames_reused,
+            "written": getattr(writer, "frames_written", 0),
+            "encoded": getattr(writer, "frames_encoded", 0),
+        }
+
+
+def install():
+    """Make every Scene constructed from now on use :class:`HoldElidingRenderer`."""
+    from manim.scene import scene
+
+    # Scene.__init__ builds its renderer from this module global, passing the
+    # scene's own camera class (MovingCamera etc.) along.
+    scene.CairoRenderer = HoldElidingRenderer
@@ -0,0 +1,156 @@
+"""
+Batched TeX Pre-pass
+Description: Collects every TeX string the scenes will typeset, compiles them
+all in one multi-page LaTeX run plus one dvisvgm run, and drops the per-page
+SVGs into manim's tex cache under the names manim itself would look for.
+
+When a scene later builds a MathTex or Tex, manim finds the SVG already in
+media/Tex and never launches latex or dvisvgm for it. Expressions that are
+already cached are not recompiled. Any template that cannot be batched (not
+standalone-based, or a compile that yields the wrong number of pages) is left
+to manim's usual per-expression compilation.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1 1">'
+    '<path d="M0 0 L1 0 L1 1 Z"/></svg>'
+)
+BEGIN, END = r"\begin{document}", r"\end{document}"
+
+
+def tex_hash(texcode):
+    """Same naming scheme as ``manim.utils.tex_file_writing.tex_hash``."""
+    return hashlib.sha256(texcode.encode()).hexdigest()[:16]
+
+
+def collect_scene_tex(path, scene_name):
+    """Dry-run one scene and return the TeX documents it would compile.
+
+    The scene's construct runs with animations skipped and nothing written.
+    Every call to manim's ``tex_to_svg_file`` is recorded and answered with a
+    placeholder SVG, so no TeX process is started here. Engine runs wrapped in
+    ``render_cache.cached_run`` are computed here once and reused by the render.
+    Returns ``(tex_dir, [(texcode, compiler, output_format), ...])``.
+    """
+    from render_all import _load_module
+
+    os.chdir(path.parent)
+    from manim import config
+    from manim.mobject.text import tex_mobject
+
+    config.dry_run = True
+    config.verbosity = "ERROR"
+    config.progress_bar = "none"
+    tex_dir = config.get_dir("tex_dir").resolve()
+    placeholder = Path(tempfile.mkdtemp()) / "placeholder.svg"
+    placeholder.write_text(PLACEHOLDER_SVG)
+    needed = []
+
+    def record(expression, environment=None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        if environment is not None:
+            texcode = tex_template.get_texcode_for_expression_in_env(expression, environment)
+        else:
+            texcode = tex_template.get_texcode_for_expression(expression)
+        svg = tex_dir / f"{tex_hash(texcode)}.svg"
+        if svg.exists():
+            return svg
+        needed.append((texcode, tex_template.tex_compiler, tex_template.output_format))
+        return placeholder
+
+    tex_mobject.tex_to_svg_file = record
+    module = _load_module(path)
+    getattr(module, scene_name)(skip_animations=True).render()
+    return str(tex_dir), needed
+
+
+def _multi_page_document(texcodes):
+    """One standalone document with a page per expression, or None."""
+    header = texcodes[0].split(BEGIN)[0]
+    if not re.search(r"\\documentclass\[[^\]]*\]\{standalone\}", header):
+        return None
+    header = re.sub(
+        r"\\documentclass\[([^\]]*)\]\{standalone\}",
+        r"\\documentclass[\1,multi=manimpage]{standalone}",
+        header,
+        count=1,
+    )
+    pages = [code.split(BEGIN, 1)[1].rsplit(END, 1)[0] for code in texcodes]
+    body = "".join(f"\\begin{{manimpage}}{page}\\end{{manimpage}}\n" for page in pages)
+    return (
+        header
+        + "\\newenvironment{manimpage}{}{}\n"
+        + f"{BEGIN}\n{body}{END}\n"
+    )
+
+
+def _compile_group(texcodes, compiler, output_format, tex_dir):
+    """Compile one group sharing a preamble; return how many SVGs were written."""
+    document = _multi_page_document(texcodes)
+    if document is None:
+        return 0
+    with tempfile.TemporaryDirectory() as work:
+        work = Path(work)
+        (work / "batch.tex").write_text(document, encoding="utf-8")
+        command = [compiler]
+        if compiler == "xelatex":
+            command += ["-no-pdf"] if output_format == ".xdv" else []
+        else:
+            command += [f"-output-format={output_format[1:]}"]
+        command += ["-interaction=batchmode", "-halt-on-error",
+                    f"-output-directory={work.as_posix()}", "batch.tex"]
+        if subprocess.run(command, cwd=work, stdout=subprocess.DEVNULL).returncode:
+            return 0
+
+        subprocess.run(
+            ["dvisvgm", *(["--pdf"] if output_format == ".pdf" else []),
+             "--page=1-", "--no-fonts", "--verbosity=0",
+             f"--output={(work / 'page-%p.svg').as_posix()}",
+             (work / f"batch{output_format}").as_posix()],
+            stdout=subprocess.DEVNULL,
+        )
+        pages = sorted(work.glob("page-*.svg"), key=lambda p: int(p.stem.split("-")[1]))
+        if len(pages) != len(texcodes):
+            return 0
+        for texcode, page in zip(texcodes, pages):
+            shutil.move(page, tex_dir / f"{tex_hash(texcode)}.svg")
+    return len(texcodes)
+
+
+def prebuild_tex(scenes, workers=None):
+    """Collect TeX from ``scenes`` in parallel and compile it in one batch per template."""
+    start = time.perf_counter()
+    groups = defaultdict(dict)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(collect_scene_tex, path, name) for path, name in scenes]
+        for (_, name), future in zip(scenes, futures):
+            try:
+                tex_dir, needed = future.result()
+            except Exception as exc:
+                # The scene will simply compile its own TeX when it renders.
+                print(f"  TeX pre-pass skipped {name}: {exc!r}")
+                continue
+            for texcode, compiler, output_format in needed:
+                header = texcode.split(BEGIN)[0]
+                groups[(tex_dir, header, compiler, output_format)][texcode] = None
+
+    total = compiled = 0
+    for (tex_dir, _, compiler, output_format), texcodes in groups.items():
+        Path(tex_dir).mkdir(parents=True, exist_ok=True)
+        total += len(texcodes)
+        compiled += _compile_group(list(texcodes), compiler, output_format, Path(tex_dir))
+    print(f"TeX pre-pass: {compiled}/{total} new expressions compiled in "
+          f"{len(groups)} batch(es), {time.perf_counter() - start:.1f}s")
+    return compiled
@@ -0,0 +1,208 @@
+"""
+Trajectory Log
+Description: Columnar on-disk log of (state, action, reward, next_state, done)
+steps, so scenes can replay long agent runs without loading them into RAM.
+
+A log is a directory holding one raw, fixed-dtype binary file per column, an
+``episodes.bin`` offset index and a ``meta.json`` describing both:
+
+    run/
+        meta.json       dtypes, state shape, step and episode counts
+        state.bin       (steps, *state_shape)
+        action.bin      (steps,)
+        reward.bin      (steps,)
+        next_state.bin  (steps, *state_shape)
+        done.bin        (steps,)
+        episodes.bin    (episodes + 1,) int64 offsets into the step columns
+
+Engines write with :class:`TrajectoryWriter`; scenes read with
+:class:`TrajectoryLog`, whose columns are ``np.memmap`` arrays, so an
+episode is a zero-copy slice and only the pages a scene touches are read.
+
+    with TrajectoryWriter("runs/cliff") as log:
+        log.append(state, action, reward, next_state, done)
+
+    run = TrajectoryLog("runs/cliff")
+    for r, c in run.episode(-1).state: ...
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+COLUMNS = ("state", "action", "reward", "next_state", "done")
+
+
+class Episode(NamedTuple):
+    state: np.ndarray
+    action: np.ndarray
+    reward: np.ndarray
+    next_state: np.ndarray
+    done: np.ndarray
+
+
+class TrajectoryWriter:
+    """Appends steps to a trajectory log, growing its memory-mapped columns as needed."""
+
+    def __init__(self, path, state_shape=(), state_dtype="int32", action_dtype="int32",
+                 reward_dtype="float32", capacity=1 << 16):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.state_shape = tuple(state_shape)
+        self.dtypes = {
+            "state": np.dtype(state_dtype),
+            "action": np.dtype(action_dtype),
+            "reward": np.dtype(reward_dtype),
+            "next_state": np.dtype(state_dtype),
+            "done": np.dtype(bool),
+        }
+        self.size = 0
+        self.capacity = 0
+        self.columns = {}
+        self._grow(max(1, capacity))
+
+    def _shape(self, name, steps):
+        return (steps, *self.state_shape) if name.endswith("state") else (steps,)
+
+    def _grow(self, capacity):
+        for name in COLUMNS:
+            if name in self.columns:
+                self.columns[name].flush()
+                del self.columns[name]
+            file = self.path / f"{name}.bin"
+            shape = self._shape(name, capacity)
+            with open(file, "ab") as fp:
+                fp.truncate(int(np.prod(shape)) * self.dtypes[name].itemsize)
+            self.columns[name] = np.memmap(file, self.dtypes[name], "r+", shape=shape)
+        self.capacity = capacity
+
+    def append(self, state, action, reward, next_state, done):
+        """Write one step."""
+        self.extend([state], [action], [reward], [next_state], [done])
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        """Write a batch of consecutive steps from equal-length arrays."""
+        batch = dict(zip(COLUMNS, (states, actions, rewards, next_states, dones)))
+        n = len(actions)
+        if self.size + n > self.capacity:
+            self._grow(max(self.size + n, 2 * self.capacity))
+        for name, values in batch.items():
+            self.columns[name][self.size:self.size + n] = values
+        self.size += n
+
+    def close(self):
+        """Trim the columns to the steps written and write the episode index and metadata."""
+        for name in COLUMNS:
+            self.columns[name].flush()
+        done = np.flatnonzero(self.columns["done"][:self.size]) + 1
+        ends = done if done.size and done[-1] == self.size else np.append(done, self.size)
+        offsets = np.concatenate(([0], ends)).astype(np.int64) if self.size else np.zeros(1, np.int64)
+        self.columns.clear()
+        for name in COLUMNS:
+            file = self.path / f"{name}.bin"
+            os.truncate(file, int(np.prod(self._shape(name, self.size))) * self.dtypes[name].itemsize)
+        offsets.tofile(self.path / "episodes.bin")
+        meta = {
+            "steps": self.size,
+            "episodes": len(offsets) - 1,
+            "state_shape": list(self.state_shape),
+            "dtypes": {name: dtype.str for name, dtype in self.dtypes.items()},
+        }
+        (self.path / "meta.json").write_text(json.dumps(meta, indent=2) + "\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class TrajectoryLog:
+    """Read-only view of a trajectory log; every slice is a view into the memmaps."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.steps = meta["steps"]
+        self.state_shape = tuple(meta["state_shape"])
+        self.offsets = np.fromfile(self.path / "episodes.bin", dtype=np.int64)
+        self.columns = {}
+        for name in COLUMNS:
+            shape = (self.steps, *self.state_shape) if name.endswith("state") else (self.steps,)
+            dtype = np.dtype(meta["dtypes"][name])
+            if self.steps:
+                self.columns[name] = np.memmap(self.path / f"{name}.bin", dtype, "r", shape=shape)
+            else:
+                self.columns[name] = np.empty(shape, dtype)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getattr__(self, name):
+        if name in COLUMNS:
+            return self.columns[name]
+        raise AttributeError(name)
+
+    def slice(self, start, stop):
+        """Steps ``start:stop`` across all columns."""
+        return Episode(*(self.columns[name][start:stop] for name in COLUMNS))
+
+    def episode(self, index):
+        """Episode ``index`` (negative indices count from the end)."""
+        index = range(len(self))[index]
+        return self.slice(self.offsets[index], self.offsets[index + 1])
+
+    def __iter__(self):
+        """Stream the episodes in order."""
+        for index in range(len(self)):
+            yield self.episode(index)
+
+    def episode_lengths(self):
+        return np.diff(self.offsets)
+
+
+def _random_walk_steps(episodes, n_states=19, seed=0):
+    """Random-walk episodes as step arrays, for the benchmark."""
+    rng = np.random.default_rng(seed)
+    for _ in range(episodes):
+        moves = rng.choice((-1, 1), size=4 * n_states * n_states)
+        path = n_states // 2 + np.cumsum(moves)
+        end = np.flatnonzero((path < 0) | (path >= n_states))[0]
+        states = np.concatenate(([n_states // 2], path[:end]))
+        yield (states, (moves[:end + 1] > 0).astype(np.int32),
+               (path[:end + 1] == n_states).astype(np.float32), path[:end + 1],
+               np.arange(end + 1) == end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trajectory log write/read benchmark")
+    parser.add_argument("path", type=Path, help="directory to write the log to")
+    parser.add_argument("-e", "--episodes", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with TrajectoryWriter(args.path) as writer:
+        for steps in _random_walk_steps(args.episodes):
+            writer.extend(*steps)
+    written = time.perf_counter() - start
+    size = sum(f.stat().st_size for f in args.path.iterdir())
+    print(f"wrote {writer.size:,} steps / {args.episodes:,} episodes in {written:.2f}s "
+          f"({writer.size / written:,.0f} steps/s), {size / 1024**2:.1f} MiB")
+
+    run = TrajectoryLog(args.path)
+    picks = np.random.default_rng(1).integers(len(run), size=10_000)
+    start = time.perf_counter()
+    total = sum(float(run.episode(i).reward.sum()) for i in picks)
+    elapsed = time.perf_counter() - start
+    print(f"{len(picks):,} random episode reads in {elapsed:.3f}s "
+          f"({elapsed / len(picks) * 1e6:.1f} us each), success rate {total / len(picks):.2f}")
+
+
+if __name__ == "__main__":
+    main()